@@ -0,0 +1,61 @@
+"""
+Compare ``dictobj.as_dict`` against the recursive version it used to be for a
+tree where every level refers to the level below it twice, and for a tree
+that is deeper than the recursion limit.
+
+The recursive version converts the shared levels again each time it sees
+them, so it does ``2 ** depth`` conversions where ``as_dict`` now does
+``depth``.
+
+Run with ``python benchmarks/as_dict_shared.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.dictobj import dictobj
+
+import time
+import sys
+
+class Level(dictobj):
+    fields = ["left", "right", ("name", "level")]
+
+class Old(Level):
+    def as_dict(self, **kwargs):
+        """What dictobj.as_dict used to do"""
+        result = {}
+        for field in self.fields:
+            if isinstance(field, (list, tuple)):
+                field, _ = field
+            val = self[field]
+            if hasattr(val, "as_dict"):
+                result[field] = val.as_dict(**kwargs)
+            else:
+                result[field] = val
+        return result
+
+def shared_tree(kls, depth):
+    level = kls(None, None)
+    for _ in range(depth):
+        level = kls(level, level)
+    return level
+
+def timed(tree):
+    start = time.time()
+    tree.as_dict()
+    return time.time() - start
+
+def run(depth=16):
+    old = timed(shared_tree(Old, depth))
+    new = timed(shared_tree(Level, depth))
+    print("shared tree {0} deep  recursive: {1:.3f}s  as_dict: {2:.5f}s  ({3:.0f}x)".format(depth, old, new, old / new))
+
+    deep = sys.getrecursionlimit() * 10
+    try:
+        timed(shared_tree(Old, deep))
+        old = "fine"
+    except RuntimeError:
+        old = "hits the recursion limit"
+    print("tree {0} deep  recursive: {1}  as_dict: {2:.3f}s".format(deep, old, timed(shared_tree(Level, deep))))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,58 @@
+"""
+Compare normalising many documents with the same spec in a loop against a
+``BatchNormaliser`` with a warm pool of processes.
+
+Run with ``python benchmarks/batch_normalise.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.batch import BatchNormaliser
+from input_algorithms import spec_base as sb
+from input_algorithms import validators as va
+from input_algorithms.meta import Meta
+
+import multiprocessing
+import time
+
+def make_spec():
+    host = sb.and_spec(sb.string_spec(), va.regexed(r"^([a-z0-9]+(-[a-z0-9]+)*\.)+[a-z]{2,}$"))
+    return sb.set_options(
+          name = sb.and_spec(sb.string_spec(), va.regexed(r"^[a-z][a-z0-9_-]*$", r"^.{3,40}$"))
+        , hosts = sb.listof(host)
+        , ports = sb.listof(sb.integer_spec())
+        , tags = sb.dictof(sb.string_spec(), sb.string_spec())
+        , enabled = sb.defaulted(sb.boolean(), True)
+        )
+
+def make_documents(number):
+    return [
+          { "name": "service-{0}".format(i)
+          , "hosts": ["host{0}.region-{1}.example.com".format(j, i % 7) for j in range(5)]
+          , "ports": [80, 443, 8000 + i % 100]
+          , "tags": {"team": "t{0}".format(i % 13), "tier": "web"}
+          }
+          for i in range(number)
+        ]
+
+def run(number=20000):
+    documents = make_documents(number)
+
+    start = time.time()
+    spec = make_spec()
+    expected = [spec.normalise(Meta(document, []), document) for document in documents]
+    serial = time.time() - start
+
+    processes = max(2, multiprocessing.cpu_count())
+    with BatchNormaliser(make_spec, processes=processes, chunksize=64) as batch:
+        # Once to start the processes
+        list(batch.normalise(documents[:processes]))
+
+        start = time.time()
+        result = [result.unwrap() for result in batch.normalise(documents)]
+        batched = time.time() - start
+    assert result == expected
+
+    print("{0} documents  serial loop: {1:.3f}s ({2:.0f}/s)  batch with {3} processes: {4:.3f}s ({5:.0f}/s)".format(number, serial, number / serial, processes, batched, number / batched))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,67 @@
+"""
+Compare checking a temporary tree of tens of thousands of files and
+directories with ``listof(filename_spec())`` and
+``dictof(string_spec(), directory_spec())`` with different numbers of
+``stat_threads``.
+
+Local disks with a warm cache don't gain much from threads because each stat
+is so quick. The gain comes on network or cold filesystems where each stat
+waits on I/O.
+
+Run with ``python benchmarks/concurrent_paths.py``
+"""
+from __future__ import print_function
+
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta
+
+import tempfile
+import shutil
+import time
+import os
+
+def make_tree(root, directories, files_per_directory):
+    dirs = {}
+    files = []
+    for i in range(directories):
+        directory = os.path.join(root, "d{0}".format(i))
+        os.mkdir(directory)
+        dirs["d{0}".format(i)] = directory
+        for j in range(files_per_directory):
+            filename = os.path.join(directory, "f{0}".format(j))
+            open(filename, "w").close()
+            files.append(filename)
+    return dirs, files
+
+def timed(spec, kls, threads, val):
+    original = kls.stat_threads
+    kls.stat_threads = threads
+    try:
+        start = time.time()
+        result = spec.normalise(Meta.empty(), val)
+        return time.time() - start, result
+    finally:
+        kls.stat_threads = original
+
+def run(directories=2000, files_per_directory=20):
+    root = tempfile.mkdtemp()
+    try:
+        dirs, files = make_tree(root, directories, files_per_directory)
+        print("{0} directories and {1} files".format(len(dirs), len(files)))
+
+        for name, spec, kls, val in [
+              ("listof(filename_spec())", sb.listof(sb.filename_spec()), sb.filename_spec, files)
+            , ("dictof(string_spec(), directory_spec())", sb.dictof(sb.string_spec(), sb.directory_spec()), sb.directory_spec, dirs)
+            ]:
+            serial, expected = timed(spec, kls, 1, val)
+            timings = ["1 thread: {0:.3f}s".format(serial)]
+            for threads in (2, 4, 8, 16):
+                took, result = timed(spec, kls, threads, val)
+                assert result == expected
+                timings.append("{0} threads: {1:.3f}s".format(threads, took))
+            print("{0}  {1}".format(name, "  ".join(timings)))
+    finally:
+        shutil.rmtree(root)
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,60 @@
+"""
+Compare reading fields from a dictobj as attributes and items against the
+``hasattr`` checks it used to do for every access.
+
+Run with ``python benchmarks/dictobj_access.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.dictobj import dictobj
+
+import time
+
+class Thing(dictobj):
+    fields = ["host", "port", ("enabled", True)]
+
+class OldThing(Thing):
+    def __getattr__(self, key):
+        """What dictobj.__getattr__ used to do"""
+        key = str(key)
+        if key not in self or hasattr(self.__class__, key):
+            return object.__getattribute__(self, key)
+
+        try:
+            return super(dictobj, self).__getitem__(key)
+        except KeyError:
+            raise AttributeError(key)
+
+    def __getitem__(self, key):
+        """What dictobj.__getitem__ used to do"""
+        key = str(key)
+        if key not in self or hasattr(self.__class__, key):
+            return object.__getattribute__(self, key)
+        else:
+            return super(dictobj, self).__getitem__(key)
+
+def timed(thing, number):
+    start = time.time()
+    for _ in range(number):
+        thing.host
+        thing.port
+        thing.enabled
+    attributes = time.time() - start
+
+    start = time.time()
+    for _ in range(number):
+        thing["host"]
+        thing["port"]
+        thing["enabled"]
+    items = time.time() - start
+    return attributes, items
+
+def run(number=1000000):
+    old_attributes, old_items = timed(OldThing("localhost", 80), number)
+    attributes, items = timed(Thing("localhost", 80), number)
+    reads = number * 3
+    print("{0} attribute reads  hasattr: {1:.3f}s  class attributes set: {2:.3f}s".format(reads, old_attributes, attributes))
+    print("{0} item reads  hasattr: {1:.3f}s  class attributes set: {2:.3f}s".format(reads, old_items, items))
+
+if __name__ == "__main__":
+    run()
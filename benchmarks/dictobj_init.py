@@ -0,0 +1,56 @@
+"""
+Compare making a million dictobj instances with the generated ``__init__``
+against the ``namedlist`` that used to be made for every instance.
+
+Run with ``python benchmarks/dictobj_init.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.dictobj import dictobj
+
+from namedlist import namedlist
+import time
+
+cached_namedlists = {}
+
+class Thing(dictobj):
+    fields = ["one", "two", ("three", 3), ("four", list)]
+
+class OldThing(Thing):
+    def setup(self, *args, **kwargs):
+        """What dictobj.setup used to do"""
+        fields = []
+        end_fields = []
+        for field in self.fields:
+            if isinstance(field, (tuple, list)):
+                name, dflt = field
+                if callable(dflt):
+                    dflt = dflt()
+                end_fields.append((name, dflt))
+            else:
+                fields.append(field)
+
+        joined = fields + end_fields
+        identifier = str(joined)
+        if identifier not in cached_namedlists:
+            cached_namedlists[identifier] = namedlist("Defaults", joined)
+
+        defaults = cached_namedlists[identifier](*args, **kwargs)
+        for field in defaults._fields:
+            self[field] = getattr(defaults, field)
+
+def timed(kls, number):
+    start = time.time()
+    for i in range(number):
+        kls(i, two=2)
+    return time.time() - start
+
+def run(number=1000000):
+    assert OldThing(1, two=2) == Thing(1, two=2)
+
+    old = timed(OldThing, number)
+    new = timed(Thing, number)
+    print("{0} instances  namedlist: {1:.3f}s  generated __init__: {2:.3f}s  ({3:.1f}x)".format(number, old, new, old / new))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,28 @@
+"""
+Compare normalising a big list where every item is bad when collecting every
+error against an error budget of one.
+
+Run with ``python benchmarks/error_budget.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.errors import BadSpecValue
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta, Run
+
+import time
+
+def run(number=200000):
+    spec = sb.listof(sb.set_options(port=sb.integer_spec()))
+    val = [{"port": "not a port"}] * number
+
+    for name, meta in (("every error", Meta.empty()), ("max_errors=1", Meta({}, [], run=Run(max_errors=1)))):
+        start = time.time()
+        try:
+            spec.normalise(meta, val)
+        except BadSpecValue as error:
+            found = len(error.errors)
+        print("{0} items  {1}: {2:.3f}s  errors kept: {3}".format(number, name, time.time() - start, found))
+
+if __name__ == "__main__":
+    run()
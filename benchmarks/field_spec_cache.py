@@ -0,0 +1,39 @@
+"""
+Compare normalising many records with a ``dictobj.Spec`` when the spec is built
+for every record against using the spec remembered by ``FieldSpec``.
+
+Run with ``python benchmarks/field_spec_cache.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.dictobj import dictobj
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta
+
+import time
+
+class Record(dictobj.Spec):
+    name = dictobj.Field(sb.string_spec, wrapper=sb.required)
+    port = dictobj.Field(sb.integer_spec, default=80)
+    hosts = dictobj.Field(sb.string_spec, wrapper=sb.listof)
+    alias = dictobj.NullableField(sb.string_spec)
+
+def run(number=20000):
+    meta = Meta.empty()
+    val = {"name": "web", "port": 8080, "hosts": ["a", "b"]}
+    field_spec = Record.FieldSpec()
+
+    start = time.time()
+    for _ in range(number):
+        field_spec.make_spec(meta).normalise(meta, val)
+    rebuilt = time.time() - start
+
+    start = time.time()
+    for _ in range(number):
+        field_spec.normalise(meta, val)
+    cached = time.time() - start
+
+    print("{0} records  rebuilt: {1:.3f}s  cached: {2:.3f}s  speedup: {3:.2f}x".format(number, rebuilt, cached, rebuilt / cached))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,42 @@
+"""
+Compare formatting the same templates for many images with and without a
+``FormattedCache``.
+
+Run with ``python benchmarks/formatted_cache.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.caches import FormattedCache, GenerationDict
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta
+
+import string
+import time
+
+class Formatter(string.Formatter):
+    def __init__(self, all_options, option_path, value):
+        self.all_options = all_options
+        self.value = value
+
+    def get_field(self, key, args, kwargs):
+        return self.all_options[key], key
+
+    def format(self):
+        return self.vformat(self.value, (), {})
+
+def run(images=500, repeat=20):
+    everything = GenerationDict(config_root="/opt/config", registry="registry.example.com")
+    metas = [Meta(everything, []).at("images").at("image{0}".format(i)).at("context") for i in range(images)]
+    template = "{config_root}/{registry}/context"
+
+    cache = FormattedCache()
+    for name, spec in (("no cache", sb.formatted(sb.string_spec(), Formatter)), ("cache", sb.formatted(sb.string_spec(), Formatter, cache=cache))):
+        start = time.time()
+        for _ in range(repeat):
+            for meta in metas:
+                spec.normalise(meta, template)
+        print("{0} images x {1}  {2}: {3:.3f}s".format(images, repeat, name, time.time() - start))
+    print("hits: {0}  misses: {1}".format(cache.hits, cache.misses))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,50 @@
+"""
+Compare formatting values against a big ``meta.everything`` when it's copied
+for every value against the ``LayeredOptions`` view ``formatted`` uses.
+
+Run with ``python benchmarks/formatted_options.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.meta import Meta
+from input_algorithms import spec_base as sb
+
+import string
+import time
+
+class Formatter(string.Formatter):
+    def __init__(self, all_options, option_path, value):
+        self.all_options = all_options
+        self.value = value
+
+    def get_field(self, key, args, kwargs):
+        return self.all_options[key], key
+
+    def format(self):
+        return self.vformat(self.value, (), {})
+
+def copied(meta):
+    options = {}
+    options.update(meta.key_names())
+    options.update(meta.everything)
+    return options
+
+def run(keys=5000, fields=2000):
+    everything = dict(("key{0}".format(i), "value{0}".format(i)) for i in range(keys))
+    meta = Meta(everything, []).at("images").at("my_image")
+    spec = sb.formatted(sb.string_spec(), Formatter)
+
+    start = time.time()
+    for _ in range(fields):
+        Formatter(copied(meta), meta.path, value="{key1}-{_key_name_0}").format()
+    copy = time.time() - start
+
+    start = time.time()
+    for _ in range(fields):
+        spec.normalise(meta, "{key1}-{_key_name_0}")
+    view = time.time() - start
+
+    print("{0} keys  {1} fields  copied: {2:.3f}s  view: {3:.3f}s  speedup: {4:.2f}x".format(keys, fields, copy, view, copy / view))
+
+if __name__ == "__main__":
+    run()
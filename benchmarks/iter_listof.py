@@ -0,0 +1,36 @@
+"""
+Compare the memory used normalising a long stream of records with
+``listof(...).normalise`` against ``listof(...).iter_normalise``.
+
+Run with ``python benchmarks/iter_listof.py``
+"""
+from __future__ import print_function
+
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta
+
+import tracemalloc
+import time
+
+def records(number):
+    for i in range(number):
+        yield {"name": "host{0}".format(i), "port": i}
+
+def run(number=200000):
+    meta = Meta.empty()
+    spec = sb.listof(sb.set_options(name=sb.string_spec(), port=sb.integer_spec()))
+
+    for name, consume in (
+          ("normalise", lambda: sum(1 for _ in spec.normalise(meta, list(records(number)))))
+        , ("iter_normalise", lambda: sum(1 for _ in spec.iter_normalise(meta, records(number))))
+        ):
+        tracemalloc.start()
+        start = time.time()
+        consume()
+        took = time.time() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("{0} records  {1}: {2:.3f}s  peak memory: {3:.1f}MB".format(number, name, took, peak / 1024.0 / 1024.0))
+
+if __name__ == "__main__":
+    run()
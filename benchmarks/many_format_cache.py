@@ -0,0 +1,43 @@
+"""
+Compare resolving the same many_format chains many times in one normalisation
+with and without a ``Run`` to remember the resolutions in.
+
+Run with ``python benchmarks/many_format_cache.py``
+"""
+from __future__ import print_function
+
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta, Run
+
+import string
+import time
+
+class Formatter(string.Formatter):
+    def __init__(self, all_options, option_path, value):
+        self.all_options = all_options
+        self.value = value
+
+    def get_field(self, key, args, kwargs):
+        return self.all_options[key], key
+
+    def format(self):
+        return self.vformat(self.value, (), {})
+
+def run(images=50, repeat=200):
+    everything = {}
+    for i in range(images):
+        everything["images.image{0}.image_name".format(i)] = "image{0}".format(i)
+        everything["images.image{0}.alias".format(i)] = "images.{_key_name_0}.image_name"
+
+    spec = sb.many_format(sb.overridden("images.{_key_name_0}.alias"), formatter=Formatter)
+
+    for name, root in (("no run", Meta(everything, [])), ("with run", Meta(everything, [], run=Run()))):
+        metas = [root.at("images").at("image{0}".format(i)) for i in range(images)]
+        start = time.time()
+        for _ in range(repeat):
+            for meta in metas:
+                spec.normalise(meta, sb.NotSpecified)
+        print("{0} images x {1}  {2}: {3:.3f}s".format(images, repeat, name, time.time() - start))
+
+if __name__ == "__main__":
+    run()
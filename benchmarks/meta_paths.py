@@ -0,0 +1,24 @@
+"""
+Time walking down a deep path with ``Meta.at`` and reading ``meta.path`` at
+every level.
+
+Run with ``python benchmarks/meta_paths.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.meta import Meta
+
+import time
+
+def run(depth=200, number=200):
+    start = time.time()
+    for _ in range(number):
+        meta = Meta.empty()
+        for index in range(depth):
+            meta = meta.at("key{0}".format(index))
+            meta.path
+    took = time.time() - start
+    print("depth {0} x {1}: {2:.3f}s".format(depth, number, took))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,50 @@
+"""
+Compare ``Spec.normalise`` with it's precompiled dispatch plan against the
+previous implementation that used ``hasattr`` on every call.
+
+Run with ``python benchmarks/normalise_dispatch.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.spec_base import NotSpecified
+from input_algorithms.errors import BadSpec
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta
+
+import timeit
+
+def hasattr_normalise(self, meta, val):
+    """The implementation of ``Spec.normalise`` before the dispatch plan"""
+    if hasattr(self, "normalise_either"):
+        result = self.normalise_either(meta, val)
+        if result is not NotSpecified:
+            return result
+
+    if val is NotSpecified:
+        if hasattr(self, "normalise_empty"):
+            return self.normalise_empty(meta)
+        elif hasattr(self, "default"):
+            return self.default(meta)
+        else:
+            return val
+    elif hasattr(self, "normalise_filled"):
+        return self.normalise_filled(meta, val)
+
+    raise BadSpec("Spec doesn't know how to deal with this value", spec=self, meta=meta, val=val)
+
+def run(number=200000):
+    meta = Meta.empty()
+    cases = [
+          ("string_spec", sb.string_spec(), "hello")
+        , ("string_spec (empty)", sb.string_spec(), NotSpecified)
+        , ("integer_spec", sb.integer_spec(), 42)
+        , ("boolean", sb.boolean(), True)
+        ]
+
+    for name, spec, val in cases:
+        before = timeit.timeit(lambda: hasattr_normalise(spec, meta, val), number=number)
+        after = timeit.timeit(lambda: spec.normalise(meta, val), number=number)
+        print("{0:<22} hasattr: {1:.3f}s  plan: {2:.3f}s  speedup: {3:.2f}x".format(name, before, after, before / after))
+
+if __name__ == "__main__":
+    run()
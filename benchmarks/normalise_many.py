@@ -0,0 +1,36 @@
+"""
+Compare normalising big lists of leaf values one item at a time against
+``normalise_many``, which ``listof`` and ``tupleof`` use for their items.
+
+Run with ``python benchmarks/normalise_many.py``
+"""
+from __future__ import print_function
+
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta
+
+import time
+
+def one_at_a_time(spec, meta, values):
+    return sb.try_normalise_each(spec, meta, values).unwrap()
+
+def run(number=50000, repeat=10):
+    meta = Meta.empty()
+    hosts = ["host{0}.example.com".format(i) for i in range(number)]
+    ports = list(range(number))
+
+    for name, spec, values in (("hosts", sb.string_spec(), hosts), ("ports", sb.integer_spec(), ports)):
+        start = time.time()
+        for _ in range(repeat):
+            one_at_a_time(spec, meta, values)
+        each = time.time() - start
+
+        start = time.time()
+        for _ in range(repeat):
+            sb.listof(spec).normalise(meta, values)
+        many = time.time() - start
+
+        print("{0} {1}  one at a time: {2:.3f}s  normalise_many: {3:.3f}s  speedup: {4:.2f}x".format(number, name, each, many, each / many))
+
+if __name__ == "__main__":
+    run()
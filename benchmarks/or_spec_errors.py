@@ -0,0 +1,57 @@
+"""
+Measure ``or_spec`` throughput when the early options fail, and what it
+costs to render the error when every option fails.
+
+The same numbers are printed with errors created the way ``DelfickError``
+creates them for comparison.
+
+Run with ``python benchmarks/or_spec_errors.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.errors import BadSpec
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta
+
+from delfick_error import DelfickError
+import time
+
+def measure(number):
+    everything = type("Everything", (dict, ), {"source_for": lambda s, path: "config.yml"})()
+    meta = Meta(everything, []).at("images").at("web").at("port")
+    spec = sb.or_spec(sb.boolean(), sb.none_spec(), sb.float_spec(), sb.string_spec())
+    failing = sb.or_spec(sb.boolean(), sb.none_spec(), sb.float_spec(), sb.integer_spec())
+
+    start = time.time()
+    for _ in range(number):
+        spec.normalise(meta, "hello")
+    passing = number / (time.time() - start)
+
+    start = time.time()
+    for _ in range(number // 10):
+        try:
+            failing.normalise(meta, "hello")
+        except BadSpec as error:
+            str(error)
+            error == error
+    failed = (number // 10) / (time.time() - start)
+
+    return passing, failed
+
+def run(number=100000):
+    lazy = measure(number)
+
+    original = BadSpec.__init__, BadSpec.__str__, BadSpec.as_tuple
+    try:
+        BadSpec.__init__ = DelfickError.__init__
+        BadSpec.__str__ = DelfickError.__str__
+        BadSpec.as_tuple = DelfickError.as_tuple
+        eager = measure(number)
+    finally:
+        BadSpec.__init__, BadSpec.__str__, BadSpec.as_tuple = original
+
+    print("or_spec where the first three options fail: {0:.0f}/s (DelfickError: {1:.0f}/s)".format(lazy[0], eager[0]))
+    print("or_spec where everything fails, rendered and compared: {0:.0f}/s (DelfickError: {1:.0f}/s)".format(lazy[1], eager[1]))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,61 @@
+"""
+Compare normalising a big list of dictionaries with CPU heavy specs for each
+item in this process against a pool of processes, along with a small list
+where the pickling would cost more than it saves.
+
+Run with ``python benchmarks/parallel_normalise.py``
+"""
+from __future__ import print_function
+
+from input_algorithms import spec_base as sb
+from input_algorithms import validators as va
+from input_algorithms.meta import Meta, Run
+
+import multiprocessing
+import time
+
+def make_spec():
+    host = sb.and_spec(sb.string_spec(), va.regexed(r"^([a-z0-9]+(-[a-z0-9]+)*\.)+[a-z]{2,}$"))
+    return sb.listof(sb.set_options(
+          name = sb.and_spec(sb.string_spec(), va.regexed(r"^[a-z][a-z0-9_-]*$", r"^.{3,40}$"))
+        , hosts = sb.listof(host)
+        , ports = sb.listof(sb.integer_spec())
+        , tags = sb.dictof(sb.string_spec(), sb.string_spec())
+        , enabled = sb.defaulted(sb.boolean(), True)
+        ))
+
+def make_val(number):
+    return [
+          { "name": "service-{0}".format(i)
+          , "hosts": ["host{0}.region-{1}.example.com".format(j, i % 7) for j in range(5)]
+          , "ports": [80, 443, 8000 + i % 100]
+          , "tags": {"team": "t{0}".format(i % 13), "tier": "web"}
+          }
+          for i in range(number)
+        ]
+
+def timed(spec, meta, val):
+    start = time.time()
+    result = spec.normalise(meta, val)
+    return time.time() - start, result
+
+def run(number=40000):
+    spec = make_spec()
+    processes = max(2, multiprocessing.cpu_count())
+
+    for size in (number, 500):
+        val = make_val(size)
+        serial, expected = timed(spec, Meta({}, [], run=Run()), val)
+
+        # Once to start the processes
+        timed(spec, Meta({}, [], run=Run(processes=processes, parallel_threshold=0)), val)
+        parallel, result = timed(spec, Meta({}, [], run=Run(processes=processes, parallel_threshold=0)), val)
+        assert result == expected
+
+        with_threshold, result = timed(spec, Meta({}, [], run=Run(processes=processes)), val)
+        assert result == expected
+
+        print("{0} items  serial: {1:.3f}s  {2} processes: {3:.3f}s  with the default threshold: {4:.3f}s".format(size, serial, processes, parallel, with_threshold))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,68 @@
+"""
+Compare the memory used by each instance of a record against a dictobj with
+the same fields, and how long it takes to make them.
+
+The size is from ``sys.getsizeof``, and is checked against what
+``tracemalloc`` sees for a hundred thousand instances on python3. A dictobj
+only gets a ``__dict__`` as well if something is set on the instance rather
+than in the dictionary, so that isn't counted.
+
+Run with ``python benchmarks/record_memory.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.dictobj import dictobj
+from input_algorithms.record import record
+
+import time
+import sys
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+def make_classes(count):
+    names = ["field{0}".format(i) for i in range(count)]
+    Dict = type("Dict{0}".format(count), (dictobj, ), {"fields": names})
+    Record = type("Record{0}".format(count), (record, ), {"fields": names})
+    return names, Dict, Record
+
+def traced(kls, kwargs, number):
+    """Return the bytes allocated for each instance and the seconds to make them"""
+    if tracemalloc is not None:
+        tracemalloc.start()
+    start = time.time()
+    instances = [kls(**kwargs) for _ in range(number)]
+    took = time.time() - start
+
+    per_instance = None
+    if tracemalloc is not None:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        per_instance = current / float(number)
+
+    del instances
+    return per_instance, took
+
+def run(number=100000):
+    print("fields  record  dictobj  (traced record / dictobj)  make record / dictobj")
+    for count in (2, 5, 10, 20):
+        names, Dict, Record = make_classes(count)
+        kwargs = dict((name, i) for i, name in enumerate(names))
+        assert Record(**kwargs) == Dict(**kwargs)
+
+        record_traced, record_took = traced(Record, kwargs, number)
+        dict_traced, dict_took = traced(Dict, kwargs, number)
+
+        traced_sizes = ""
+        if record_traced is not None:
+            traced_sizes = "({0:.0f} / {1:.0f})".format(record_traced, dict_traced)
+
+        print("{0:<6}  {1:<6}  {2:<7}  {3:<25}  {4:.3f}s / {5:.3f}s".format(
+              count, sys.getsizeof(Record(**kwargs)), sys.getsizeof(Dict(**kwargs))
+            , traced_sizes, record_took, dict_took
+            ))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,82 @@
+"""
+Compare ``Spec.normalise``, which goes through the ``Success`` and ``Failure``
+results of ``try_normalise``, against the same specs written the way they
+were before results, where hooks returned the value or raised the error.
+
+Run with ``python benchmarks/result_overhead.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.spec_base import NotSpecified
+from input_algorithms.errors import BadSpec, BadSpecValue
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta
+
+import timeit
+import six
+
+def raising_string(meta, val):
+    """``string_spec().normalise`` before results"""
+    if val is NotSpecified:
+        return ""
+    if not isinstance(val, six.string_types):
+        raise BadSpecValue("Expected a string", meta=meta, got=type(val))
+    return val
+
+def raising_integer(meta, val):
+    """``integer_spec().normalise`` before results"""
+    if val is NotSpecified:
+        raise BadSpec("Spec doesn't know how to deal with this value", meta=meta, val=val)
+    if not isinstance(val, bool) and (isinstance(val, int) or hasattr(val, "isdigit") and val.isdigit()):
+        try:
+            return int(val)
+        except (TypeError, ValueError) as error:
+            raise BadSpecValue("Couldn't transform value into an integer", meta=meta, error=str(error))
+    raise BadSpecValue("Expected an integer", meta=meta, got=type(val))
+
+def raising_set_options(options):
+    """``set_options(**options).normalise`` before results"""
+    def normalise(meta, val):
+        if val is NotSpecified:
+            return {}
+        if not isinstance(val, dict) and not getattr(val, "is_dict", False):
+            raise BadSpecValue("Expected a dictionary", meta=meta, got=type(val))
+
+        result = {}
+        errors = []
+        for key, spec in options.items():
+            try:
+                result[key] = spec(meta.at(key), val.get(key, NotSpecified))
+            except BadSpec as error:
+                errors.append(error)
+
+        if errors:
+            raise BadSpecValue(meta=meta, _errors=errors)
+        return result
+    return normalise
+
+def per_call(func, number):
+    """Return the best time for one call of ``func`` in microseconds"""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+def run(number=200000):
+    meta = Meta.empty()
+    options = sb.set_options(one=sb.string_spec(), two=sb.integer_spec(), three=sb.string_spec())
+    raising_options = raising_set_options(dict(one=raising_string, two=raising_integer, three=raising_string))
+    val = {"one": "a", "two": 2}
+
+    cases = [
+          ("string_spec", sb.string_spec().normalise, raising_string, "hello", number)
+        , ("string_spec (empty)", sb.string_spec().normalise, raising_string, NotSpecified, number)
+        , ("integer_spec", sb.integer_spec().normalise, raising_integer, 42, number)
+        , ("set_options", options.normalise, raising_options, val, number // 10)
+        ]
+
+    for name, normalise, raising, val, times in cases:
+        assert normalise(meta, val) == raising(meta, val)
+        before = per_call(lambda: raising(meta, val), times)
+        after = per_call(lambda: normalise(meta, val), times)
+        print("{0:<20} raising: {1:.3f}us  results: {2:.3f}us  overhead: {3:.2f}x".format(name, before, after, after / before))
+
+if __name__ == "__main__":
+    run()
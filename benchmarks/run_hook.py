@@ -0,0 +1,40 @@
+"""
+Compare normalising a big list of dictionaries without a ``Run``, with a
+``Run`` that has no hook, and with a hook that lets other threads run every
+thousand values.
+
+Run with ``python benchmarks/run_hook.py``
+"""
+from __future__ import print_function
+
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta, Run
+
+import time
+
+def run(number=50000, repeat=5):
+    spec = sb.listof(sb.set_options(one=sb.integer_spec(), two=sb.string_spec(), three=sb.listof(sb.integer_spec())))
+    val = [{"one": i, "two": str(i), "three": [i, i]} for i in range(number)]
+
+    called = []
+    def hook(run):
+        called.append(run.nodes)
+        time.sleep(0)
+
+    for name, make_meta in (
+          ("no run", lambda: Meta.empty())
+        , ("run without a hook", lambda: Meta({}, [], run=Run()))
+        , ("run with a hook", lambda: Meta({}, [], run=Run(hook=hook, hook_every=1000)))
+        ):
+        took = []
+        for _ in range(repeat):
+            meta = make_meta()
+            start = time.time()
+            spec.normalise(meta, val)
+            took.append(time.time() - start)
+        print("{0} items  {1}: {2:.3f}s".format(number, name, min(took)))
+
+    print("hook called {0} times over {1} values".format(len(called) // repeat, called[-1] if called else 0))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,43 @@
+"""
+Compare making the same ``dictobj.selection`` and normalising with it many
+times, as a function that runs for every request would, with and without the
+selections being remembered.
+
+Run with ``python benchmarks/selection_cache.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.dictobj import dictobj
+from input_algorithms import spec_base as sb
+
+import time
+
+class Blah(dictobj.Spec):
+    one = dictobj.Field(sb.string_spec)
+    two = dictobj.Field(sb.integer_spec, default=2)
+    three = dictobj.Field(sb.string_spec, wrapper=sb.listof)
+    four = dictobj.Field(sb.boolean, default=False)
+    five = dictobj.Field(sb.string_spec)
+
+def handle_request(select):
+    Meh = select("Meh", ["one", "two", "three"], all_optional=True)
+    return Meh.FieldSpec().empty_normalise(one="1", three="3")
+
+def timed(select, number):
+    start = time.time()
+    for _ in range(number):
+        handle_request(select)
+    return time.time() - start
+
+def run(number=10000):
+    def uncached(kls_name, wanted, **kwargs):
+        return Blah.make_selection_class(kls_name, wanted, kwargs)
+
+    assert handle_request(uncached) == handle_request(Blah.selection)
+
+    old = timed(uncached, number)
+    new = timed(Blah.selection, number)
+    print("{0} requests  new selection each time: {1:.3f}s  remembered: {2:.3f}s  ({3:.1f}x)".format(number, old, new, old / new))
+
+if __name__ == "__main__":
+    run()
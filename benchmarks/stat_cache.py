@@ -0,0 +1,51 @@
+"""
+Compare checking a list of directories that repeats the same paths with
+``directory_spec`` with and without a ``Run`` to remember stats in, along
+with the cost of the raw ``os.path.exists`` and ``os.path.isdir`` calls it
+used to make.
+
+Run with ``python benchmarks/stat_cache.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.caches import StatCache
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta, Run
+
+import tempfile
+import shutil
+import time
+import os
+
+def run(unique=2000, repeat=10):
+    root = tempfile.mkdtemp()
+    try:
+        paths = []
+        for i in range(unique):
+            path = os.path.join(root, str(i))
+            os.mkdir(path)
+            paths.append(path)
+        paths = paths * repeat
+
+        start = time.time()
+        for path in paths:
+            assert os.path.exists(path) and os.path.isdir(path)
+        old = time.time() - start
+
+        start = time.time()
+        sb.listof(sb.directory_spec()).normalise(Meta.empty(), paths)
+        no_run = time.time() - start
+
+        meta = Meta({}, [], run=Run())
+        start = time.time()
+        sb.listof(sb.directory_spec()).normalise(meta, paths)
+        with_run = time.time() - start
+
+        cache = meta.run.cache("stat", StatCache)
+        print("{0} paths ({1} unique)  raw exists+isdir: {2:.3f}s  directory_spec no run: {3:.3f}s  with run: {4:.3f}s".format(len(paths), unique, old, no_run, with_run))
+        print("stats: {0}  hits: {1}  syscalls saved: {2}".format(cache.stats, cache.hits, cache.saved))
+    finally:
+        shutil.rmtree(root)
+
+if __name__ == "__main__":
+    run()
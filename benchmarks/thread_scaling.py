@@ -0,0 +1,60 @@
+"""
+Compare how many documents a ``BatchNormaliser`` with threads normalises a
+second as the number of threads goes up.
+
+On a python with the GIL this stays flat, because only one thread runs at a
+time. On a free-threaded python it should go up with the number of threads
+until there are no more CPUs.
+
+Run with ``python benchmarks/thread_scaling.py``
+"""
+from __future__ import print_function
+
+from input_algorithms.batch import BatchNormaliser
+from input_algorithms import spec_base as sb
+from input_algorithms import validators as va
+
+import multiprocessing
+import time
+import sys
+
+def make_spec():
+    host = sb.and_spec(sb.string_spec(), va.regexed(r"^([a-z0-9]+(-[a-z0-9]+)*\.)+[a-z]{2,}$"))
+    return sb.set_options(
+          name = sb.and_spec(sb.string_spec(), va.regexed(r"^[a-z][a-z0-9_-]*$", r"^.{3,40}$"))
+        , hosts = sb.listof(host)
+        , ports = sb.listof(sb.integer_spec())
+        , tags = sb.dictof(sb.string_spec(), sb.string_spec())
+        , enabled = sb.defaulted(sb.boolean(), True)
+        )
+
+def make_documents(number):
+    return [
+          { "name": "service-{0}".format(i)
+          , "hosts": ["host{0}.region-{1}.example.com".format(j, i % 7) for j in range(5)]
+          , "ports": [80, 443, 8000 + i % 100]
+          , "tags": {"team": "t{0}".format(i % 13), "tier": "web"}
+          }
+          for i in range(number)
+        ]
+
+def run(number=20000):
+    documents = make_documents(number)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("{0} CPUs  GIL {1}".format(multiprocessing.cpu_count(), "enabled" if gil else "disabled"))
+
+    expected = None
+    for threads in (1, 2, 4, 8):
+        with BatchNormaliser(make_spec, threads=threads, chunksize=64) as batch:
+            start = time.time()
+            result = [result.unwrap() for result in batch.normalise(documents)]
+            took = time.time() - start
+
+        if expected is None:
+            expected = result
+        assert result == expected
+
+        print("{0} threads: {1:.3f}s ({2:.0f} documents/s)".format(threads, took, number / took))
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,640 @@
+"""
+Normalise values from inside an ``asyncio`` event loop without blocking it.
+
+.. code-block:: python
+
+    value = await spec.normalise_async(meta, val)
+
+    # or
+
+    result = await spec.try_normalise_async(meta, val)
+
+This module needs python3.5 or above and is only imported when one of those
+methods is used.
+
+The things that have to be waited for are the stats from ``directory_spec``
+and ``filename_spec``, which are done in a thread, and validators with an
+``async def validate`` or ``async def try_validate``.
+
+The spec is walked once by a ``Normaliser``, which has a coroutine for each of
+the containers in ``input_algorithms.spec_base`` that does the same as the
+container's ``try_normalise``. Stats and validators are awaited where they
+are found, and the children of a container, like the options of a
+``set_options`` or the items of a ``listof``, are awaited together with
+``asyncio.gather``. With an error budget in ``meta.run`` the children are
+awaited one at a time instead and the container stops like normal once the
+budget is used up.
+
+Parts of the spec that have nothing to wait for are normalised with the
+normal ``try_normalise`` in place, so small values with such specs don't make
+any tasks. Big lists and dictionaries are normalised ``meta.run.hook_every``
+values at a time, giving the event loop a chance to run between them.
+
+Anything else, like subclasses of the containers, ``many_item_formatted_spec``
+and objects that only have a ``normalise`` method, is normalised with
+``try_normalise`` in a thread. While that happens ``meta.run.waiting`` is a
+``Waiting`` that awaits validators that are coroutines in the event loop.
+"""
+from input_algorithms.spec_base import (
+      try_normalise, uses_try_normalise, try_normalise_part, try_normalise_parallel
+    , try_find_paths, check_found_paths, item_meta, ErrorCollector, NotSpecified
+    )
+from input_algorithms.errors import BadSpec, BadSpecValue, ProgrammerError
+from input_algorithms.results import Success, Failure
+from input_algorithms.field_spec import FieldSpec
+from input_algorithms.validators import Validator
+from input_algorithms.caches import StatCache
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta, Run
+
+from collections import OrderedDict
+import functools
+import threading
+import asyncio
+
+async def run_in_thread(func, *args, **kwargs):
+    """Call ``func`` in the event loop's default executor"""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+async def validate(validator, meta, val):
+    """Await the ``validate`` or ``try_validate`` of this validator and return a ``Success`` or ``Failure``"""
+    if asyncio.iscoroutinefunction(type(validator).try_validate):
+        return await validator.try_validate(meta, val)
+
+    try:
+        return Success(await validator.validate(meta, val))
+    except BadSpec as error:
+        return Failure(error)
+
+def is_coroutine_validator(spec):
+    """Say whether this is a validator with an ``async def validate`` or ``async def try_validate``"""
+    kls = type(spec)
+    return isinstance(spec, Validator) and (asyncio.iscoroutinefunction(kls.try_validate) or asyncio.iscoroutinefunction(kls.validate))
+
+def only_validates(kls):
+    """Say whether this validator class normalises values with ``Validator.try_normalise_either`` and nothing else"""
+    if kls.try_normalise is not kls.normalise_plan or kls.try_normalise_either is not Validator.try_normalise_either:
+        return False
+    return not any(hasattr(kls, name) for name in ("try_normalise_filled", "try_normalise_empty", "default"))
+
+def is_fatal(result):
+    """Say whether this is a failure that a container gives back as is rather than collect"""
+    return not result.ok and not isinstance(result.error, BadSpecValue)
+
+# The specs in spec_base, which only use the specs they hold
+builtin_specs = frozenset(v for v in vars(sb).values() if isinstance(v, type) and issubclass(v, sb.Spec))
+
+def may_wait(spec, seen=None):
+    """
+    Say whether normalising with ``spec`` may have something to wait for
+
+    This is True for path specs and validators that are coroutines, and for
+    anything we can't look inside, like subclasses and objects that aren't
+    a ``Spec``. Otherwise it's True if one of the specs it holds may wait.
+    """
+    if seen is None:
+        seen = set()
+    if id(spec) in seen:
+        return False
+    seen.add(id(spec))
+
+    if not uses_try_normalise(spec):
+        return True
+
+    kls = type(spec)
+    if isinstance(spec, Validator):
+        if is_coroutine_validator(spec) or not only_validates(kls):
+            return True
+    elif kls not in builtin_specs or kls in (sb.directory_spec, sb.filename_spec):
+        return True
+    elif kls is sb.delayed:
+        # The spec isn't used till the Delayed is called
+        return False
+
+    return any(holds_waiting(val, seen) for val in vars(spec).values())
+
+def holds_waiting(val, seen):
+    """Say whether this attribute of a spec holds a spec that may wait"""
+    if isinstance(val, type):
+        return issubclass(val, sb.Spec)
+    elif isinstance(val, (list, tuple)):
+        return any(holds_waiting(v, seen) for v in val)
+    elif isinstance(val, dict):
+        return any(holds_waiting(v, seen) for v in val.values())
+    elif hasattr(val, "normalise"):
+        return may_wait(val, seen)
+    return False
+
+def size_of(val, limit):
+    """
+    Return how many values are in ``val``, counting the items in lists,
+    tuples and dictionaries, or None if there are more than ``limit``
+    """
+    count = 0
+    found = [val]
+    while found:
+        val = found.pop()
+        count += 1
+        if isinstance(val, dict):
+            items = val.values()
+        elif isinstance(val, (list, tuple)):
+            items = val
+        elif getattr(val, "is_dict", False):
+            # We can't know how big it is
+            return None
+        else:
+            continue
+
+        if count + len(items) > limit:
+            return None
+        found.extend(items)
+    return count
+
+class Waiting(object):
+    """
+    Put in ``meta.run.waiting`` while ``normalise_async`` is running
+
+    Specs that are normalised in a thread use ``try_validate`` for their
+    validators, which awaits validators that are coroutines in the event loop
+    and waits for the result in the thread.
+    """
+    def __init__(self, loop):
+        self.loop = loop
+        self.thread = threading.get_ident()
+
+    def try_validate(self, validator, meta, val):
+        """Return the result of the validator"""
+        if not is_coroutine_validator(validator):
+            return validator.try_validate(meta, val)
+
+        if threading.get_ident() == self.thread:
+            raise ProgrammerError("Can't wait for {0}, which is a coroutine, from inside the event loop".format(validator.__class__.__name__))
+        return asyncio.run_coroutine_threadsafe(validate(validator, meta, val), self.loop).result()
+
+class Normaliser(object):
+    """
+    Normalise values for one ``normalise_async``
+
+    ``normalise`` does the same as ``try_normalise``. It finds the coroutine
+    for the spec in ``handlers``, runs ``try_normalise`` in place if the spec
+    has nothing to wait for and the value is small, or runs it in a thread if
+    there is no coroutine for the spec.
+
+    Every ``run.hook_every`` values the event loop is given a chance to run.
+    """
+    handlers = {
+          sb.set_options: "try_set_options"
+        , sb.create_spec: "try_create_spec"
+        , sb.listof: "try_listof"
+        , sb.tupleof: "try_tupleof"
+        , sb.dictof: "try_dictof"
+        , sb.tuple_spec: "try_tuple_spec"
+        , sb.or_spec: "try_or_spec"
+        , sb.and_spec: "try_and_spec"
+        , sb.defaulted: "try_proxy"
+        , sb.required: "try_proxy"
+        , sb.optional_spec: "try_proxy"
+        , sb.container_spec: "try_container_spec"
+        , sb.directory_spec: "try_path_spec"
+        , sb.filename_spec: "try_path_spec"
+        }
+
+    def __init__(self, run):
+        self.run = run
+        self.every = max(1, run.hook_every)
+        self.budget = run.max_errors is not None
+        self.nodes = 0
+        self.next_yield = self.every
+        self.plans = {}
+        # Make the cache here rather than in the threads
+        self.stat_cache = run.cache("stat", StatCache.for_run)
+
+    async def visited(self, count=1):
+        """Count ``count`` values and let the event loop run if it's time"""
+        self.nodes += count
+        if self.nodes >= self.next_yield:
+            self.next_yield = self.nodes + self.every
+            await asyncio.sleep(0)
+
+    def plan(self, spec):
+        """Return ``(waits, handler)`` for this spec, from ``may_wait`` and ``handlers``"""
+        found = self.plans.get(id(spec))
+        if found is None:
+            handler = None
+            if uses_try_normalise(spec):
+                name = self.handlers.get(type(spec))
+                if name is None and is_coroutine_validator(spec) and only_validates(type(spec)):
+                    name = "try_validator"
+                if name is not None:
+                    handler = getattr(self, name)
+
+            # Hold onto the spec so it's id isn't used again
+            found = self.plans[id(spec)] = (spec, may_wait(spec), handler)
+        return found[1:]
+
+    async def normalise(self, spec, meta, val):
+        """Normalise ``val`` with ``spec`` and return a ``Success`` or ``Failure``"""
+        if isinstance(spec, FieldSpec):
+            try:
+                spec = spec.cached_spec(meta)
+            except BadSpec as error:
+                return Failure(error)
+
+        waits, handler = self.plan(spec)
+        if not waits:
+            size = size_of(val, self.every)
+            if size is not None:
+                await self.visited(size)
+                return try_normalise(spec, meta, val)
+
+        await self.visited()
+        if handler is None:
+            return await run_in_thread(try_normalise, spec, meta, val)
+        return await handler(spec, meta, val)
+
+    async def children(self, errors, jobs, func=None):
+        """
+        Return the results of ``jobs``, a list of ``(spec, meta, val)`` for
+        the children of a container, in the same order
+
+        Each job is given to ``func``, which is ``normalise`` by default.
+
+        Without an error budget the children are awaited together. Otherwise
+        they are awaited one at a time and their failures are counted in
+        ``errors``. There are only results for the children before the budget
+        was used up or before one that ``is_fatal``.
+        """
+        if func is None:
+            func = self.normalise
+
+        errors.visited(len(jobs))
+        if not self.budget:
+            if len(jobs) == 1:
+                return [await func(*jobs[0])]
+            return await asyncio.gather(*[func(*job) for job in jobs])
+
+        results = []
+        for job in jobs:
+            if errors.exhausted():
+                break
+
+            count = errors.count
+            result = await func(*job)
+            results.append(result)
+            if is_fatal(result):
+                break
+            if not result.ok:
+                errors.count_error(count)
+        return results
+
+    async def many(self, spec, meta, values, keys=None, parallel=False):
+        """
+        The same as ``try_normalise_many``, or ``try_normalise_children`` if
+        ``parallel``, done ``self.every`` values at a time
+        """
+        waits, handler = self.plan(spec)
+        run = self.run
+        if parallel and not waits and run.processes and run.processes > 1 and len(values) >= run.parallel_threshold:
+            return await run_in_thread(try_normalise_parallel, spec, meta, values, keys=keys)
+
+        result = []
+        errors = ErrorCollector(meta)
+        for start in range(0, len(values), self.every):
+            if errors.exhausted():
+                break
+
+            chunk = values[start:start + self.every]
+            chunk_keys = None if keys is None else keys[start:start + self.every]
+
+            if handler is None or not waits:
+                if waits:
+                    normalised = await run_in_thread(try_normalise_part, spec, meta, chunk, start, keys=chunk_keys)
+                else:
+                    normalised = try_normalise_part(spec, meta, chunk, start, keys=chunk_keys)
+                errors.visited(len(chunk))
+
+                if normalised.ok:
+                    result.extend(normalised.value)
+                else:
+                    # Already counted by the chunk
+                    errors.errors.extend(normalised.error.errors)
+                await self.visited(len(chunk))
+                continue
+
+            if handler == self.try_path_spec and not self.plan(spec.spec)[0]:
+                results = await self.check_paths(spec, meta, chunk, errors, start=start, keys=chunk_keys)
+            else:
+                results = await self.children(errors, [(spec, item_meta(meta, index, chunk_keys, start), val) for index, val in enumerate(chunk)])
+
+            for normalised in results:
+                if normalised.ok:
+                    result.append(normalised.value)
+                else:
+                    errors.errors.append(normalised.error)
+
+        if errors:
+            return errors.failure()
+
+        return Success(result)
+
+    async def stat(self, path, shared=None):
+        """Return the ``os.stat`` of this path, or None if it can't be stat'd"""
+        return await run_in_thread(self.stat_cache.stat, path, shared)
+
+    async def check_paths(self, spec, meta, values, errors, start=0, keys=None):
+        """The same as ``try_check_path_results`` but with each path stat'd once, all together"""
+        at, paths = try_find_paths(spec, meta, values, errors, start=start, keys=keys)
+
+        unique = list(OrderedDict.fromkeys(paths))
+        if len(unique) == 1:
+            stats = [await self.stat(unique[0], spec.stat_cache)]
+        else:
+            stats = await asyncio.gather(*[self.stat(path, spec.stat_cache) for path in unique])
+
+        found = dict(zip(unique, stats))
+        return check_found_paths(spec, at, iter([found[path] for path in paths]), errors)
+
+    async def try_path_spec(self, spec, meta, val):
+        """``directory_spec`` and ``filename_spec``"""
+        if self.plan(spec.spec)[0]:
+            return await run_in_thread(try_normalise, spec, meta, val)
+
+        result = spec.try_path(meta, val)
+        if not result.ok or not isinstance(result.value, str):
+            return result
+        return spec.check(meta, result.value, await self.stat(result.value, spec.stat_cache))
+
+    async def try_validator(self, spec, meta, val):
+        """Validators that are coroutines"""
+        if val is NotSpecified:
+            return spec.try_normalise(meta, val)
+
+        result = await validate(spec, meta, val)
+        if not result.ok or result.value is not NotSpecified:
+            return result
+        return Failure(BadSpec("Spec doesn't know how to deal with this value", spec=spec, meta=meta, val=val))
+
+    async def try_set_options(self, spec, meta, val):
+        if val is NotSpecified:
+            return spec.try_normalise(meta, val)
+
+        dct = sb.dictionary_spec().try_normalise(meta, val)
+        if not dct.ok:
+            return dct
+        val = dct.value
+
+        result = {}
+        errors = ErrorCollector(meta)
+        keys = list(spec.options)
+        jobs = [(spec.options[key], meta.at(key), val.get(key, NotSpecified)) for key in keys]
+        for key, normalised in zip(keys, await self.children(errors, jobs)):
+            if normalised.ok:
+                result[key] = normalised.value
+            else:
+                errors.errors.append(normalised.error)
+
+        if errors:
+            return errors.failure()
+
+        return Success(result)
+
+    async def try_create_spec(self, spec, meta, val):
+        if val is NotSpecified:
+            return spec.try_normalise(meta, val)
+
+        if isinstance(val, spec.kls):
+            return Success(val)
+
+        errors = ErrorCollector(meta)
+        for validated in await self.children(errors, [(validator, meta, val) for validator in spec.validators]):
+            if is_fatal(validated):
+                return validated
+            elif not validated.ok:
+                errors.errors.append(validated.error)
+
+        if errors:
+            return errors.failure("Failed to validate")
+
+        values = await self.normalise(spec.expected_spec, meta, val)
+        if not values.ok:
+            return values
+
+        return Success(spec.create(meta, values.value))
+
+    async def try_listof(self, spec, meta, val):
+        if val is NotSpecified:
+            return spec.try_normalise(meta, val)
+
+        if spec.expect is not NotSpecified and isinstance(val, spec.expect):
+            return Success([val])
+
+        if not isinstance(val, list):
+            val = [val]
+
+        if spec.expect is NotSpecified:
+            return await self.many(spec.spec, meta, val, parallel=True)
+
+        errors = ErrorCollector(meta)
+        jobs = [(spec.spec, meta.indexed_at(index), item) for index, item in enumerate(val) if not isinstance(item, spec.expect)]
+        found = iter(await self.children(errors, jobs))
+
+        result = []
+        for index, item in enumerate(val):
+            if isinstance(item, spec.expect):
+                result.append((index, item))
+                continue
+
+            normalised = next(found, None)
+            if normalised is None:
+                break
+            elif normalised.ok:
+                result.append((index, normalised.value))
+            else:
+                errors.errors.append(normalised.error)
+
+        for index, value in result:
+            if errors.exhausted():
+                break
+
+            if not isinstance(value, spec.expect):
+                errors.add(BadSpecValue("Expected normaliser to create a specific object", expected=spec.expect, meta=meta.indexed_at(index), got=value), errors.count)
+
+        if errors:
+            return errors.failure()
+
+        return Success([value for _, value in result])
+
+    async def try_tupleof(self, spec, meta, val):
+        if val is NotSpecified:
+            return spec.try_normalise(meta, val)
+
+        if not isinstance(val, list) and not isinstance(val, tuple):
+            val = [val]
+
+        result = await self.many(spec.spec, meta, val)
+        if not result.ok:
+            return result
+
+        return Success(tuple(result.value))
+
+    async def try_dictof(self, spec, meta, val):
+        if val is NotSpecified:
+            return spec.try_normalise(meta, val)
+
+        dct = sb.dictionary_spec().try_normalise(meta, val)
+        if not dct.ok:
+            return dct
+
+        errors = ErrorCollector(meta)
+
+        if not spec.nested:
+            items = list(dct.value.items())
+            keys = [key for key, _ in items]
+            count = errors.count
+            names = await self.many(spec.name_spec, meta, keys, keys=keys)
+            if names.ok:
+                values = await self.many(spec.value_spec, meta, [value for _, value in items], keys=keys, parallel=True)
+                if not values.ok:
+                    return values
+                return Success(dict(zip(names.value, values.value)))
+            errors.rewind(count)
+
+        result = {}
+        jobs = [(spec, meta.at(key), key, value) for key, value in dct.value.items()]
+        for normalised in await self.children(errors, jobs, func=self.dictof_item):
+            if normalised.ok:
+                name, value = normalised.value
+                result[name] = value
+            else:
+                errors.errors.append(normalised.error)
+
+        if errors:
+            return errors.failure()
+
+        return Success(result)
+
+    async def dictof_item(self, spec, meta, key, value):
+        """Return a ``Success`` with the normalised name and value of one item in a ``dictof``"""
+        name = await self.normalise(spec.name_spec, meta, key)
+        if not name.ok:
+            return name
+
+        if spec.nested and (isinstance(value, dict) or getattr(value, "is_dict", False)):
+            normalised = await self.normalise(spec, meta, value)
+        else:
+            normalised = await self.normalise(spec.value_spec, meta, value)
+
+        if not normalised.ok:
+            return normalised
+        return Success((name.value, normalised.value))
+
+    async def try_tuple_spec(self, spec, meta, val):
+        if val is NotSpecified:
+            return spec.try_normalise(meta, val)
+
+        if type(val) is not tuple:
+            return Failure(BadSpecValue("Expected a tuple", got=type(val), meta=meta))
+
+        if len(val) != len(spec.specs):
+            return Failure(BadSpecValue("Expected tuple to be of a particular length", expected=len(spec.specs), got=len(val), meta=meta))
+
+        result = []
+        errors = ErrorCollector(meta)
+        for normalised in await self.children(errors, [(s, meta.indexed_at(index), val[index]) for index, s in enumerate(spec.specs)]):
+            if normalised.ok:
+                result.append(normalised.value)
+            elif is_fatal(normalised):
+                return normalised
+            else:
+                errors.errors.append(normalised.error)
+
+        if errors:
+            return errors.failure("Value failed some specifications")
+
+        return Success(tuple(result))
+
+    async def try_or_spec(self, spec, meta, val):
+        if val is NotSpecified:
+            return spec.try_normalise(meta, val)
+
+        errors = []
+        collector = ErrorCollector(meta)
+        count = collector.count
+        for option in spec.specs:
+            result = await self.normalise(option, meta, val)
+            # Options that don't match don't use up the error budget
+            collector.rewind(count)
+            if result.ok:
+                return result
+            errors.append(result.error)
+
+        return Failure(BadSpecValue("Value doesn't match any of the options", meta=meta, val=val, _errors=errors))
+
+    async def try_and_spec(self, spec, meta, val):
+        if val is NotSpecified:
+            return spec.try_normalise(meta, val)
+
+        transformations = [val]
+        for option in spec.specs:
+            result = await self.normalise(option, meta, val)
+            if not result.ok:
+                return Failure(BadSpecValue("Value didn't match one of the options", meta=meta, transformations=transformations, _errors=[result.error]))
+            val = result.value
+            transformations.append(val)
+
+        return Success(val)
+
+    async def try_proxy(self, spec, meta, val):
+        """``defaulted``, ``required`` and ``optional_spec``"""
+        if val is NotSpecified:
+            return spec.try_normalise(meta, val)
+        return await self.normalise(spec.spec, meta, val)
+
+    async def try_container_spec(self, spec, meta, val):
+        if isinstance(val, spec.kls):
+            return Success(val)
+
+        result = await self.normalise(spec.spec, meta, val)
+        if not result.ok:
+            return result
+        return Success(spec.kls(result.value))
+
+async def drive(func, meta, *args, **kwargs):
+    """
+    Return what ``func(normaliser, meta, *args, **kwargs)`` resolves to, with
+    a ``Normaliser`` for the ``Run`` in ``meta``
+
+    A ``Run`` is made for ``meta`` if it doesn't have one, and
+    ``run.waiting`` is a ``Waiting`` while the coroutine runs.
+    """
+    run = getattr(meta, "run", None)
+    if not isinstance(run, Run):
+        run = Run()
+        meta = meta.__class__(meta.everything, meta._path, run=run)
+
+    previous = run.waiting
+    run.waiting = Waiting(asyncio.get_event_loop())
+    try:
+        return await func(Normaliser(run), meta, *args, **kwargs)
+    finally:
+        run.waiting = previous
+
+async def try_normalise_async(spec, meta, val):
+    """The same as ``input_algorithms.spec_base.try_normalise`` but awaitable"""
+    if not isinstance(meta, Meta):
+        return try_normalise(spec, meta, val)
+    return await drive(lambda normaliser, meta: normaliser.normalise(spec, meta, val), meta)
+
+async def normalise_async(spec, meta, val):
+    """Return the normalised value or raise the error"""
+    result = await try_normalise_async(spec, meta, val)
+    if result.ok:
+        return result.value
+    raise result.error
+
+async def try_normalise_many_async(spec, meta, values, keys=None):
+    """The same as ``input_algorithms.spec_base.try_normalise_many`` but awaitable"""
+    if not isinstance(meta, Meta):
+        return sb.try_normalise_many(spec, meta, values, keys=keys)
+    return await drive(lambda normaliser, meta: normaliser.many(spec, meta, list(values), keys=keys), meta)
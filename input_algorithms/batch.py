@@ -0,0 +1,278 @@
+"""
+Normalise many documents with the same spec on a pool of worker processes
+that stays warm between batches.
+
+.. code-block:: python
+
+    from input_algorithms.batch import BatchNormaliser
+
+    with BatchNormaliser(TenantConfig.FieldSpec, processes=4) as batch:
+        for result in batch.normalise(documents):
+            if result.ok:
+                store(result.value)
+            else:
+                complain(result.error)
+
+``make_spec`` is called once in each worker the first time it's given
+documents, so it and it's ``args`` and ``kwargs`` must be picklable. A class method like
+``MyKls.FieldSpec`` or a function in a module is fine, a lambda isn't.
+
+Each document is normalised with ``Meta(document, [])``, or with
+``Meta(everything, [])`` if ``everything`` is given, and the results are
+yielded in the same order as the documents as they are ready. Documents and
+the normalised values are pickled to go between processes.
+
+Any error, whether a ``BadSpec`` or something else going wrong, comes back
+as a ``Failure`` for that document and the rest of the batch carries on. If a
+worker process dies, the documents that were waiting on the pool get a
+``Failure`` and the rest are normalised with a new pool.
+
+With ``threads`` the documents are normalised by a pool of threads in this
+process instead. The spec is made once and the threads share a frozen copy of
+it (see ``Spec.frozen_copy``), and nothing is pickled. This only runs in
+parallel on a free-threaded python, otherwise the threads take turns.
+"""
+from input_algorithms.spec_base import try_normalise
+from input_algorithms.results import Failure
+from input_algorithms.errors import BatchError
+from input_algorithms.pools import thread_pool, ProcessPoolExecutor, BrokenProcessPool
+from input_algorithms.meta import Meta, Run
+
+from six.moves import cPickle as pickle
+from collections import deque
+import multiprocessing
+import uuid
+
+# Set in each worker by ``start_worker``
+worker = {}
+
+def start_worker(key, make_spec, args, kwargs, everything, max_errors):
+    """Make the spec for the ``BatchNormaliser`` with this ``key`` in this worker"""
+    worker.clear()
+    worker.update(key=key, everything=everything, max_errors=max_errors)
+    try:
+        worker["spec"] = make_spec(*args, **kwargs)
+    except Exception as error:
+        worker["error"] = BatchError("Failed to make the spec", error=repr(error))
+
+def normalise_in_worker(setup, documents):
+    """
+    Normalise a chunk of documents and return the pickled result for each one
+
+    ``setup`` is the arguments for ``start_worker``, which is only called if
+    this worker hasn't already made the spec for them.
+    """
+    if worker.get("key") != setup[0]:
+        start_worker(*setup)
+
+    found = []
+    for document in documents:
+        result = normalise_document(worker.get("spec"), worker.get("error"), document, worker["everything"], worker["max_errors"])
+        try:
+            found.append(pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+        except Exception as error:
+            found.append(pickle.dumps(Failure(BatchError("Couldn't send the result back", error=repr(error))), pickle.HIGHEST_PROTOCOL))
+    return found
+
+def chunked(documents, size):
+    """Yield lists of ``size`` documents from ``documents``"""
+    chunk = []
+    for document in documents:
+        chunk.append(document)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+def normalise_document(spec, spec_error, document, everything, max_errors):
+    """Return a ``Success`` or ``Failure`` for this document"""
+    if spec_error is not None:
+        return Failure(spec_error)
+
+    meta = Meta(document if everything is None else everything, [], run=Run(max_errors=max_errors))
+    try:
+        return try_normalise(spec, meta, document)
+    except Exception as error:
+        return Failure(BatchError("Failed to normalise the document", error=repr(error)))
+
+class BatchNormaliser(object):
+    """
+    Normalise documents with the spec from ``make_spec(*args, **kwargs)``
+
+    processes
+        How many worker processes to use. Defaults to the number of CPUs. With
+        one process, or without ``concurrent.futures``, documents are
+        normalised in this process with a spec made once.
+
+    threads
+        If this is more than one, documents are normalised with this many
+        threads in this process rather than with worker processes.
+
+    chunksize
+        How many documents to send to a worker at once.
+
+    everything
+        The ``everything`` for each ``Meta`` instead of the document.
+
+    max_errors
+        The error budget for each document. See ``input_algorithms.meta.Run``.
+
+    The pool is made the first time it's needed and kept until ``close`` is
+    called, or the ``with`` block is left.
+    """
+    def __init__(self, make_spec, args=(), kwargs=None, processes=None, chunksize=16, everything=None, max_errors=None, threads=None):
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.threads = threads
+        self.make_spec = make_spec
+        self.chunksize = chunksize
+        self.everything = everything
+        self.max_errors = max_errors
+        self.processes = processes or multiprocessing.cpu_count()
+
+        self.pool = None
+        self.local = None
+        self.key = uuid.uuid4().hex
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Stop the worker processes"""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def start(self):
+        """Start the worker processes if they aren't running already"""
+        if self.pool is None and self.processes > 1 and not self.threads and ProcessPoolExecutor is not None:
+            self.pool = ProcessPoolExecutor(max_workers=self.processes)
+        return self.pool
+
+    def normalise(self, documents):
+        """Yield a ``Success`` or ``Failure`` for each document in the same order"""
+        if self.threads:
+            for result in self.normalise_in_threads(documents):
+                yield result
+            return
+
+        pool = self.start()
+        if pool is None:
+            for result in self.normalise_here(documents):
+                yield result
+            return
+
+        for result in self.normalise_in_processes(documents):
+            yield result
+
+    def normalise_in_processes(self, documents):
+        """
+        Normalise documents with the worker processes
+
+        Documents are given to the workers ``chunksize`` at a time and only
+        two chunks per process are waiting at once, so ``documents`` may be a
+        generator that never ends.
+        """
+        setup = (self.key, self.make_spec, self.args, self.kwargs, self.everything, self.max_errors)
+
+        waiting = deque()
+        for chunk in chunked(documents, self.chunksize):
+            waiting.append(self.submit(setup, chunk))
+            if len(waiting) >= self.processes * 2:
+                for result in self.collect(*waiting.popleft()):
+                    yield result
+
+        while waiting:
+            for result in self.collect(*waiting.popleft()):
+                yield result
+
+    def submit(self, setup, chunk):
+        """
+        Give this chunk to the pool and return ``(pool, future, size)``
+
+        A new pool is started if the one we have is already broken.
+        """
+        pool = self.start()
+        try:
+            future = pool.submit(normalise_in_worker, setup, chunk)
+        except BrokenProcessPool:
+            self.forget(pool)
+            pool = self.start()
+            future = pool.submit(normalise_in_worker, setup, chunk)
+        return pool, future, len(chunk)
+
+    def forget(self, pool):
+        """Stop using this pool, which is broken, so the next chunk starts a new one"""
+        if self.pool is pool:
+            self.pool = None
+            pool.shutdown(wait=False)
+
+    def collect(self, pool, future, size):
+        """
+        Return the results for a chunk from ``submit``
+
+        If a worker died, every document in the chunk gets a ``Failure``.
+        """
+        try:
+            found = future.result()
+        except BrokenProcessPool as error:
+            self.forget(pool)
+            return [Failure(BatchError("A worker process died before the document was normalised", error=repr(error)))] * size
+        except Exception as error:
+            return [Failure(BatchError("Couldn't send the document to a worker", error=repr(error)))] * size
+
+        return [pickle.loads(result) for result in found]
+
+    def local_spec(self):
+        """Return ``(spec, error)`` for normalising in this process, only making the spec once"""
+        if self.local is None:
+            try:
+                spec = self.make_spec(*self.args, **self.kwargs)
+                if self.threads and hasattr(spec, "frozen_copy"):
+                    spec = spec.frozen_copy()
+                self.local = (spec, None)
+            except Exception as error:
+                self.local = (None, BatchError("Failed to make the spec", error=repr(error)))
+        return self.local
+
+    def normalise_here(self, documents):
+        """Normalise documents in this process with a spec that is only made once"""
+        spec, error = self.local_spec()
+        for document in documents:
+            yield normalise_document(spec, error, document, self.everything, self.max_errors)
+
+    def normalise_in_threads(self, documents):
+        """
+        Normalise documents with a pool of ``threads`` threads
+
+        Documents are given to the threads ``chunksize`` at a time and only
+        two chunks per thread are waiting at once, so ``documents`` may be a
+        generator that never ends.
+        """
+        # Make the spec before any of the threads want it
+        self.local_spec()
+
+        pool = thread_pool(self.threads)
+        if pool is None:
+            for result in self.normalise_here(documents):
+                yield result
+            return
+
+        def normalise_chunk(chunk):
+            return list(self.normalise_here(chunk))
+
+        waiting = deque()
+        for chunk in chunked(documents, self.chunksize):
+            waiting.append(pool.submit(normalise_chunk, chunk))
+            if len(waiting) >= self.threads * 2:
+                for result in waiting.popleft().result():
+                    yield result
+
+        while waiting:
+            for result in waiting.popleft().result():
+                yield result
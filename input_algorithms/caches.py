@@ -0,0 +1,296 @@
+"""
+Optional caches that specs can use to avoid doing the same work twice.
+
+These are not used unless they are given to a spec.
+"""
+from collections import OrderedDict
+import threading
+import weakref
+import time
+import re
+import os
+
+class GenerationDict(dict):
+    """
+    A dictionary that counts how many times it has been changed in
+    ``generation``
+
+    ``FormattedCache`` only remembers formatted values for configuration that
+    has a ``generation``, because that is how it knows when the configuration
+    has changed. Other objects, like a ``MergedOptions``, can be used by giving
+    them a ``generation`` attribute that goes up whenever they change.
+
+    Only changes to this dictionary are counted. If a value inside it is changed
+    in place, call ``bump`` to say so.
+
+    ``generation`` is changed under a lock so that changes from different
+    threads are all counted.
+    """
+    generation = 0
+    generation_lock = threading.Lock()
+
+    def bump(self):
+        """Say that we have changed"""
+        with self.generation_lock:
+            self.generation += 1
+
+    def __setitem__(self, key, val):
+        super(GenerationDict, self).__setitem__(key, val)
+        self.bump()
+
+    def __delitem__(self, key):
+        super(GenerationDict, self).__delitem__(key)
+        self.bump()
+
+    def update(self, *args, **kwargs):
+        super(GenerationDict, self).update(*args, **kwargs)
+        self.bump()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.bump()
+        return super(GenerationDict, self).setdefault(key, default)
+
+    def pop(self, *args):
+        result = super(GenerationDict, self).pop(*args)
+        self.bump()
+        return result
+
+    def popitem(self):
+        result = super(GenerationDict, self).popitem()
+        self.bump()
+        return result
+
+    def clear(self):
+        super(GenerationDict, self).clear()
+        self.bump()
+
+class FormattedCache(object):
+    """
+    A least recently used cache of values made by the formatter in
+    ``input_algorithms.spec_base.formatted``
+
+    .. code-block:: python
+
+        cache = FormattedCache(size=2048)
+        formatted(string_spec(), formatter=MyFormatter, cache=cache)
+
+        # Or for every formatted spec that isn't given a cache
+        formatted.cache = cache
+
+    Values are keyed on the formatter, ``meta.path``, the template, the
+    ``_key_name_<i>`` values the template refers to, and ``meta.everything``
+    along with it's ``generation``.
+
+    Configuration with a ``generation`` (see ``GenerationDict``) is
+    remembered here until it changes or the value is the least recently used.
+    Other configuration, like a plain dictionary or a ``MergedOptions`` without
+    a ``generation``, can't say when it has changed, so values for it are only
+    remembered for the rest of the normalisation, in a cache in the
+    ``input_algorithms.meta.Run``. Without a ``Run`` they aren't remembered at
+    all.
+
+    This assumes that what the formatter makes only depends on those things.
+
+    Only a weak reference to ``meta.everything`` is kept, so the cache doesn't
+    keep old configuration alive. Configuration that can't be weakly referenced
+    is treated like configuration without a ``generation``.
+
+    ``hits`` and ``misses`` count how often a value was found or had to be
+    made, which is useful for choosing ``size``.
+
+    The cache may be used from many threads at once. The formatter is called
+    outside the lock, so two threads may format the same template at the same
+    time.
+    """
+    key_name_regex = re.compile(r"_key_name_\d+")
+
+    def __init__(self, size=1024):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.values = OrderedDict()
+        self.key_names_for = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def clear(self):
+        """Forget everything and reset the counters"""
+        with self.lock:
+            self.values.clear()
+            self.key_names_for.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def key_for(self, formatter, path, template, key_names):
+        """
+        Return the key for this template, without the configuration
+
+        The names of the key names in a template are remembered per template.
+
+        The path is part of the key because it is given to the formatter, which
+        may use it to say where an error is or to look up relative options.
+        """
+        with self.lock:
+            names = self.key_names_for.get(template)
+        if names is None:
+            names = tuple(sorted(set(self.key_name_regex.findall(template))))
+            with self.lock:
+                self.key_names_for[template] = names
+
+        return (formatter, path, template, tuple(key_names.get(name) for name in names))
+
+    def store_for(self, everything, run):
+        """
+        Return ``(values, key, ref)`` for where to remember values for this
+        configuration, or None if they can't be remembered
+
+        ``values`` is our own dictionary, or the one in ``run`` for configuration
+        without a ``generation``. ``key`` says which configuration it is, and
+        ``ref()`` returns the configuration if it's still the same object.
+        """
+        generation = getattr(everything, "generation", None)
+        if generation is not None:
+            try:
+                return self.values, (id(everything), generation), weakref.ref(everything)
+            except TypeError:
+                pass
+
+        if run is None:
+            return None
+
+        # The run goes away at the end of the normalisation, so it can hold on to everything
+        return run.cache(("formatted", id(self))), (id(everything), ), lambda: everything
+
+    def format(self, formatter, options, path, template, key_names, everything, run=None):
+        """Return ``formatter(options, path, value=template).format()``, using a remembered value if we can"""
+        store = self.store_for(everything, run)
+        if store is None:
+            return formatter(options, path, value=template).format()
+
+        values, which, ref = store
+        key = self.key_for(formatter, path, template, key_names) + which
+
+        with self.lock:
+            found = values.get(key)
+            # Make sure the id of everything wasn't reused by a different object
+            if found is not None and found[0]() is everything:
+                self.hits += 1
+                if values is self.values:
+                    values.pop(key)
+                    values[key] = found
+                return found[1]
+            self.misses += 1
+
+        value = formatter(options, path, value=template).format()
+        with self.lock:
+            values[key] = (ref, value)
+            if values is self.values:
+                while len(values) > self.size:
+                    values.popitem(last=False)
+        return value
+
+class StatCache(object):
+    """
+    Remembers ``os.stat`` of paths for ``directory_spec`` and ``filename_spec``
+
+    .. code-block:: python
+
+        cache = StatCache(ttl=30, size=4096)
+        directory_spec.stat_cache = cache
+        filename_spec.stat_cache = cache
+
+    Results are forgotten ``ttl`` seconds after they were found, or never if
+    ``ttl`` is None. Paths that can't be stat'd are remembered as ``None``.
+
+    At most ``size`` paths are remembered, and the least recently used are
+    forgotten first. ``size`` may be None for no limit, which is what the
+    cache for each normalisation uses (see ``for_run``), as it goes away with
+    the ``Run``.
+
+    Each normalisation with a ``input_algorithms.meta.Run`` also gets a
+    ``StatCache`` of it's own without a ttl, which asks the shared cache, if
+    there is one, before calling ``os.stat``.
+
+    Counters
+        stats
+            How many times ``os.stat`` was called
+
+        hits
+            How many paths were found in this cache
+
+        saved
+            How many syscalls were saved compared to calling
+            ``os.path.exists`` and then ``os.path.isdir`` or
+            ``os.path.isfile`` for every path
+
+    The cache may be used from many threads at once. ``os.stat`` is called
+    outside the lock, so two threads may stat the same path at the same time.
+    """
+    def __init__(self, ttl=None, size=4096):
+        self.ttl = ttl
+        self.size = size
+        self.lock = threading.Lock()
+        self.results = OrderedDict()
+        self.stats = 0
+        self.hits = 0
+        self.saved = 0
+
+    @classmethod
+    def for_run(kls):
+        """Make the cache for one normalisation, which doesn't need a size"""
+        return kls(size=None)
+
+    def __len__(self):
+        return len(self.results)
+
+    def clear(self):
+        """Forget everything and reset the counters"""
+        with self.lock:
+            self.results.clear()
+            self.stats = 0
+            self.hits = 0
+            self.saved = 0
+
+    def stat(self, path, shared=None):
+        """
+        Return the ``os.stat`` of ``path`` or None if it can't be stat'd
+
+        If we don't know it already we ask ``shared`` if that is given or
+        otherwise call ``os.stat``.
+        """
+        found = self.results.get(path)
+        if found is not None:
+            result, expires = found
+            if expires is None or expires > time.time():
+                with self.lock:
+                    self.hits += 1
+                    self.saved += 1 if result is None else 2
+                    if self.size is not None and self.results.pop(path, None) is not None:
+                        self.results[path] = found
+                return result
+
+        saved = 0
+        if shared is not None:
+            result = shared.stat(path)
+        else:
+            try:
+                result = os.stat(path)
+            except OSError:
+                result = None
+            else:
+                # exists and then isdir/isfile would have been two
+                saved = 1
+
+        with self.lock:
+            if shared is None:
+                self.stats += 1
+                self.saved += saved
+            self.results.pop(path, None)
+            self.results[path] = (result, None if self.ttl is None else time.time() + self.ttl)
+            if self.size is not None:
+                while len(self.results) > self.size:
+                    self.results.popitem(last=False)
+        return result
@@ -41,8 +41,14 @@ Creates an ``__init__`` that behaves like:
 
     Is a perfectly valid example.
 
-    Internally, ``dictobj`` uses a library called ``namedlist`` to validate the
-    fields and work out the default values when an option isn't specified.
+    Fields without a default come first in the ``__init__``, followed by the
+    fields with a default, in the order they are in ``fields``. If a default is
+    callable, it is called for each instance that isn't given that field.
+
+    The ``__init__`` is generated from ``fields`` when the class is made,
+    rather than working out the defaults for every instance. If ``fields`` is
+    replaced on the class later, it is generated again the next time an
+    instance is made.
 
 Once an instance of ``dictobj`` is created you may access the attributes however
 you wish!
@@ -64,11 +70,164 @@ from input_algorithms.field_spec import Field, NullableField, FieldSpecMetakls
 from input_algorithms import spec_base as sb
 from input_algorithms.errors import BadSpec
 
-from namedlist import namedlist
+from six.moves import copyreg
+from types import MemberDescriptorType
+import threading
+import keyword
 import six
 
-empty_defaults = namedlist("Defaults", [])
-cached_namedlists = {}
+# Tells the generated __init__ to call the default for this field
+call_default = object()
+
+def valid_identifier(name):
+    """Say whether this name may be used as an argument"""
+    if hasattr(name, "isidentifier"):
+        return name.isidentifier()
+    return bool(name) and (name[0].isalpha() or name[0] == "_") and all(c.isalnum() or c == "_" for c in name)
+
+def check_field_names(kls_name, names):
+    """Complain with a ValueError if these names can't be arguments to the generated ``__init__``"""
+    seen = set()
+    for name in names:
+        if not valid_identifier(name):
+            raise ValueError("Field names must be valid identifiers: {0!r} on {1}".format(name, kls_name))
+        if keyword.iskeyword(name):
+            raise ValueError("Field names cannot be a keyword: {0!r} on {1}".format(name, kls_name))
+        if name.startswith("_"):
+            raise ValueError("Field names cannot start with an underscore: {0!r} on {1}".format(name, kls_name))
+        if name in seen:
+            raise ValueError("Encountered duplicate field name: {0!r} on {1}".format(name, kls_name))
+        seen.add(name)
+
+def split_fields(fields):
+    """
+    Return ``(required, optional)`` names from ``fields``
+
+    Where ``optional`` is a list of ``(name, default)`` for the fields that
+    have a default.
+    """
+    required = []
+    optional = []
+    for field in fields or ():
+        if isinstance(field, (tuple, list)):
+            name, dflt = field
+            optional.append((str(name), dflt))
+        else:
+            required.append(str(field))
+    return required, optional
+
+def generate_init(kls_name, required, optional, lines, namespace):
+    """
+    Compile an ``__init__`` that takes the required and optional fields, fills
+    in the callable defaults and then runs ``lines``
+
+    ``namespace`` is the globals for the function and gets a ``_dflt_<name>``
+    for each default.
+    """
+    namespace["_call_default"] = call_default
+    arguments = ["_self"] + required
+    defaults = []
+    for name, dflt in optional:
+        namespace["_dflt_{0}".format(name)] = dflt
+        if callable(dflt):
+            arguments.append("{0}=_call_default".format(name))
+            defaults.append("if {0} is _call_default: {0} = _dflt_{0}()".format(name))
+        else:
+            arguments.append("{0}=_dflt_{0}".format(name))
+
+    source = "def __init__({0}):\n    {1}\n".format(", ".join(arguments), "\n    ".join(defaults + lines or ["pass"]))
+    six.exec_(compile(source, "<{0}>".format(kls_name), "exec"), namespace)
+    return namespace["__init__"]
+
+def make_init(kls):
+    """
+    Generate the function that sets the fields from ``kls.fields`` on a new
+    instance and return ``(kls, fields, function)``
+
+    Fields that aren't also attributes on the class are put straight into the
+    dictionary, and anything else goes through ``__setitem__``.
+
+    This also remembers the names of the attributes on the class in
+    ``kls._class_attributes``, apart from the ``Field`` attributes on a
+    ``dictobj.Spec``. Those are always set on the instance as well, so reading
+    them from the dictionary gives the same value.
+    """
+    fields = kls.fields
+    required, optional = split_fields(fields)
+    names = required + [name for name, _ in optional]
+    check_field_names(kls.__name__, names)
+
+    # The same names hasattr(kls, name) would find, without the Field attributes
+    kls._class_attributes = frozenset(
+          name for name in set(dir(kls)) | set(dir(type(kls)))
+          if not getattr(getattr(kls, name, None), "is_input_algorithms_field", False)
+        )
+
+    lines = []
+    plain_setitem = six.get_unbound_function(kls.__setitem__) is six.get_unbound_function(dictobj.__setitem__)
+    for name in names:
+        if plain_setitem and not hasattr(kls, name):
+            lines.append("_setitem(_self, {0!r}, {0})".format(name))
+        else:
+            lines.append("_self[{0!r}] = {0}".format(name))
+
+    func = generate_init("dictobj {0}".format(kls.__name__), required, optional, lines, {"_setitem": dict.__setitem__})
+    made = kls._made_init = (kls, fields, func)
+    return made
+
+class wrapped_spec(object):
+    """
+    Used by ``selection`` to make ``wrapper(spec())``, or ``wrapper(spec)`` if
+    spec isn't callable
+
+    This is a class rather than a lambda so that selections can be pickled.
+    """
+    def __init__(self, wrapper, spec):
+        self.spec = spec
+        self.wrapper = wrapper
+
+    def __call__(self):
+        spec = self.spec
+        if callable(spec):
+            spec = spec()
+        return self.wrapper(spec)
+
+class wrapped_wrapper(object):
+    """Used by ``selection`` to make ``wrapper(inner(spec))`` for a Field that already has a wrapper"""
+    def __init__(self, wrapper, inner):
+        self.inner = inner
+        self.wrapper = wrapper
+
+    def __call__(self, spec):
+        return self.wrapper(self.inner(spec))
+
+class SelectionMetakls(type):
+    """The type of selections from a normal dictobj, so that they can be pickled"""
+
+def make_selection(kls, kls_name, wanted, kwargs):
+    """Make a selection again when unpickling it"""
+    return kls.selection(kls_name, wanted, **kwargs)
+
+# Locked when remembering a class made by ``dictobj.selection``
+selections_lock = threading.Lock()
+
+def hashable_option(val):
+    """Return a hashable equivalent of an option given to ``dictobj.selection``"""
+    if isinstance(val, (list, tuple)):
+        return tuple(val)
+    if isinstance(val, (set, frozenset)):
+        return frozenset(val)
+    return val
+
+def reduce_class(kls):
+    """
+    Pickle classes made by ``dictobj.selection`` as the selection that made
+    them, and any other class as a reference to where it is defined.
+    """
+    selected_from = kls.__dict__.get("_selected_from")
+    if selected_from is None:
+        return getattr(kls, "__qualname__", kls.__name__)
+    return make_selection, selected_from
 
 class dictobj(dict):
     fields = None
@@ -77,31 +236,32 @@ class dictobj(dict):
     Field = Field
     NullableField = NullableField
 
-    def make_defaults(self):
-        """Make a namedtuple for extracting our wanted keys"""
-        if not self.fields:
-            return empty_defaults
-        else:
-            fields = []
-            end_fields = []
-            for field in self.fields:
-                if isinstance(field, (tuple, list)):
-                    name, dflt = field
-                    if callable(dflt):
-                        dflt = dflt()
-                    end_fields.append((name, dflt))
-                else:
-                    fields.append(field)
+    # (kls, fields, __init__) from make_init
+    _made_init = (None, None, None)
 
-            joined = fields + end_fields
-            identifier = str(joined)
-            if identifier not in cached_namedlists:
-                cached_namedlists[identifier] = namedlist("Defaults", joined)
-            return cached_namedlists[identifier]
+    # Names of the attributes on the class from make_init
+    _class_attributes = frozenset()
+
+    @classmethod
+    def __init_subclass__(kls, **kwargs):
+        """Generate the ``__init__`` for the fields when the class is made, on python3.6 and above"""
+        super(dictobj, kls).__init_subclass__(**kwargs)
+        try:
+            make_init(kls)
+        except ValueError:
+            # Complain when an instance is made instead
+            pass
 
     def __init__(self, *args, **kwargs):
-        super(dictobj, self).__init__()
-        self.setup(*args, **kwargs)
+        kls = self.__class__
+        if six.get_unbound_function(kls.setup) is not dictobj_setup:
+            self.setup(*args, **kwargs)
+            return
+
+        made = kls._made_init
+        if made[0] is not kls or made[1] is not kls.fields:
+            made = make_init(kls)
+        made[2](self, *args, **kwargs)
 
     def __nonzero__(self):
         """
@@ -111,34 +271,45 @@ class dictobj(dict):
         return True
 
     def setup(self, *args, **kwargs):
-        defaults = self.make_defaults()(*args, **kwargs)
-        for field in defaults._fields:
-            self[field] = getattr(defaults, field)
+        """Set our fields from args and kwargs with the generated ``__init__`` for our class"""
+        kls = self.__class__
+        made = kls._made_init
+        if made[0] is not kls or made[1] is not kls.fields:
+            made = make_init(kls)
+        made[2](self, *args, **kwargs)
 
     def __getattr__(self, key):
-        """Pretend object access"""
-        key = str(key)
-        if key not in self or hasattr(self.__class__, key):
-            return object.__getattribute__(self, key)
+        """
+        Pretend object access
 
-        try:
-            return super(dictobj, self).__getitem__(key)
-        except KeyError as e:
-            if e.message == key:
+        This is only called when the attribute isn't on the instance or the
+        class, so a key that isn't in the ``_class_attributes`` remembered for
+        the class is looked for in the dictionary.
+        """
+        if key not in self._class_attributes:
+            try:
+                return dict.__getitem__(self, key)
+            except KeyError:
                 raise AttributeError(key)
-            else:
-                raise
+        return object.__getattribute__(self, key)
 
     def __getitem__(self, key):
         """
         If the key is on the class, then return that attribute, otherwise do a
         super call to ``dict.__getitem__``.
+
+        A key that isn't in ``_class_attributes`` is read from the dictionary
+        first. ``__setitem__`` keeps the instance attribute and the dictionary
+        the same for names on the class, so this gives the same value.
         """
-        key = str(key)
-        if key not in self or hasattr(self.__class__, key):
-            return object.__getattribute__(self, key)
-        else:
-            return super(dictobj, self).__getitem__(key)
+        if key.__class__ is not str:
+            key = str(key)
+        if key not in self._class_attributes:
+            try:
+                return dict.__getitem__(self, key)
+            except KeyError:
+                pass
+        return object.__getattribute__(self, key)
 
     def __setattr__(self, key, val):
         """
@@ -147,8 +318,6 @@ class dictobj(dict):
 
         We also do the equivalent of ``dict.__setitem__`` on this instance.
         """
-        if hasattr(self.__class__, key):
-            object.__setattr__(self, key, val)
         self[key] = val
 
     def __delattr__(self, key):
@@ -167,10 +336,14 @@ class dictobj(dict):
         If the key is on the class itself, then set the value as an attribute on
         the class, otherwise, use a super call to ``dict.__setitem__`` on this
         instance.
+
+        Names that aren't in ``_class_attributes`` are checked with ``hasattr``
+        so that attributes added to the class after it was made, and the
+        ``Field`` attributes on a ``dictobj.Spec``, are found.
         """
-        if hasattr(self.__class__, key):
+        if key in self._class_attributes or hasattr(self.__class__, key):
             object.__setattr__(self, key, val)
-        super(dictobj, self).__setitem__(key, val)
+        dict.__setitem__(self, key, val)
 
     def clone(self):
         """Return a clone of this object"""
@@ -180,17 +353,23 @@ class dictobj(dict):
         """
         Return as a deeply nested dictionary
 
-        This will call ``as_dict`` on values if they have such an attribute.
+        Values that are a dictobj, or a list, tuple or dict with dictobjs in
+        them, are converted as well, and ``as_dict(**kwargs)`` is called on any
+        other value that has such an attribute.
+
+        This doesn't recurse, so very deep trees are fine, and an object that
+        is in the tree more than once is only converted once, with the same
+        result in each place. A cycle is a ValueError.
         """
-        result = {}
+        return convert_as_dict(self, kwargs)
+
+    def _as_dict_fields(self):
+        """Return ``[(name, value)]`` for each field for ``as_dict``"""
+        result = []
         for field in self.fields:
             if isinstance(field, (list, tuple)):
                 field, _ = field
-            val = self[field]
-            if hasattr(val, "as_dict"):
-                result[field] = val.as_dict(**kwargs)
-            else:
-                result[field] = val
+            result.append((field, self[field]))
         return result
 
     @classmethod
@@ -233,7 +412,45 @@ class dictobj(dict):
         This works by returning a new class with only some of the fields in the fields list
 
         .. note:: The keyword options only work for dictobj.Spec objects and are ignored for normal dictobj objects
+
+        The new class remembers the arguments it was made with, so that it and
+        it's instances can be pickled even though it isn't defined in a module.
+        Unpickling it calls ``selection`` again with the same arguments.
+
+        Selections are remembered on ``kls``, so asking for the same selection
+        again returns the same class, along with the spec already built for
+        it's ``FieldSpec``. A class that is defined again is a new class, and
+        replacing ``fields`` on ``kls`` means the selections are made again.
+        Options that can't be hashed mean the selection is made every time.
         """
+        try:
+            key = (kls_name, hashable_option(wanted), tuple(sorted((k, hashable_option(v)) for k, v in kwargs.items())))
+            hash(key)
+        except TypeError:
+            return kls.make_selection_class(kls_name, wanted, kwargs)
+
+        fields = kls.fields
+        selections = kls.__dict__.get("_selections")
+        if selections is not None:
+            found = selections.get(key)
+            if found is not None and found[0] is fields:
+                return found[1]
+
+        made = kls.make_selection_class(kls_name, wanted, kwargs)
+        with selections_lock:
+            selections = kls.__dict__.get("_selections")
+            if selections is None:
+                selections = {}
+                setattr(kls, "_selections", selections)
+
+            found = selections.get(key)
+            if found is None or found[0] is not fields:
+                found = selections[key] = (fields, made)
+        return found[1]
+
+    @classmethod
+    def make_selection_class(kls, kls_name, wanted, kwargs):
+        """Make the class for ``selection`` without looking for one we made already"""
         fields = kls.fields
         name_map = {}
         any_spec = sb.any_spec()
@@ -255,8 +472,9 @@ class dictobj(dict):
         # But we still want everything else from kls to pretend it's inherited.......
         # I doubt this will work with super though..... feel free to raise an issue if this is undesirable...
         attrs = {}
-        extra = set(dir(kls)) - set(dir(dictobj)) - set(name_map) - set(["FieldSpec"])
-        attrs.update(dict((k, getattr(dictobj, k)) for k in extra))
+        extra = set(dir(kls)) - set(dir(dictobj)) - set(name_map) - set(["FieldSpec", "_selections"])
+        attrs.update(dict((k, getattr(kls, k)) for k in extra))
+        attrs["_selected_from"] = (kls, kls_name, list(wanted), kwargs)
 
         # Collect our new fields
         new_fields = {}
@@ -271,7 +489,7 @@ class dictobj(dict):
             # We weren't selecting from dictobj.Spec, so let's just set the fields and be done
             # Normal dictobj has no normalise functionality and so no point in setting such things
             attrs["fields"] = new_fields
-            return type(kls_name, (dictobj, ), attrs)
+            return SelectionMetakls(kls_name, (dictobj, ), attrs)
 
         # Ok, so, for dictobj.Spec, we set attrs on the class rather than fields
         # So let's seed the attrs with our cloned fields
@@ -292,7 +510,7 @@ class dictobj(dict):
 
             # <options> can be a callable, an input_algorithms field or, well, it shouldn't be anything else...
             if callable(s):
-                s = lambda: wrapper(s())
+                s = wrapped_spec(wrapper, s)
             else:
                 if getattr(s, "is_input_algorithms_field", False):
                     # We don't want to override the default with optional_spec
@@ -301,11 +519,11 @@ class dictobj(dict):
                     else:
                         # We also don't want to override an existing wrapper
                         if s.wrapper is not sb.NotSpecified:
-                            s = s.clone(wrapper=lambda spec: wrapper(s.wrapper(spec)))
+                            s = s.clone(wrapper=wrapped_wrapper(wrapper, s.wrapper))
                         else:
                             s = s.clone(wrapper=wrapper)
                 else:
-                    s = lambda: wrapper(s or any_spec)
+                    s = wrapped_spec(wrapper, s or any_spec)
 
             return s
 
@@ -342,6 +560,116 @@ class dictobj(dict):
         # Finally, we return our new class!
         return type(kls_name, (dictobj.Spec, ), attrs)
 
+dictobj_setup = six.get_unbound_function(dictobj.setup)
+dictobj_as_dict = six.get_unbound_function(dictobj.as_dict)
+
+# Types that as_dict never needs to look inside
+plain_types = frozenset((type(None), bool, float, six.text_type, six.binary_type) + six.integer_types)
+
+def as_dict_kind(val):
+    """
+    Return how ``convert_as_dict`` should convert this value
+
+    ``list``, ``tuple`` or ``dict`` for those containers, ``"fields"`` for
+    objects that use ``dictobj.as_dict``, ``"as_dict"`` for other objects with
+    an ``as_dict`` and None for everything else.
+    """
+    kls = val.__class__
+    if kls in plain_types:
+        return None
+    if kls is list or kls is tuple or kls is dict:
+        return kls
+
+    for k in kls.__mro__:
+        found = k.__dict__.get("as_dict")
+        # Ignore the slot for a record field called as_dict
+        if found is not None and not isinstance(found, MemberDescriptorType):
+            if found is dictobj_as_dict:
+                return "fields"
+            break
+
+    if hasattr(val, "as_dict"):
+        return "as_dict"
+
+def convert_as_dict(root, kwargs):
+    """
+    Do ``as_dict`` for ``root`` without recursing
+
+    Each object is converted after everything in it, using a stack of the
+    objects that are waiting for their contents. Results are remembered by the
+    id of the object so that each object is only converted once. Lists,
+    tuples and dicts with nothing to convert in them are used as is.
+    """
+    # {id(val): (val, converted)}, holding onto val so the id isn't reused
+    memo = {}
+    waiting = set()
+
+    # Frames are (val, kind, None) until we have looked inside val and then
+    # (val, kind, contents) once everything in it has been converted
+    stack = [(root, "fields", None)]
+    while stack:
+        val, kind, contents = stack.pop()
+        key = id(val)
+
+        if contents is None:
+            if key in memo:
+                continue
+
+            if kind == "as_dict":
+                memo[key] = (val, val.as_dict(**kwargs))
+                continue
+
+            if key in waiting:
+                raise ValueError("Found a cycle at a {0} while converting to a dictionary".format(val.__class__.__name__))
+
+            if kind == "fields":
+                contents = val._as_dict_fields()
+            elif kind is dict:
+                contents = list(val.items())
+            else:
+                contents = list(val)
+
+            pairs = kind == "fields" or kind is dict
+            children = []
+            for item in contents:
+                child = item[1] if pairs else item
+                child_kind = as_dict_kind(child)
+                if child_kind is not None:
+                    children.append((child, child_kind, None))
+
+            if not children:
+                if kind == "fields":
+                    memo[key] = (val, dict(contents))
+                else:
+                    memo[key] = (val, val)
+                continue
+
+            waiting.add(key)
+            stack.append((val, kind, contents))
+            stack.extend(reversed(children))
+            continue
+
+        waiting.discard(key)
+        changed = False
+        converted = []
+        for item in contents:
+            child = item[1] if kind == "fields" or kind is dict else item
+            found = memo.get(id(child))
+            if found is not None and found[1] is not child:
+                child = found[1]
+                changed = True
+            converted.append(child if kind is list or kind is tuple else (item[0], child))
+
+        if kind == "fields":
+            result = dict(converted)
+        elif not changed:
+            result = val
+        else:
+            result = kind(converted)
+        memo[key] = (val, result)
+
+    return memo[id(root)][1]
+
 def with_metaclass(meta, *bases):
     """
     A copy of six.with_metaclass but taking into account ``this_bases`` as well
@@ -355,3 +683,7 @@ def with_metaclass(meta, *bases):
     return type.__new__(metaclass, 'temporary_class', (), {})
 
 dictobj.Spec = with_metaclass(FieldSpecMetakls, dictobj)
+make_init(dictobj)
+
+copyreg.pickle(FieldSpecMetakls, reduce_class)
+copyreg.pickle(SelectionMetakls, reduce_class)
@@ -4,8 +4,42 @@ from delfick_error import DelfickError, ProgrammerError
 ProgrammerError = ProgrammerError
 
 class BadSpec(DelfickError):
+    """
+    Base error for specifications
+
+    Creating one of these only holds onto what it was given. Formatting the
+    kwargs, which includes working out paths and sources from any ``meta``,
+    only happens when the error is rendered or compared and is then remembered.
+
+    This means errors that are thrown away, like those from the options of an
+    ``or_spec`` that didn't match, cost very little.
+
+    Errors are treated as finished once they are rendered or compared, so
+    changing their ``kwargs`` after that won't be reflected.
+    """
     desc = "Something wrong with this specification"
 
+    def __init__(self, message="", **kwargs):
+        # Exception.__new__ has already set args for us
+        errors = kwargs.pop("_errors", None)
+        self.errors = [] if errors is None else errors
+        self.kwargs = kwargs
+        self.message = message
+        self._rendered = None
+        self._formatted = None
+
+    def __str__(self):
+        if self._rendered is None:
+            self._rendered = super(BadSpec, self).__str__()
+        return self._rendered
+
+    def as_tuple(self, for_hash=False, formatted=False):
+        if formatted and not for_hash:
+            if self._formatted is None:
+                self._formatted = super(BadSpec, self).as_tuple(formatted=True)
+            return self._formatted
+        return super(BadSpec, self).as_tuple(for_hash=for_hash, formatted=formatted)
+
 class BadSpecValue(BadSpec):
     desc = "Bad value"
 
@@ -21,3 +55,5 @@ class DeprecatedKey(BadSpecValue):
 class BadSpecDefinition(BadSpecValue):
     desc = "Spec isn't defined so well"
 
+class BatchError(BadSpec):
+    desc = "Couldn't normalise a document in the batch"
@@ -36,17 +36,67 @@ from input_algorithms.errors import BadSpec
 from input_algorithms.meta import Meta
 
 from delfick_error import ProgrammerError
+import threading
+import weakref
 import six
 
+# Classes that FieldSpec.cached_spec has remembered specs on
+cached_classes = weakref.WeakSet()
+cached_specs_lock = threading.Lock()
+
+def specs_for(kls):
+    """
+    Return the dictionary of specs that ``FieldSpec.cached_spec`` remembers on
+    this class, or None if we can't put one on it
+
+    The specs are kept on the class itself rather than in a global dictionary,
+    so they go away with the class. Subclasses get a dictionary of their own.
+    """
+    specs = getattr(kls, "__dict__", {}).get("_field_specs")
+    if specs is None:
+        with cached_specs_lock:
+            specs = getattr(kls, "__dict__", {}).get("_field_specs")
+            if specs is None:
+                specs = {}
+                try:
+                    setattr(kls, "_field_specs", specs)
+                    cached_classes.add(kls)
+                except (TypeError, AttributeError):
+                    return None
+    return specs
+
+def invalidate_cached_specs(kls=None):
+    """
+    Forget specs built by ``FieldSpec.cached_spec``
+
+    If ``kls`` is given, only specs for that class and it's subclasses are
+    forgotten, otherwise all of them are.
+
+    Use this if the ``fields`` of a class, or the ``Field`` objects in it, are
+    changed after the spec has been built.
+    """
+    with cached_specs_lock:
+        for found in list(cached_classes):
+            if kls is None or (isinstance(found, type) and issubclass(found, kls)):
+                found.__dict__["_field_specs"].clear()
+
 class FieldSpec(object):
     """
     Responsible for defining the Spec object used to convert a
     dictionary into an instance of the kls.
+
+    The spec is only built the first time it's needed for a particular
+    combination of kls, formatter and create_kls, and is remembered on kls.
+    Use ``invalidate_cached_specs`` if that needs to be redone.
+
+    A frozen FieldSpec uses a frozen copy of the spec instead, which is
+    remembered separately so that FieldSpecs that aren't frozen don't use it.
     """
     def __init__(self, kls, formatter=None, create_kls=None):
         self.kls = kls
         self.create_kls = create_kls or kls
         self.formatter = formatter
+        self.frozen = False
 
     def make_spec(self, meta):
         """
@@ -103,9 +153,72 @@ class FieldSpec(object):
 
         return create_spec(self.create_kls, **kwargs)
 
+    def cached_spec(self, meta):
+        """
+        Return the spec from self.make_spec, only making it if we haven't
+        already for this kls, formatter and create_kls
+
+        Specs that fail to build aren't remembered, so the errors always refer
+        to the meta we are given.
+
+        The spec is built outside of the lock, because it may need the cached
+        specs of other classes. If two threads build it at the same time, both
+        use the one that was remembered first.
+        """
+        specs = specs_for(self.kls)
+        if specs is None:
+            return self.build_spec(meta)
+
+        key = (self.formatter, self.create_kls, self.frozen)
+        try:
+            spec = specs.get(key)
+        except TypeError:
+            # Unhashable formatter, so we can't remember this one
+            return self.build_spec(meta)
+
+        if spec is None:
+            made = self.build_spec(meta)
+            with cached_specs_lock:
+                spec = specs.setdefault(key, made)
+        return spec
+
+    def build_spec(self, meta):
+        """Return the spec from self.make_spec, or a frozen copy of it if we are frozen"""
+        spec = self.make_spec(meta)
+        if self.frozen:
+            spec = spec.frozen_copy()
+        return spec
+
+    def freeze(self):
+        """
+        Use a frozen copy of the spec from now on so this FieldSpec may be
+        shared between threads, and return self
+
+        The specs used by FieldSpecs that aren't frozen are left alone.
+        """
+        self.frozen = True
+        self.cached_spec(Meta.empty())
+        return self
+
+    def frozen_copy(self, memo=None):
+        """
+        Return a frozen FieldSpec for the same class and leave this one alone
+
+        The frozen spec for it is made when it's first needed, so that a class
+        with a field of it's own class doesn't make copies forever.
+        """
+        copy = self.__class__(self.kls, formatter=self.formatter, create_kls=self.create_kls)
+        copy.frozen = True
+        return copy
+
     def normalise(self, meta, val):
-        """Normalise val with the spec from self.make_spec"""
-        return self.make_spec(meta).normalise(meta, val)
+        """Normalise val with the spec from self.cached_spec"""
+        return self.cached_spec(meta).normalise(meta, val)
+
+    def normalise_async(self, meta, val):
+        """Return an awaitable for normalising val from inside an event loop"""
+        from input_algorithms.asynchronous import normalise_async
+        return normalise_async(self, meta, val)
 
     def empty_normalise(self, **kwargs):
         """Normalise val with the spec from self.make_spec"""
@@ -121,7 +234,15 @@ class FieldSpecMixin(object):
     And have MyAmazingKls.FieldSpec(formatter=...)
     create a Spec object that normalises a dictionary into an instance
     of this class
+
+    If the class has an ``eager_formatters`` list of formatters, then the spec
+    for each of those formatters is built when the class is created rather than
+    the first time it is used. Use ``None`` in this list for no formatter.
+
+    It has empty ``__slots__`` so that it doesn't give a ``__dict__`` to
+    classes that use ``__slots__``.
     """
+    __slots__ = ()
     FieldSpec = classmethod(FieldSpec)
 
 class FieldSpecMetakls(type):
@@ -136,6 +257,7 @@ class FieldSpecMetakls(type):
 
       * Ensure FieldSpecMixin is one of the base classes
       * There is a fields dictionary containing all the defined Fields
+      * Build the spec for each formatter in ``eager_formatters``
     """
     def __new__(metaname, classname, baseclasses, attrs):
         fields = {}
@@ -163,7 +285,12 @@ class FieldSpecMetakls(type):
         if Field.mixin not in baseclasses:
             baseclasses = baseclasses + (Field.mixin, )
 
-        return type.__new__(metaname, classname, baseclasses, attrs)
+        kls = super(FieldSpecMetakls, metaname).__new__(metaname, classname, baseclasses, attrs)
+
+        for formatter in getattr(kls, "eager_formatters", ()):
+            kls.FieldSpec(formatter=formatter).cached_spec(Meta.empty())
+
+        return kls
 
 class Field(object):
     """
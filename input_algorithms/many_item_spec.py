@@ -147,14 +147,20 @@ class many_item_formatted_spec(Spec):
         After this, use self.alter_<index> if it exists
         """
         val = vals[index-1]
+        if self.needs_normalise(val, expected_type, index):
+            val = self.normalise_val(spec, meta, val)
+        self.set_altered(val, vals, index, meta, original_val)
+
+    def needs_normalise(self, val, expected_type, index):
+        """Say whether the val at this index should be normalised by it's spec"""
         specified = val is not NotSpecified
         not_optional = index - 1 < len(self.specs)
         no_expected_type = expected_type is NotSpecified
         not_expected_type = not isinstance(val, expected_type)
+        return (not_optional or specified) and (no_expected_type or not_expected_type)
 
-        if (not_optional or specified) and (no_expected_type or not_expected_type):
-            val = self.normalise_val(spec, meta, val)
-
+    def set_altered(self, val, vals, index, meta, original_val):
+        """Use self.alter_<index> on the normalised val and put it in vals"""
         altered = getattr(self, "alter_{0}".format(index), lambda *args: val)(*(vals[:index] + [val, meta, original_val]))
         vals[index-1] = altered
 
@@ -164,10 +170,13 @@ class many_item_formatted_spec(Spec):
 
         If we have a formatter, use that as well
         """
+        return self.spec_for_val(spec).normalise(meta, val)
+
+    def spec_for_val(self, spec):
+        """Return the spec to normalise a val with, wrapped in formatted if we have a formatter"""
         if getattr(self, "formatter", None):
-            return formatted(spec, formatter=self.formatter).normalise(meta, val)
-        else:
-            return spec.normalise(meta, val)
+            return formatted(spec, formatter=self.formatter)
+        return spec
 
     def validate_split(self, vals, dividers, meta, val):
         """Validate the vals against our list of specs"""
@@ -4,6 +4,274 @@ the original ``val`` when we are normalising it.
 """
 import six
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+class LayeredOptions(Mapping):
+    """
+    A read only view of ``everything`` with ``key_names`` underneath it
+
+    This is what ``formatted`` gives to the formatter. It used to be a copy
+    of ``everything`` updated with the key names, which meant copying the
+    whole configuration for every formatted value.
+
+    Looking up a key asks ``everything`` first and then ``key_names``, which is
+    the same precedence the copy had. Looking up dotted keys, ``converters``
+    and anything else ``everything`` does is left to ``everything`` , and any
+    attribute that isn't on the view, like ``converters`` or ``dont_prefix``,
+    comes from ``everything``.
+    """
+    __slots__ = ("everything", "key_names")
+    is_dict = True
+
+    def __init__(self, everything, key_names):
+        self.everything = everything
+        self.key_names = key_names
+
+    def __getitem__(self, key):
+        try:
+            return self.everything[key]
+        except KeyError:
+            return self.key_names[key]
+
+    def __contains__(self, key):
+        return key in self.everything or key in self.key_names
+
+    def __iter__(self):
+        for key in self.key_names:
+            if key not in self.everything:
+                yield key
+        for key in self.everything:
+            yield key
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def __getattr__(self, key):
+        if key in LayeredOptions.__slots__:
+            raise AttributeError(key)
+        return getattr(self.everything, key)
+
+class Run(object):
+    """
+    State shared by every ``Meta`` made from the same root ``Meta``
+
+    This is how options for one normalisation reach every spec that is used
+    in it, without having to pass them through every spec.
+
+    max_errors
+        The error budget for the normalisation. Container specs stop looking
+        at more values once this many errors have been found. ``1`` means
+        fail on the first error and ``None`` (the default) means collect every
+        error.
+
+    error_count
+        How many errors have been found so far. Errors from a container only
+        count once, however many errors are inside them.
+
+    caches
+        Dictionaries that specs can use to remember work for the rest of the
+        normalisation. Use ``cache(name)`` to get one.
+
+    hook and hook_every
+        ``hook(run)`` is called each time another ``hook_every`` values have
+        been normalised by the container specs, so a long normalisation can
+        let other threads run with ``time.sleep(0)``, update a progress bar
+        with ``run.nodes``, or raise an error if it has gone on too long.
+
+        Containers normalise their items ``hook_every`` at a time when there
+        is a hook, so it is called in the middle of big lists and
+        dictionaries as well. Without a hook nothing is counted.
+
+    nodes
+        How many values the container specs have normalised so far if there
+        is a hook.
+
+    processes and parallel_threshold
+        If ``processes`` is more than one, ``listof`` items and ``dictof``
+        values are normalised in a pool of that many processes when there are
+        at least ``parallel_threshold`` of them. See
+        ``input_algorithms.spec_base.try_normalise_parallel``.
+
+    waiting
+        Set by ``input_algorithms.asynchronous`` while it normalises in an
+        event loop. Validators that are coroutines hand themselves to this
+        when they are used by a spec that is normalised in a thread, so they
+        are awaited in the event loop. It is None otherwise.
+
+    The caches and ``waiting`` aren't pickled with the rest of the Run, so a
+    ``Meta`` can be sent to another process along with the errors and values
+    that hold it.
+
+    A Run is for one normalisation at a time and isn't locked, so give each
+    thread a Run of it's own.
+    """
+    def __init__(self, max_errors=None, hook=None, hook_every=1000, processes=None, parallel_threshold=1000):
+        self.max_errors = max_errors
+        self.error_count = 0
+        self.caches = {}
+        self.waiting = None
+
+        self.processes = processes
+        self.parallel_threshold = parallel_threshold
+
+        self.hook = hook
+        self.hook_every = hook_every
+        self.nodes = 0
+        self.next_hook = hook_every
+
+    def __getstate__(self):
+        """The caches and waiting are left behind when a Run is pickled"""
+        state = dict(self.__dict__)
+        state["caches"] = {}
+        state["waiting"] = None
+        return state
+
+    def visited(self, count=1):
+        """Say that ``count`` more values were normalised, calling the hook if it's time"""
+        self.nodes += count
+        if self.nodes >= self.next_hook:
+            self.next_hook = self.nodes + self.hook_every
+            self.hook(self)
+
+    def cache(self, name, kls=dict):
+        """Return the cache called ``name`` for this normalisation, making it with ``kls`` if need be"""
+        cache = self.caches.get(name)
+        if cache is None:
+            cache = self.caches[name] = kls()
+        return cache
+
+    @property
+    def exhausted(self):
+        """Whether the error budget has been used up"""
+        return self.max_errors is not None and self.error_count >= self.max_errors
+
+class PathNode(object):
+    """
+    One part of the path in a ``Meta``
+
+    Nodes point at their parent rather than holding a copy of the whole path,
+    so going deeper into ``everything`` doesn't copy anything.
+
+    The first node holds the path that was given to ``Meta`` as is, and every
+    other node holds one ``(name, extra)`` part.
+
+    The string forms of the path are worked out the first time they are asked
+    for and remembered on the node. Until then those slots aren't set, so
+    making a node only sets the four that every node has.
+
+    Every node shares the ``run`` of the first node.
+    """
+    __slots__ = ("parent", "part", "parts", "run", "_parts", "_path", "_nonspecial_path", "_names", "_key_names")
+
+    def __init__(self, parent, part=None, parts=None, run=None):
+        self.parent = parent
+        self.part = part
+        self.parts = parts
+        self.run = run if parent is None else parent.run
+
+    def unknown(self, attr):
+        """
+        Return ``(node, nodes)`` where node is the closest node to this one that
+        already knows ``attr``, or the first node, and nodes are the ones from
+        there down to this one that don't
+
+        This walks the parents in a loop so that deep paths don't recurse.
+        """
+        nodes = []
+        node = self
+        while node.parent is not None and getattr(node, attr, None) is None:
+            nodes.append(node)
+            node = node.parent
+        nodes.reverse()
+        return node, nodes
+
+    def as_list(self):
+        """
+        Return the path as a list of parts
+
+        The list is remembered on this node, so it must not be changed.
+        """
+        if self.parent is None:
+            return self.parts
+
+        found = getattr(self, "_parts", None)
+        if found is None:
+            parts = []
+            node = self
+            while node.parent is not None and getattr(node, "_parts", None) is None:
+                parts.append(node.part)
+                node = node.parent
+            parts.reverse()
+            found = self._parts = list(node.as_list()) + parts
+        return found
+
+    @property
+    def path(self):
+        """The path as a string"""
+        node, nodes = self.unknown("_path")
+        if getattr(node, "_path", None) is None:
+            complete = []
+            for part in node.parts:
+                if isinstance(part, six.string_types):
+                    name, extra = part, ""
+                else:
+                    name, extra = part
+
+                if name and complete:
+                    complete.append(".")
+                if name or extra:
+                    complete.append("{0}{1}".format(name, extra))
+            node._path = "".join(complete)
+
+        path = node._path
+        for node in nodes:
+            name, extra = node.part
+            if name or extra:
+                if name and path:
+                    path = "{0}.{1}{2}".format(path, name, extra)
+                else:
+                    path = "{0}{1}{2}".format(path, name, extra)
+            node._path = path
+        return self._path
+
+    @property
+    def nonspecial_path(self):
+        """The path as a string without the extra strings"""
+        node, nodes = self.unknown("_nonspecial_path")
+        if getattr(node, "_nonspecial_path", None) is None:
+            node._nonspecial_path = ".".join(part for part, _ in node.parts if part)
+
+        path = node._nonspecial_path
+        for node in nodes:
+            name = node.part[0]
+            if name:
+                path = ".".join(part for part in (path, name) if part)
+            node._nonspecial_path = path
+        return self._nonspecial_path
+
+    @property
+    def names(self):
+        """Tuple of the first item from each part in the path"""
+        node, nodes = self.unknown("_names")
+        if getattr(node, "_names", None) is None:
+            node._names = tuple(val for val, _ in node.parts)
+
+        names = node._names
+        for node in nodes:
+            names = node._names = names + (node.part[0], )
+        return self._names
+
+    @property
+    def key_names(self):
+        """{_key_name_<i>: <i'th part of the path>} for each part in the path reversed"""
+        if getattr(self, "_key_names", None) is None:
+            self._key_names = dict(("_key_name_{0}".format(index), val) for index, val in enumerate(reversed(self.names)))
+        return self._key_names
+
+
 class Meta(object):
     """
     Meta has a concept of the wider context, kept as the ``everything`` property
@@ -21,6 +289,13 @@ class Meta(object):
 
             If provided as a string, it is converted to ``[(path, "")]``
 
+            A ``PathNode`` may also be given, which is how ``new_path`` makes
+            new instances without copying the path.
+
+        run
+            An optional ``Run`` holding options for this normalisation, like
+            the error budget. Every ``Meta`` made from this one shares it.
+
     Usage
         .. automethod:: at
 
@@ -48,13 +323,26 @@ class Meta(object):
     def empty(kls):
         return kls({}, [])
 
-    def __init__(self, everything, path):
-        self._path = path
-        if isinstance(self._path, six.string_types):
-            self._path = [(self._path, "")]
+    def __init__(self, everything, path, run=None):
+        if isinstance(path, PathNode):
+            self._node = path
+        else:
+            if isinstance(path, six.string_types):
+                path = [(path, "")]
+            self._node = PathNode(None, parts=path, run=run)
 
         self.everything = everything
 
+    @property
+    def run(self):
+        """The ``Run`` shared by this normalisation, or None"""
+        return self._node.run
+
+    @property
+    def _path(self):
+        """The path as a list of parts"""
+        return self._node.as_list()
+
     def indexed_at(self, index):
         """
         Return a new instance with ``("", "[index]")`` added to the path
@@ -69,11 +357,14 @@ class Meta(object):
 
     def new_path(self, part):
         """Return a new instance of this class with additional path part"""
-        return self.__class__(self.everything, self._path + part)
+        node = self._node
+        for p in part:
+            node = PathNode(node, part=p)
+        return self.__class__(self.everything, node)
 
     def key_names(self):
         """Return {_key_name_<i>: <i'th part of part} for each part in the path reversed"""
-        return dict(("_key_name_{0}".format(index), val) for index, (val, _) in enumerate(reversed(self._path)))
+        return dict(self._node.key_names)
 
     def __eq__(self, other):
         """Wortk out if we have the same ``everything`` and ``path``"""
@@ -100,23 +391,12 @@ class Meta(object):
     @property
     def path(self):
         """Return the path as a string"""
-        complete = []
-        for part in self._path:
-            if isinstance(part, six.string_types):
-                name, extra = part, ""
-            else:
-                name, extra = part
-
-            if name and complete:
-                complete.append(".")
-            if name or extra:
-                complete.append("{0}{1}".format(name, extra))
-        return "".join(complete)
+        return self._node.path
 
     @property
     def nonspecial_path(self):
         """Return the path as a string without extra strings"""
-        return ".".join(part for part, _ in self._path if part)
+        return self._node.nonspecial_path
 
     @property
     def source(self):
@@ -134,8 +414,9 @@ class Meta(object):
 
     def delfick_error_format(self, key):
         """Format a string for display in a delfick error"""
-        if self.source in (None, "<unknown>") or self.source == []:
+        source = self.source
+        if source in (None, "<unknown>") or source == []:
             return "{{path={0}}}".format(self.path)
         else:
-            return "{{source={0}, path={1}}}".format(self.source, self.path)
+            return "{{source={0}, path={1}}}".format(source, self.path)
 
@@ -0,0 +1,99 @@
+"""
+Pools of workers that specs can use to do slow work at the same time.
+
+Thread and process pools come from ``concurrent.futures``, which is part of
+python3 and is the ``futures`` package on python2. Without it everything is
+done one at a time in the current thread.
+"""
+import threading
+
+try:
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+    ProcessPoolExecutor = None
+
+try:
+    from concurrent.futures.process import BrokenProcessPool
+except ImportError:
+    class BrokenProcessPool(Exception):
+        """Stands in for the error that this version of ``concurrent.futures`` doesn't have"""
+
+thread_pools = {}
+thread_pools_lock = threading.Lock()
+
+process_pools = {}
+process_pools_lock = threading.Lock()
+
+def thread_pool(size):
+    """
+    Return a shared ``ThreadPoolExecutor`` with ``size`` workers
+
+    Returns None if ``size`` is less than two or thread pools aren't
+    available.
+    """
+    if ThreadPoolExecutor is None or not size or size < 2:
+        return None
+
+    pool = thread_pools.get(size)
+    if pool is None:
+        with thread_pools_lock:
+            pool = thread_pools.get(size)
+            if pool is None:
+                pool = thread_pools[size] = ThreadPoolExecutor(max_workers=size)
+    return pool
+
+def process_pool(size):
+    """
+    Return a shared ``ProcessPoolExecutor`` with ``size`` processes
+
+    Returns None if ``size`` is less than two or process pools aren't
+    available.
+    """
+    if ProcessPoolExecutor is None or not size or size < 2:
+        return None
+
+    pool = process_pools.get(size)
+    if pool is None:
+        with process_pools_lock:
+            pool = process_pools.get(size)
+            if pool is None:
+                pool = process_pools[size] = ProcessPoolExecutor(max_workers=size)
+    return pool
+
+def map_in_threads(func, items, size):
+    """
+    Return ``[func(item) for item in items]``, using a pool of ``size`` threads
+    if we can
+
+    The results are in the same order as ``items``. Each thread is given one
+    chunk of ``items`` so that we don't make a future for every item.
+    """
+    pool = thread_pool(size)
+    if pool is None or len(items) < 2:
+        return [func(item) for item in items]
+
+    def do_chunk(chunk):
+        return [func(item) for item in chunk]
+
+    step = -(-len(items) // size)
+    futures = [pool.submit(do_chunk, items[i:i + step]) for i in range(0, len(items), step)]
+
+    result = []
+    for future in futures:
+        result.extend(future.result())
+    return result
+
+def shutdown_thread_pools():
+    """Stop the shared thread pools"""
+    with thread_pools_lock:
+        for pool in thread_pools.values():
+            pool.shutdown()
+        thread_pools.clear()
+
+def shutdown_process_pools():
+    """Stop the shared process pools"""
+    with process_pools_lock:
+        for pool in process_pools.values():
+            pool.shutdown()
+        process_pools.clear()
@@ -0,0 +1,218 @@
+"""
+A ``record`` is a smaller alternative to ``dictobj`` for when there are a lot
+of instances. The fields are kept in ``__slots__`` rather than in a
+dictionary, so an instance has no ``__dict__`` and no hash table.
+
+.. code-block:: python
+
+    class Point(record):
+        fields = ["x", "y", ("label", None)]
+
+    point = Point(1, y=2)
+
+    point.x == 1
+    point["y"] == 2
+    dict(point.items()) == {"x": 1, "y": 2, "label": None}
+
+``fields`` is the same as for ``dictobj`` and the ``__init__`` is generated
+from it in the same way. There is also ``record.Spec`` with ``record.Field``
+that works like ``dictobj.Spec``:
+
+.. code-block:: python
+
+    class Host(record.Spec):
+        name = record.Field(string_spec, wrapper=required)
+        port = record.Field(integer_spec, default=80)
+
+    host = Host.FieldSpec().normalise(meta, {"name": "db"})
+
+Records can also be made by ``create_spec(Point, x=..., y=...)``, and by the
+spec for a ``dictobj.Spec`` with ``Thing.FieldSpec(create_kls=ThingRecord)``
+as long as the record has the same fields.
+
+An instance has ``is_dict`` set to True, so specs treat it like a dictionary,
+and it has the read only ``Mapping`` API (``keys``, ``items``, ``values``,
+``get``, ``in``, ``len`` and iteration in the order of the ``__init__``
+arguments) as well as ``as_dict`` and ``clone``. ``isinstance(point, Mapping)``
+is True.
+
+The differences from a ``dictobj`` are:
+
+* Only the fields can be set. Setting any other attribute or key is an
+  ``AttributeError`` or ``KeyError``.
+* The fields are fixed when the class is made, so replacing ``fields`` on the
+  class afterwards doesn't change anything.
+* A field with the same name as a method, like ``items``, hides that method
+  on instances. ``fields``, ``is_dict`` and the ``Spec`` attributes can't be
+  used as field names.
+* It isn't a subclass of ``dict``, so ``isinstance(val, dict)`` is False.
+
+Memory for each instance in bytes, from ``benchmarks/record_memory.py`` on
+cpython 3.6 64bit, not counting the values themselves:
+
+=========  =======  ========
+Fields     record   dictobj
+=========  =======  ========
+2          64       264
+5          88       264
+10         128      392
+20         208      672
+=========  =======  ========
+
+A record is the object header and a pointer for each field, whereas the
+dictionary in a dictobj has a hash table that is a third or more empty. A
+record is also about twice as quick to make.
+"""
+from input_algorithms.dictobj import check_field_names, split_fields, generate_init, with_metaclass, dictobj_as_dict
+from input_algorithms.field_spec import Field, NullableField, FieldSpecMetakls
+
+import six
+
+try:
+    from collections.abc import Mapping, KeysView, ItemsView, ValuesView
+except ImportError:
+    from collections import Mapping, KeysView, ItemsView, ValuesView
+
+# Names the record classes need for themselves
+reserved_names = frozenset(["fields", "is_dict", "Spec", "Field", "NullableField", "FieldSpec", "eager_formatters"])
+
+def make_record_init(kls_name, required, optional):
+    """Generate the ``__init__`` that sets each field on the instance"""
+    names = required + [name for name, _ in optional]
+    lines = ["_self.{0} = {0}".format(name) for name in names]
+    return generate_init("record {0}".format(kls_name), required, optional, lines, {})
+
+class RecordMetakls(type):
+    """
+    Makes the ``__slots__`` and ``__init__`` for a record from it's ``fields``
+
+    Fields that are already a slot on a base class don't get another slot,
+    and any ``Field`` objects with the same name as a field are taken off the
+    class so they don't get in the way of the slots.
+    """
+    def __new__(metaname, classname, baseclasses, attrs):
+        fields = attrs.get("fields")
+        if fields is None:
+            for kls in baseclasses:
+                fields = getattr(kls, "fields", None)
+                if fields is not None:
+                    break
+
+        required, optional = split_fields(fields)
+        names = required + [name for name, _ in optional]
+        check_field_names(classname, names)
+
+        for name in names:
+            if name in reserved_names:
+                raise ValueError("Field names cannot be an attribute of the record itself: {0!r} on {1}".format(name, classname))
+            if getattr(attrs.get(name), "is_input_algorithms_field", False):
+                del attrs[name]
+
+        slotted = set()
+        for kls in baseclasses:
+            for k in kls.__mro__:
+                slotted.update(k.__dict__.get("__slots__", ()))
+
+        attrs["__slots__"] = tuple(attrs.get("__slots__", ())) + tuple(name for name in names if name not in slotted)
+        attrs["_record_names"] = tuple(names)
+        attrs["_record_keys"] = frozenset(names)
+        attrs["_record_init"] = make_record_init(classname, required, optional)
+        return super(RecordMetakls, metaname).__new__(metaname, classname, baseclasses, attrs)
+
+class RecordSpecMetakls(FieldSpecMetakls, RecordMetakls):
+    """The metaclass for ``record.Spec`` that makes the fields from ``Field`` attributes first"""
+
+class record(six.with_metaclass(RecordMetakls, object)):
+    fields = None
+    is_dict = True
+
+    Field = Field
+    NullableField = NullableField
+
+    def __init__(self, *args, **kwargs):
+        self._record_init(*args, **kwargs)
+
+    def __bool__(self):
+        """Always True like a normal object, even with no fields"""
+        return True
+    __nonzero__ = __bool__
+
+    def __getitem__(self, key):
+        """Return the value of this field or complain with a KeyError"""
+        if key in self._record_keys:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, val):
+        """Set the value of this field or complain with a KeyError"""
+        if key not in self._record_keys:
+            raise KeyError(key)
+        setattr(self, key, val)
+
+    def __contains__(self, key):
+        return key in self._record_keys
+
+    def __iter__(self):
+        return iter(self._record_names)
+
+    def __len__(self):
+        return len(self._record_names)
+
+    def keys(self):
+        return KeysView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other):
+        """Equal to any mapping with the same keys and values"""
+        if type(other) is type(self):
+            return record.__getstate__(self) == record.__getstate__(other)
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        if not isinstance(other, dict):
+            other = dict((key, other[key]) for key in other)
+        return dict((name, self[name]) for name in self._record_names) == other
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{0}({1})".format(self.__class__.__name__, ", ".join("{0}={1!r}".format(name, self[name]) for name in self._record_names))
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self._record_names)
+
+    def __setstate__(self, state):
+        for name, val in zip(self._record_names, state):
+            setattr(self, name, val)
+
+    def clone(self):
+        """Return a clone of this object"""
+        return self.__class__(**dict((name, getattr(self, name)) for name in self._record_names))
+
+    as_dict = dictobj_as_dict
+
+    def _as_dict_fields(self):
+        """Return ``[(name, value)]`` for each field for ``as_dict``"""
+        return [(name, getattr(self, name)) for name in self._record_names]
+
+record.Spec = with_metaclass(RecordSpecMetakls, record)
+Mapping.register(record)
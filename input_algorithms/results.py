@@ -0,0 +1,56 @@
+"""
+Results are what the ``try_normalise`` family of methods on a ``Spec`` return
+instead of raising errors.
+
+A ``Success`` holds the normalised ``value`` and a ``Failure`` holds the
+``error`` that ``normalise`` would have raised.
+
+.. code-block:: python
+
+    result = spec.try_normalise(meta, val)
+    if result.ok:
+        use(result.value)
+    else:
+        complain(result.error)
+
+    # Or if you want the value or the error raised
+    value = result.unwrap()
+"""
+
+class Result(object):
+    """Base class for ``Success`` and ``Failure``"""
+    __slots__ = ()
+    ok = False
+
+    def unwrap(self):
+        raise NotImplementedError()
+
+class Success(Result):
+    """A successful normalisation of ``value``"""
+    __slots__ = ("value", )
+    ok = True
+
+    def __init__(self, value):
+        self.value = value
+
+    def unwrap(self):
+        """Return the value"""
+        return self.value
+
+    def __repr__(self):
+        return "<Success {0!r}>".format(self.value)
+
+class Failure(Result):
+    """A normalisation that failed with ``error``"""
+    __slots__ = ("error", )
+    ok = False
+
+    def __init__(self, error):
+        self.error = error
+
+    def unwrap(self):
+        """Raise the error"""
+        raise self.error
+
+    def __repr__(self):
+        return "<Failure {0!r}>".format(self.error)
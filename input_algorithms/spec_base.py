@@ -5,18 +5,31 @@ classes based off the ``Spec`` class.
 A specification is an object with a ``normalise`` method and is used to validate
 and transform data.
 """
-from input_algorithms.errors import BadSpec, BadSpecValue, BadDirectory, BadFilename
+from input_algorithms.errors import BadSpec, BadSpecValue, BadDirectory, BadFilename, ProgrammerError
+from input_algorithms.results import Success, Failure
+from input_algorithms.meta import Meta, Run, LayeredOptions
+from input_algorithms.pools import map_in_threads, process_pool, BrokenProcessPool
+from input_algorithms.caches import StatCache
 
+from six.moves import cPickle as pickle
 from datetime import datetime
+import functools
+import threading
 import operator
+import stat
 import six
 import os
 
 default_specs = []
+default_specs_lock = threading.Lock()
+
+# What pickling or unpickling something that doesn't support it raises
+pickling_errors = (pickle.PicklingError, pickle.UnpicklingError, TypeError, AttributeError, ImportError)
 
 def spec(func):
     """For the documentationz!"""
-    default_specs.append((func.__name__, func))
+    with default_specs_lock:
+        default_specs.append((func.__name__, func))
     return func
 
 class NotSpecified(object):
@@ -33,6 +46,669 @@ class NotSpecified(object):
     def __str__(self):
         return "<NotSpecified>"
 
+# Given back whenever the result is NotSpecified rather than making a new one
+not_specified = Success(NotSpecified)
+
+def uses_try_normalise(spec):
+    """
+    Say whether to use the ``try_normalise`` methods on ``spec``
+
+    This is True for a ``Spec``, unless ``normalise`` has been set on the
+    instance, like when it's mocked, in which case that ``normalise`` is used
+    like it is for objects that aren't a ``Spec``.
+    """
+    return isinstance(spec, Spec) and "normalise" not in spec.__dict__
+
+def try_normalise(spec, meta, val):
+    """
+    Normalise ``val`` with ``spec`` and return a ``Success`` or ``Failure``
+
+    Specs use the ``try_normalise`` method on the spec, anything else is
+    treated as an object with a ``normalise`` method that raises ``BadSpec``
+    errors. See ``uses_try_normalise``.
+    """
+    if uses_try_normalise(spec):
+        return spec.try_normalise(meta, val)
+
+    try:
+        return Success(spec.normalise(meta, val))
+    except BadSpec as error:
+        return Failure(error)
+
+def normaliser(spec):
+    """
+    Return a function that takes ``(meta, val)`` and returns a ``Success`` or
+    ``Failure`` from ``spec`` like ``try_normalise``, for containers that
+    normalise many values with the same spec
+
+    This works out how to call ``spec`` once rather than for every value.
+    """
+    if uses_try_normalise(spec):
+        return spec.try_normalise
+    return functools.partial(try_normalise, spec)
+
+class FrozenDict(dict):
+    """A dictionary that can't be changed, used by ``Spec.freeze``"""
+    def complain(self, *args, **kwargs):
+        raise ProgrammerError("Can't change a frozen dictionary")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = complain
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self), )
+
+class FrozenList(list):
+    """A list that can't be changed, used by ``Spec.freeze``"""
+    def complain(self, *args, **kwargs):
+        raise ProgrammerError("Can't change a frozen list")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = append = extend = insert = pop = remove = reverse = sort = complain
+
+    if six.PY2:
+        __setslice__ = __delslice__ = complain
+
+    def __reduce__(self):
+        return FrozenList, (list(self), )
+
+def freeze(val, memo=None):
+    """
+    Return ``val`` made so it can't be changed
+
+    Anything with a ``freeze`` method, like a ``Spec``, is frozen in place.
+    Lists, tuples and dictionaries are copied as a ``FrozenList``, ``tuple``
+    or ``FrozenDict`` with their values frozen. Anything else is returned as
+    is.
+
+    If ``memo`` is given, anything with a ``frozen_copy`` method is copied
+    with ``frozen_copy(memo)`` instead, so the specs in ``val`` are left as
+    they are. ``memo`` is ``{id(original): (original, copy)}`` so that a spec
+    is only copied once.
+    """
+    if isinstance(val, type):
+        return val
+    elif memo is not None and hasattr(val, "frozen_copy"):
+        return val.frozen_copy(memo)
+    elif memo is None and hasattr(val, "freeze"):
+        return val.freeze()
+    elif isinstance(val, dict):
+        if type(val) in (dict, FrozenDict):
+            return FrozenDict((key, freeze(v, memo)) for key, v in val.items())
+    elif isinstance(val, list):
+        if type(val) in (list, FrozenList):
+            return FrozenList(freeze(v, memo) for v in val)
+    elif type(val) is tuple:
+        return tuple(freeze(v, memo) for v in val)
+    return val
+
+class ErrorCollector(object):
+    """
+    Collect the errors from the children of a container spec
+
+    This respects the error budget in ``meta.run``. ``add`` counts an error
+    against the budget unless a container inside the child already counted
+    the errors inside it, and ``exhausted`` says when the container should
+    stop looking at more values.
+
+    .. code-block:: python
+
+        errors = ErrorCollector(meta)
+        for key, val in items:
+            if errors.exhausted():
+                break
+
+            count = errors.count
+            result = try_normalise(spec, meta.at(key), val)
+            if not result.ok:
+                errors.add(result.error, count)
+
+        if errors:
+            return errors.failure()
+
+    Without a ``Run`` there is no budget to keep to, so containers can use
+    ``collector_for`` and only make a collector once a value fails.
+
+    A collector is true if it has errors or if ``exhausted`` stopped the
+    container before it looked at every value. If the budget was used up,
+    the error from ``failure`` has the number of errors found in
+    ``total_errors``.
+    """
+    __slots__ = ("meta", "run", "errors", "cut_short")
+
+    def __init__(self, meta):
+        self.meta = meta
+        self.errors = []
+        self.cut_short = False
+        self.run = getattr(meta, "run", None)
+        if not isinstance(self.run, Run):
+            self.run = None
+
+    @property
+    def count(self):
+        """The number of errors counted so far in this normalisation"""
+        if self.run is None:
+            return 0
+        return self.run.error_count
+
+    def exhausted(self):
+        """Say whether the error budget has been used up and we should stop"""
+        if self.run is not None and self.run.exhausted:
+            self.cut_short = True
+        return self.cut_short
+
+    def add(self, error, count):
+        """Add an error from a child that was normalised when ``self.count`` was ``count``"""
+        self.errors.append(error)
+        self.count_error(count)
+
+    def count_error(self, count):
+        """Count an error against the budget without holding onto it"""
+        if self.run is not None and self.run.error_count == count:
+            self.run.error_count += 1
+
+    def visited(self, count=1):
+        """Count ``count`` values normalised by the container towards the hook in ``meta.run``"""
+        if self.run is not None and self.run.hook is not None:
+            self.run.visited(count)
+
+    def rewind(self, count):
+        """Forget errors counted since ``self.count`` was ``count``"""
+        if self.run is not None:
+            self.run.error_count = count
+
+    def failure(self, message="", kls=None, **kwargs):
+        """Return a ``Failure`` with our errors"""
+        if self.run is not None and self.run.exhausted:
+            kwargs["total_errors"] = self.run.error_count
+        return Failure((kls or BadSpecValue)(message, meta=self.meta, _errors=self.errors, **kwargs))
+
+    def __bool__(self):
+        return self.cut_short or bool(self.errors)
+    __nonzero__ = __bool__
+
+def collector_for(meta):
+    """
+    Return an ``ErrorCollector`` for ``meta`` if it has a ``Run``, otherwise
+    None so that a container only makes one when a value fails
+    """
+    if isinstance(getattr(meta, "run", None), Run):
+        return ErrorCollector(meta)
+
+def item_meta(meta, index, keys=None, start=0):
+    """Return the meta for the item at ``index`` of a batch that starts at index ``start``"""
+    if keys is None:
+        return meta.indexed_at(index + start)
+    return meta.at(keys[index])
+
+def try_normalise_many(spec, meta, values, keys=None):
+    """
+    Normalise each of ``values`` with ``spec`` and return a ``Success`` with a
+    list of the normalised values or a ``Failure`` with all the errors.
+
+    Specs use the ``try_normalise_many`` method on the spec, anything else is
+    normalised one value at a time.
+
+    If ``meta.run`` has a hook, ``try_normalise_hooked`` is used instead.
+    """
+    run = getattr(meta, "run", None)
+    if isinstance(run, Run) and run.hook is not None:
+        return try_normalise_hooked(spec, meta, values, keys=keys)
+    if uses_try_normalise(spec):
+        return spec.try_normalise_many(meta, values, keys=keys)
+    return try_normalise_each(spec, meta, values, keys=keys)
+
+def try_normalise_results(spec, meta, values, errors, start=0):
+    """
+    Return a ``Success`` or ``Failure`` for each of ``values``, which start at
+    index ``start`` of a bigger batch
+
+    Each value is normalised once and failures are counted in ``errors``, an
+    ``ErrorCollector``. If the error budget is used up, there are only
+    results for the values before that point.
+
+    Specs use the ``try_normalise_results`` method on the spec, anything else
+    is normalised one value at a time.
+    """
+    if uses_try_normalise(spec):
+        return spec.try_normalise_results(meta, values, errors, start=start)
+    return try_results_each(spec, meta, values, errors, start=start)
+
+def try_normalise_hooked(spec, meta, values, keys=None):
+    """
+    Normalise ``values`` ``meta.run.hook_every`` at a time, telling the run
+    after each chunk so it can call it's hook
+    """
+    run = meta.run
+    size = max(1, run.hook_every)
+
+    result = []
+    errors = ErrorCollector(meta)
+    for start in range(0, len(values), size):
+        if errors.exhausted():
+            break
+
+        chunk = values[start:start + size]
+        normalised = try_normalise_part(spec, meta, chunk, start, keys=None if keys is None else keys[start:start + size])
+        if normalised.ok:
+            result.extend(normalised.value)
+        else:
+            # Already counted by the chunk
+            errors.errors.extend(normalised.error.errors)
+
+        run.visited(len(chunk))
+
+    if errors:
+        return errors.failure()
+
+    return Success(result)
+
+def try_normalise_part(spec, meta, values, start, keys=None):
+    """
+    Normalise ``values``, which start at index ``start`` of a bigger batch
+
+    Without ``keys``, the errors from a failure are given the index they have
+    in the bigger batch with ``reindex_error``.
+    """
+    if uses_try_normalise(spec):
+        normalised = spec.try_normalise_many(meta, values, keys=keys)
+    else:
+        normalised = try_normalise_each(spec, meta, values, keys=keys)
+
+    if normalised.ok or keys is not None or start == 0 or not isinstance(meta, Meta):
+        return normalised
+
+    depth = len(meta._node.as_list())
+    for error in normalised.error.errors:
+        reindex_error(error, meta, depth, start)
+    return normalised
+
+def try_normalise_children(spec, meta, values, keys=None):
+    """
+    Normalise the children of a container, which ``listof`` and ``dictof``
+    use for their items
+
+    This is ``try_normalise_many`` unless ``meta.run`` asks for more than one
+    process and there are at least ``run.parallel_threshold`` values, in which
+    case ``try_normalise_parallel`` is used.
+    """
+    run = getattr(meta, "run", None)
+    if isinstance(run, Run) and run.processes and run.processes > 1 and len(values) >= run.parallel_threshold:
+        return try_normalise_parallel(spec, meta, values, keys=keys)
+    return try_normalise_many(spec, meta, values, keys=keys)
+
+def try_normalise_parallel(spec, meta, values, keys=None):
+    """
+    Normalise ``values`` in chunks in a pool of ``meta.run.processes``
+    processes
+
+    The spec, ``meta.everything`` and the path of ``meta`` are pickled once,
+    and sent with each pickled chunk to ``normalise_part_in_process``. We pickle
+    them ourselves because ``concurrent.futures`` doesn't always tell us when
+    something can't be pickled. Results and errors are
+    put back together in the same order as ``values`` and every ``meta`` in
+    the errors is remade from our ``meta`` so they have our ``everything``
+    and ``run``.
+
+    If anything can't be pickled, or there is no process pool, or the pool is
+    broken, the values are normalised here instead. Any other exception raised
+    by the spec in a process is raised here, as it would be if the values were
+    normalised here.
+
+    The hook in the run is called here as chunks come back, and each process
+    has the same error budget, which we use to stop looking at more chunks.
+    """
+    run = meta.run
+    pool = process_pool(run.processes)
+    if pool is None:
+        return try_normalise_many(spec, meta, values, keys=keys)
+
+    parts = meta._node.as_list()
+    size = -(-len(values) // (run.processes * 4))
+    chunks = [(start, values[start:start + size], None if keys is None else keys[start:start + size]) for start in range(0, len(values), size)]
+
+    try:
+        common = pickle.dumps((spec, meta.everything, parts, run.max_errors), pickle.HIGHEST_PROTOCOL)
+        pickled = [pickle.dumps((chunk, start, chunk_keys), pickle.HIGHEST_PROTOCOL) for start, chunk, chunk_keys in chunks]
+    except pickling_errors:
+        return try_normalise_many(spec, meta, values, keys=keys)
+
+    try:
+        futures = [pool.submit(normalise_part_in_process, common, chunk) for chunk in pickled]
+    except (BrokenProcessPool, RuntimeError):
+        # The pool is broken or has been shut down
+        return try_normalise_many(spec, meta, values, keys=keys)
+
+    try:
+        found = [future.result() for future in futures]
+    except BrokenProcessPool:
+        return try_normalise_many(spec, meta, values, keys=keys)
+
+    if any(normalised is None for normalised in found):
+        # Something couldn't be pickled in one of the processes
+        return try_normalise_many(spec, meta, values, keys=keys)
+
+    outcomes = []
+    for normalised in found:
+        raised, outcome = pickle.loads(normalised)
+        if raised:
+            raise outcome
+        outcomes.append(outcome)
+
+    result = []
+    errors = ErrorCollector(meta)
+    for (start, chunk, _), normalised in zip(chunks, outcomes):
+        if errors.exhausted():
+            break
+
+        if normalised.ok:
+            result.extend(normalised.value)
+        else:
+            for error in normalised.error.errors:
+                if errors.exhausted():
+                    break
+                errors.add(rebase_error(error, meta, len(parts)), errors.count)
+
+        if run.hook is not None:
+            run.visited(len(chunk))
+
+    if errors:
+        return errors.failure()
+
+    return Success(result)
+
+def normalise_part_in_process(common, chunk):
+    """
+    Used by ``try_normalise_parallel`` to normalise a chunk in another process
+
+    Returns the pickled ``(raised, outcome)``, where ``outcome`` is the
+    ``Success`` or ``Failure`` for the chunk, or the exception the spec raised
+    if ``raised`` is True. Returns None if something couldn't be pickled or
+    unpickled, so the chunk can be normalised in the original process.
+    """
+    try:
+        spec, everything, parts, max_errors = pickle.loads(common)
+        values, start, keys = pickle.loads(chunk)
+    except pickling_errors:
+        return None
+
+    meta = Meta(everything, parts, run=Run(max_errors=max_errors))
+    try:
+        outcome = (False, try_normalise_part(spec, meta, values, start, keys=keys))
+    except Exception as error:
+        outcome = (True, error)
+
+    try:
+        return pickle.dumps(outcome, pickle.HIGHEST_PROTOCOL)
+    except pickling_errors:
+        return None
+
+def rebase_error(error, meta, depth):
+    """
+    Remake each ``meta`` in ``error`` and the errors inside it from our
+    ``meta``, where the original meta was ``depth`` parts deep
+    """
+    found = getattr(error, "kwargs", {}).get("meta")
+    if isinstance(found, Meta):
+        error.kwargs["meta"] = meta.new_path(found._node.as_list()[depth:])
+
+    for inner in getattr(error, "errors", None) or []:
+        rebase_error(inner, meta, depth)
+    return error
+
+def reindex_error(error, meta, depth, start):
+    """
+    Add ``start`` to the index after the first ``depth`` parts of each
+    ``meta`` in ``error`` and the errors inside it, for errors from values
+    that start at index ``start`` of a bigger batch
+    """
+    found = getattr(error, "kwargs", {}).get("meta")
+    if isinstance(found, Meta):
+        parts = found._node.as_list()
+        if len(parts) > depth and parts[depth][0] == "" and parts[depth][1].startswith("["):
+            index = int(parts[depth][1][1:-1]) + start
+            remade = meta.indexed_at(index).new_path(parts[depth + 1:])
+            remade.everything = found.everything
+            error.kwargs["meta"] = remade
+
+    for inner in getattr(error, "errors", None) or []:
+        reindex_error(inner, meta, depth, start)
+    return error
+
+def try_normalise_each(spec, meta, values, keys=None):
+    """
+    Normalise ``values`` one at a time with ``spec``
+
+    Item ``i`` is normalised with ``meta.indexed_at(i)`` or, if ``keys`` is
+    given, with ``meta.at(keys[i])``.
+    """
+    result = []
+    normalise = normaliser(spec)
+    errors = collector_for(meta)
+    for index, val in enumerate(values):
+        count = 0
+        if errors is not None:
+            if errors.exhausted():
+                break
+            count = errors.count
+
+        normalised = normalise(item_meta(meta, index, keys), val)
+        if normalised.ok:
+            result.append(normalised.value)
+        else:
+            if errors is None:
+                errors = ErrorCollector(meta)
+            errors.add(normalised.error, count)
+
+    if errors:
+        return errors.failure()
+
+    return Success(result)
+
+def try_results_each(spec, meta, values, errors, start=0):
+    """
+    Return a result for each of ``values``, normalised one at a time with
+    ``spec``, for ``try_normalise_results``
+    """
+    results = []
+    normalise = normaliser(spec)
+    for index, val in enumerate(values):
+        if errors.exhausted():
+            break
+
+        count = errors.count
+        normalised = normalise(item_meta(meta, index, start=start), val)
+        if not normalised.ok:
+            errors.count_error(count)
+        results.append(normalised)
+    return results
+
+def try_leaf_results(spec, meta, values, errors, start=0):
+    """
+    Return a result for each of ``values`` with a spec that only uses ``meta``
+    for errors, like ``try_normalise_leaves`` does
+    """
+    if not isinstance(meta, Meta):
+        return try_results_each(spec, meta, values, errors, start=start)
+
+    results = []
+    depth = len(meta._node.as_list())
+    normalise = spec.try_normalise
+    for index, val in enumerate(values):
+        normalised = normalise(meta, val)
+        if not normalised.ok:
+            rebase_error(normalised.error, item_meta(meta, index, start=start), depth)
+            errors.count_error(errors.count)
+        results.append(normalised)
+        if errors.exhausted():
+            break
+    return results
+
+def try_normalise_leaves(spec, meta, values, keys=None):
+    """
+    Normalise ``values`` with a spec that only uses ``meta`` for errors
+
+    All the values are normalised with ``meta`` itself and only the errors of
+    values that fail are given their own meta, with ``rebase_error``.
+    """
+    if not isinstance(meta, Meta):
+        return try_normalise_each(spec, meta, values, keys=keys)
+
+    result = []
+    errors = None
+    normalise = spec.try_normalise
+    for index, val in enumerate(values):
+        normalised = normalise(meta, val)
+        if normalised.ok:
+            result.append(normalised.value)
+        else:
+            if errors is None:
+                errors = ErrorCollector(meta)
+                depth = len(meta._node.as_list())
+            errors.add(rebase_error(normalised.error, item_meta(meta, index, keys), depth), errors.count)
+            if errors.exhausted():
+                break
+
+    if errors:
+        return errors.failure()
+
+    return Success(result)
+
+def waiting_for(meta):
+    """
+    Return the ``waiting`` of the ``Run`` in ``meta`` if this normalisation is
+    being done by ``input_algorithms.asynchronous``, otherwise None
+    """
+    run = getattr(meta, "run", None)
+    if isinstance(run, Run):
+        return run.waiting
+
+def stat_path(meta, path, shared=None):
+    """
+    Return the ``os.stat`` of ``path`` or None if it can't be stat'd
+
+    This uses the ``StatCache`` for the ``Run`` in ``meta`` if there is one,
+    and the ``shared`` ``StatCache`` if that is given.
+    """
+    run = getattr(meta, "run", None)
+    if isinstance(run, Run):
+        return run.cache("stat", StatCache.for_run).stat(path, shared)
+    elif shared is not None:
+        return shared.stat(path)
+
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+def try_check_paths(spec, meta, values, keys=None):
+    """
+    Normalise ``values`` with ``directory_spec`` or ``filename_spec`` and
+    stat the paths at the same time with ``try_check_path_results``
+    """
+    result = []
+    errors = ErrorCollector(meta)
+    for path in try_check_path_results(spec, meta, values, errors, keys=keys):
+        if path.ok:
+            result.append(path.value)
+        else:
+            # Already counted by try_check_path_results
+            errors.errors.append(path.error)
+
+    if errors:
+        return errors.failure()
+
+    return Success(result)
+
+def try_check_path_results(spec, meta, values, errors, start=0, keys=None):
+    """
+    Return a result for each of ``values`` with ``directory_spec`` or
+    ``filename_spec``, for ``try_check_paths`` and ``try_normalise_results``
+
+    Each value is first turned into a path with ``try_find_paths``, then every
+    path is stat'd in a pool of ``spec.stat_threads`` threads, and then each
+    path is checked with ``check_found_paths``. The pool is only used if there
+    are at least ``spec.stat_threshold`` paths.
+
+    Results stay in the same order as ``values``.
+    """
+    at, paths = try_find_paths(spec, meta, values, errors, start=start, keys=keys)
+
+    run = errors.run
+    if run is not None:
+        # Make the cache now rather than in the threads
+        run.cache("stat", StatCache.for_run)
+
+    def stat(path):
+        return stat_path(meta, path, spec.stat_cache)
+
+    size = None
+    if len(paths) >= spec.stat_threshold:
+        size = spec.stat_threads
+    return check_found_paths(spec, at, iter(map_in_threads(stat, paths, size)), errors)
+
+def try_find_paths(spec, meta, values, errors, start=0, keys=None):
+    """
+    Turn each of ``values`` into a path with ``spec.try_path``
+
+    Return ``(at, paths)`` where ``at`` is a list of ``(meta, result, counted)``
+    for ``check_found_paths`` and ``paths`` are the paths to stat, in order.
+    """
+    at = []
+    paths = []
+    for index, val in enumerate(values):
+        if errors.exhausted():
+            break
+
+        count = errors.count
+        item = item_meta(meta, index, keys, start=start)
+        result = spec.try_path(item, val)
+        if result.ok and isinstance(result.value, six.string_types):
+            paths.append(result.value)
+        # Remember if a container in our spec already counted the error
+        at.append((item, result, errors.count != count))
+    return at, paths
+
+def check_found_paths(spec, at, found, errors):
+    """
+    Return a result for each of ``at`` from ``try_find_paths`` by checking
+    each path with ``spec.check``
+
+    ``found`` is an iterator of the stats for the paths, in the same order.
+    """
+    results = []
+    for item, path, counted in at:
+        if errors.exhausted():
+            break
+
+        if path.ok and isinstance(path.value, six.string_types):
+            path = spec.check(item, path.value, next(found))
+
+        if not path.ok and not counted:
+            errors.count_error(errors.count)
+        results.append(path)
+    return results
+
+def try_apply_validators(meta, val, validators, chain_value=True):
+    """Same as ``apply_validators`` but returns a ``Success`` or ``Failure``"""
+    errors = ErrorCollector(meta)
+    for validator in validators:
+        if errors.exhausted():
+            break
+
+        count = errors.count
+        result = try_normalise(validator, meta, val)
+        if result.ok:
+            if chain_value:
+                val = result.value
+        elif isinstance(result.error, BadSpecValue):
+            errors.add(result.error, count)
+        else:
+            return result
+
+    if errors:
+        return errors.failure("Failed to validate")
+
+    return Success(val)
+
 def apply_validators(meta, val, validators, chain_value=True):
     """
     Apply a number of validators to a value.
@@ -48,21 +724,221 @@ def apply_validators(meta, val, validators, chain_value=True):
     Where value is the original value, or the result of the last validator
     depending on ``chain_value``.
     """
-    errors = []
-    for validator in validators:
-        try:
-            nxt = validator.normalise(meta, val)
-            if chain_value:
-                val = nxt
-        except BadSpecValue as e:
-            errors.append(e)
+    return try_apply_validators(meta, val, validators, chain_value=chain_value).unwrap()
 
-    if errors:
-        raise BadSpecValue("Failed to validate", meta=meta, _errors=errors)
+def binder(func):
+    """Return a function that binds ``func`` to an instance like a class attribute would be"""
+    if hasattr(func, "__get__"):
+        return lambda self: func.__get__(self, type(self))
+    return lambda self: func
 
-    return val
+def result_adapter(name, func):
+    """
+    Make a ``try_<name>`` that returns a Result from calling ``func``
 
-class Spec(object):
+    ``func`` is called directly rather than looked up on the instance so that
+    a subclass calling the hook on ``super()`` gets the parent's behaviour.
+    """
+    bound = binder(func)
+    def adapter(self, *args, **kwargs):
+        try:
+            return Success(bound(self)(*args, **kwargs))
+        except BadSpec as error:
+            return Failure(error)
+    adapter.adapts = name
+    return adapter
+
+def result_unwrapper(try_name, try_func):
+    """Make a function that returns the value or raises the error from ``try_func``"""
+    bound = binder(try_func)
+    def unwrapper(self, *args, **kwargs):
+        result = bound(self)(*args, **kwargs)
+        if result.ok:
+            return result.value
+        raise result.error
+    unwrapper.adapts = try_name
+    return unwrapper
+
+def make_normalise_plan(kls):
+    """
+    Resolve the dispatch for ``Spec.try_normalise`` on ``kls`` into one function.
+
+    The hooks are looked up once here rather than with ``hasattr`` every time
+    a value is normalised.
+    """
+    has_either = hasattr(kls, "try_normalise_either")
+    has_filled = hasattr(kls, "try_normalise_filled")
+
+    if hasattr(kls, "try_normalise_empty"):
+        empty = lambda spec, meta: spec.try_normalise_empty(meta)
+    elif hasattr(kls, "default"):
+        def empty(spec, meta):
+            try:
+                value = spec.default(meta)
+            except BadSpec as error:
+                return Failure(error)
+            if value is NotSpecified:
+                return not_specified
+            return Success(value)
+    else:
+        empty = lambda spec, meta: not_specified
+
+    if has_either:
+        def normalise_plan(self, meta, val):
+            result = self.try_normalise_either(meta, val)
+            if not result.ok or result.value is not NotSpecified:
+                return result
+
+            if val is NotSpecified:
+                return empty(self, meta)
+            elif has_filled:
+                return self.try_normalise_filled(meta, val)
+
+            return Failure(BadSpec("Spec doesn't know how to deal with this value", spec=self, meta=meta, val=val))
+    elif has_filled:
+        # The usual case, so it doesn't check for hooks the class doesn't have
+        def normalise_plan(self, meta, val):
+            if val is NotSpecified:
+                return empty(self, meta)
+            return self.try_normalise_filled(meta, val)
+    else:
+        def normalise_plan(self, meta, val):
+            if val is NotSpecified:
+                return empty(self, meta)
+            return Failure(BadSpec("Spec doesn't know how to deal with this value", spec=self, meta=meta, val=val))
+
+    normalise_plan.is_normalise_plan = True
+    return normalise_plan
+
+def make_raising_plan(kls, plan):
+    """
+    Resolve ``Spec.normalise`` on ``kls`` into one function that returns the
+    value from ``plan`` or raises the error
+
+    For the usual case of a class with ``try_normalise_filled`` and maybe a
+    ``default``, the hooks are called directly so that ``NotSpecified`` and
+    defaults are returned without making a ``Success`` for them.
+    """
+    if hasattr(kls, "try_normalise_either") or hasattr(kls, "try_normalise_empty") or not hasattr(kls, "try_normalise_filled"):
+        def raising_plan(self, meta, val):
+            result = plan(self, meta, val)
+            if result.ok:
+                return result.value
+            raise result.error
+    elif hasattr(kls, "default"):
+        def raising_plan(self, meta, val):
+            if val is NotSpecified:
+                return self.default(meta)
+            result = self.try_normalise_filled(meta, val)
+            if result.ok:
+                return result.value
+            raise result.error
+    else:
+        def raising_plan(self, meta, val):
+            if val is NotSpecified:
+                return val
+            result = self.try_normalise_filled(meta, val)
+            if result.ok:
+                return result.value
+            raise result.error
+
+    raising_plan.__doc__ = "Use this spec to normalise our value"
+    raising_plan.adapts = "try_normalise"
+    raising_plan.unwraps_plan = True
+    return raising_plan
+
+class SpecMetakls(type):
+    """
+    Metaclass for ``Spec`` that gives each class a precompiled ``normalise_plan``
+
+    Each hook in ``result_hooks`` is a pair of a method that returns a value or
+    raises an error and a ``try_`` method that returns a ``Success`` or
+    ``Failure``. If a class only defines one of the pair, the other is made
+    from it. This lets classes implement either one and be used either way.
+
+    Unless the class has it's own ``try_normalise``, that is set to the plan,
+    and unless it also has it's own ``normalise``, that is set to the plan
+    from ``make_raising_plan``.
+
+    A class that changes how single values are normalised without saying how
+    to normalise many values gets ``try_normalise_each`` for
+    ``try_normalise_many`` and ``try_results_each`` for
+    ``try_normalise_results``, so it doesn't inherit a shortcut from its
+    parent that skips its own hooks.
+
+    The plan is remade for the class and all of it's subclasses if any of the
+    normalise hooks are later set or deleted on the class.
+    """
+    def __init__(kls, name, bases, attrs):
+        super(SpecMetakls, kls).__init__(name, bases, attrs)
+        for name, try_name in kls.result_hooks:
+            if name in attrs and try_name not in attrs:
+                if getattr(attrs[name], "adapts", None) != try_name:
+                    type.__setattr__(kls, try_name, result_adapter(name, attrs[name]))
+            elif try_name in attrs and name not in attrs:
+                type.__setattr__(kls, name, result_unwrapper(try_name, attrs[try_name]))
+
+        if any(kls.changes_single_normalise(key) for key in attrs):
+            if "normalise_many" not in attrs and "try_normalise_many" not in attrs:
+                kls.forget_normalise_many()
+            if "try_normalise_results" not in attrs:
+                type.__setattr__(kls, "try_normalise_results", try_results_each)
+
+        kls.remake_normalise_plan()
+
+    def __setattr__(kls, key, val):
+        super(SpecMetakls, kls).__setattr__(key, val)
+        for name, try_name in kls.result_hooks:
+            if key == name:
+                type.__setattr__(kls, try_name, result_adapter(name, val))
+            elif key == try_name:
+                type.__setattr__(kls, name, result_unwrapper(try_name, val))
+
+        if kls.changes_single_normalise(key):
+            kls.forget_normalise_many()
+
+        if kls.is_normalise_hook(key):
+            kls.remake_normalise_plan()
+
+    def __delattr__(kls, key):
+        super(SpecMetakls, kls).__delattr__(key)
+        for name, try_name in kls.result_hooks:
+            for made, made_from in ((try_name, name), (name, try_name)):
+                if key == made_from and getattr(kls.__dict__.get(made), "adapts", None) == made_from:
+                    type.__delattr__(kls, made)
+
+        if kls.is_normalise_hook(key):
+            kls.remake_normalise_plan()
+
+    def is_normalise_hook(kls, key):
+        return key == "default" or any(key in pair for pair in kls.result_hooks)
+
+    def changes_single_normalise(kls, key):
+        return kls.is_normalise_hook(key) and key not in ("normalise_many", "try_normalise_many")
+
+    def forget_normalise_many(kls):
+        """Make ``try_normalise_many`` and ``try_normalise_results`` normalise one value at a time"""
+        type.__setattr__(kls, "try_normalise_many", try_normalise_each)
+        type.__setattr__(kls, "try_normalise_results", try_results_each)
+        type.__setattr__(kls, "normalise_many", result_unwrapper("try_normalise_many", try_normalise_each))
+
+    def remake_normalise_plan(kls):
+        """Remake the plan for this class and every subclass"""
+        plan = make_normalise_plan(kls)
+        type.__setattr__(kls, "normalise_plan", plan)
+
+        current = kls.__dict__.get("try_normalise", getattr(kls, "try_normalise", None))
+        if current is None or getattr(current, "is_normalise_plan", False):
+            type.__setattr__(kls, "try_normalise", plan)
+
+            normalise = kls.__dict__.get("normalise", getattr(kls, "normalise", None))
+            if normalise is None or getattr(normalise, "unwraps_plan", False):
+                type.__setattr__(kls, "normalise", make_raising_plan(kls, plan))
+
+        for sub in kls.__subclasses__():
+            sub.remake_normalise_plan()
+
+class Spec(six.with_metaclass(SpecMetakls, object)):
     """
     Default shape for a spec (specification, not test!)
 
@@ -96,6 +972,10 @@ class Spec(object):
         If none of those options are defined, then an error is raised complaining
         that we couldn't work out what to do with the value.
 
+        Which of these is used is worked out once per class (see
+        ``SpecMetakls``), so these hooks must be defined on the class rather than
+        set on an instance.
+
         Note that any validation errors should be an subclass of
         ``input_algorithms.errors.BadSpec``. This is because the default specs
         only catch such exceptions. Anything else is assumed to be a
@@ -131,31 +1011,135 @@ class Spec(object):
 
     When you create a subclass of ``Spec`` you either implement one of the
     ``normalise_*`` methods or ``normalise`` itself.
-    """
+
+    try_normalise
+        Does the same as ``normalise`` but returns an
+        ``input_algorithms.results.Success`` with the value or an
+        ``input_algorithms.results.Failure`` with the error instead of raising
+        the error. ``normalise`` is a wrapper around ``try_normalise``.
+
+        Each of the hooks above has a ``try_`` version (``try_normalise_either``
+        , ``try_normalise_empty`` and ``try_normalise_filled``) that returns a
+        result in the same way. The specs in input_algorithms implement those so
+        that errors are passed back to their parents rather than raised and
+        caught.
+
+        Subclasses may implement either version of a hook, or ``normalise`` or
+        ``try_normalise`` directly, and the other is made for them by
+        ``SpecMetakls``.
+
+        Child specs should be used with the ``try_normalise`` function in this
+        module, which also works for objects that only have a ``normalise``
+        method.
+
+    normalise_async
+        Returns an awaitable for normalising the value from inside an
+        ``asyncio`` event loop. See ``input_algorithms.asynchronous``.
+
+    freeze
+        Makes this spec, and the specs inside it, immutable so one spec can be
+        shared between threads. Setting an attribute on a frozen spec raises a
+        ``ProgrammerError`` and lists and dictionaries it holds are replaced
+        with ``FrozenList`` and ``FrozenDict``. Returns the spec.
+
+        Use ``frozen_copy`` instead for a spec that is used elsewhere, like
+        one from a ``Field``, to get a frozen copy and leave it alone.
+
+        Caches that specs are given, like a ``FormattedCache`` or
+        ``StatCache``, are left alone and are safe to share between threads.
+
+    normalise_many
+        Takes in ``meta`` and a list or tuple of ``values`` and returns a list
+        of each value normalised with ``meta.indexed_at(index)`` or, if
+        ``keys`` is given, with ``meta.at(keys[index])``. Errors are collected
+        into one ``BadSpecValue`` for ``meta``.
+
+        Specs like ``string_spec`` and ``integer_spec`` implement
+        ``try_normalise_many`` with a single loop over the values and only make
+        a meta and error for values that fail. ``listof``, ``tupleof`` and
+        ``dictof`` use this for their items.
+    """
+    result_hooks = (
+          ("normalise", "try_normalise")
+        , ("normalise_either", "try_normalise_either")
+        , ("normalise_empty", "try_normalise_empty")
+        , ("normalise_filled", "try_normalise_filled")
+        , ("normalise_many", "try_normalise_many")
+        )
+
+    is_frozen = False
+
     def __init__(self, *pargs, **kwargs):
         self.pargs = pargs
         self.kwargs = kwargs
         if hasattr(self, "setup"):
             self.setup(*pargs, **kwargs)
 
+    def __setattr__(self, key, val):
+        if self.is_frozen:
+            raise ProgrammerError("Can't change {0} on a frozen {1}".format(key, self.__class__.__name__))
+        object.__setattr__(self, key, val)
+
+    def __delattr__(self, key):
+        if self.is_frozen:
+            raise ProgrammerError("Can't change {0} on a frozen {1}".format(key, self.__class__.__name__))
+        object.__delattr__(self, key)
+
+    def freeze(self):
+        """Make this spec and everything in it immutable and return it"""
+        if not self.is_frozen:
+            object.__setattr__(self, "is_frozen", True)
+            for key, val in list(self.__dict__.items()):
+                object.__setattr__(self, key, freeze(val))
+        return self
+
+    def frozen_copy(self, memo=None):
+        """Return a frozen copy of this spec and the specs inside it, leaving them as they are"""
+        if memo is None:
+            memo = {}
+
+        found = memo.get(id(self))
+        if found is not None:
+            return found[1]
+
+        copy = object.__new__(self.__class__)
+        memo[id(self)] = (self, copy)
+        for key, val in self.__dict__.items():
+            object.__setattr__(copy, key, freeze(val, memo))
+        object.__setattr__(copy, "is_frozen", True)
+        return copy
+
     def normalise(self, meta, val):
         """Use this spec to normalise our value"""
-        if hasattr(self, "normalise_either"):
-            result = self.normalise_either(meta, val)
-            if result is not NotSpecified:
-                return result
-
-        if val is NotSpecified:
-            if hasattr(self, "normalise_empty"):
-                return self.normalise_empty(meta)
-            elif hasattr(self, "default"):
-                return self.default(meta)
-            else:
-                return val
-        elif hasattr(self, "normalise_filled"):
-            return self.normalise_filled(meta, val)
-
-        raise BadSpec("Spec doesn't know how to deal with this value", spec=self, meta=meta, val=val)
+        result = self.try_normalise(meta, val)
+        if result.ok:
+            return result.value
+        raise result.error
+    normalise.adapts = "try_normalise"
+    normalise.unwraps_plan = True
+
+    def try_normalise_many(self, meta, values, keys=None):
+        """Normalise all the ``values`` and return a ``Success`` or ``Failure``"""
+        return try_normalise_each(self, meta, values, keys=keys)
+
+    def try_normalise_results(self, meta, values, errors, start=0):
+        """Return a ``Success`` or ``Failure`` for each of ``values``, see ``try_normalise_results``"""
+        return try_results_each(self, meta, values, errors, start=start)
+
+    def normalise_async(self, meta, val):
+        """
+        Return an awaitable that resolves to the normalised value or raises the
+        error, without blocking the event loop while paths are checked.
+
+        See ``input_algorithms.asynchronous``, which needs python3.5 or above.
+        """
+        from input_algorithms.asynchronous import normalise_async
+        return normalise_async(self, meta, val)
+
+    def try_normalise_async(self, meta, val):
+        """The same as ``normalise_async`` but resolves to a ``Success`` or ``Failure``"""
+        from input_algorithms.asynchronous import try_normalise_async
+        return try_normalise_async(self, meta, val)
 
     def fake_filled(self, meta, with_non_defaulted=False):
         """Return this spec as if it was filled with the defaults"""
@@ -175,8 +1159,11 @@ class pass_through_spec(Spec):
 
     Will not touch the value in any way and just return it.
     """
-    def normalise_either(self, meta, val):
-        return val
+    def try_normalise_either(self, meta, val):
+        return Success(val)
+
+    def try_normalise_many(self, meta, values, keys=None):
+        return Success(list(values))
 
 @spec
 class always_same_spec(Spec):
@@ -191,8 +1178,11 @@ class always_same_spec(Spec):
     def setup(self, result):
         self.result = result
 
-    def normalise_either(self, meta, val):
-        return self.result
+    def try_normalise_either(self, meta, val):
+        return Success(self.result)
+
+    def try_normalise_many(self, meta, values, keys=None):
+        return Success([self.result] * len(values))
 
 @spec
 class dictionary_spec(Spec):
@@ -211,12 +1201,12 @@ class dictionary_spec(Spec):
     def default(self, meta):
         return {}
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Make sure it's a dictionary"""
         if not isinstance(val, dict) and not getattr(val, "is_dict", False):
-            raise BadSpecValue("Expected a dictionary", meta=meta, got=type(val))
+            return Failure(BadSpecValue("Expected a dictionary", meta=meta, got=type(val)))
 
-        return val
+        return Success(val)
 
 @spec
 class dictof(dictionary_spec):
@@ -255,32 +1245,54 @@ class dictof(dictionary_spec):
         self.name_spec = name_spec
         self.value_spec = value_spec
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Make sure all the names match the spec and normalise the values"""
-        val = super(dictof, self).normalise_filled(meta, val)
+        dct = super(dictof, self).try_normalise_filled(meta, val)
+        if not dct.ok:
+            return dct
+
+        errors = ErrorCollector(meta)
+
+        if not self.nested:
+            items = list(dct.value.items())
+            keys = [key for key, _ in items]
+            count = errors.count
+            names = try_normalise_many(self.name_spec, meta, keys, keys=keys)
+            if names.ok:
+                values = try_normalise_children(self.value_spec, meta, [value for _, value in items], keys=keys)
+                if not values.ok:
+                    return values
+                return Success(dict(zip(names.value, values.value)))
+            errors.rewind(count)
 
         result = {}
-        errors = []
-        for key, value in val.items():
-            try:
-                name = self.name_spec.normalise(meta.at(key), key)
-            except BadSpec as error:
-                errors.append(error)
+        for key, value in dct.value.items():
+            if errors.exhausted():
+                break
+
+            at = meta.at(key)
+            count = errors.count
+            # The name and the value
+            errors.visited(2)
+            name = try_normalise(self.name_spec, at, key)
+            if not name.ok:
+                errors.add(name.error, count)
+                continue
+
+            if self.nested and (isinstance(value, dict) or getattr(value, "is_dict", False)):
+                normalised = self.__class__(self.name_spec, self.value_spec, nested=self.nested).try_normalise(at, value)
             else:
-                try:
-                    if self.nested and (isinstance(value, dict) or getattr(value, "is_dict", False)):
-                        normalised = self.__class__(self.name_spec, self.value_spec, nested=self.nested).normalise(meta.at(key), value)
-                    else:
-                        normalised = self.value_spec.normalise(meta.at(key), value)
-                except BadSpec as error:
-                    errors.append(error)
-                else:
-                    result[name] = normalised
+                normalised = try_normalise(self.value_spec, at, value)
+
+            if normalised.ok:
+                result[name.value] = normalised.value
+            else:
+                errors.add(normalised.error, count)
 
         if errors:
-            raise BadSpecValue(meta=meta, _errors=errors)
+            return errors.failure()
 
-        return result
+        return Success(result)
 
 @spec
 class tupleof(Spec):
@@ -303,23 +1315,16 @@ class tupleof(Spec):
     def default(self, meta):
         return ()
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Turn this into a tuple of it's not and normalise all the items in the tuple"""
         if not isinstance(val, list) and not isinstance(val, tuple):
             val = [val]
 
-        result = []
-        errors = []
-        for index, item in enumerate(val):
-            try:
-                result.append(self.spec.normalise(meta.indexed_at(index), item))
-            except BadSpec as error:
-                errors.append(error)
+        result = try_normalise_many(self.spec, meta, val)
+        if not result.ok:
+            return result
 
-        if errors:
-            raise BadSpecValue(meta=meta, _errors=errors)
-
-        return tuple(result)
+        return Success(tuple(result.value))
 
 @spec
 class listof(Spec):
@@ -341,42 +1346,165 @@ class listof(Spec):
     is left alone, otherwise ``spec`` is used to normalise the value.
 
     The resulting list of items is returned.
+
+    For values too big to hold in memory at once there is also:
+
+    .. code-block:: python
+
+        for item in listof(spec).iter_normalise(meta, iterable):
+            ...
+
+        # or
+
+        for result in listof(spec).iter_try_normalise(meta, iterable):
+            if result.ok:
+                ...
+
+    These take any iterable, including generators, and yield the normalised
+    items one at a time. ``iter_normalise`` raises the errors it collected
+    once the iterable is exhausted, ``iter_try_normalise`` yields a
+    ``Success`` or ``Failure`` for each item instead.
     """
+    stream_chunk_size = 1000
+
     def setup(self, spec, expect=NotSpecified):
         self.spec = spec
         self.expect = expect
 
+    def iter_normalise(self, meta, val, max_errors=100):
+        """
+        Yield each item of ``val`` normalised and raise any errors at the end
+
+        At most ``max_errors`` errors are kept (``None`` keeps them all) so
+        that memory doesn't grow with the number of bad items. If some were
+        dropped, the raised error says how many there were in ``total_errors``
+        """
+        errors = []
+        total = 0
+        for result in self.iter_try_normalise(meta, val):
+            if result.ok:
+                yield result.value
+            else:
+                total += 1
+                if max_errors is None or len(errors) < max_errors:
+                    errors.append(result.error)
+
+        if total > len(errors):
+            raise BadSpecValue(meta=meta, total_errors=total, _errors=errors)
+        elif errors:
+            raise BadSpecValue(meta=meta, _errors=errors)
+
+    def iter_try_normalise(self, meta, val):
+        """
+        Yield a ``Success`` or ``Failure`` for each item in ``val``
+
+        Items are normalised ``stream_chunk_size`` at a time with
+        ``try_normalise_results``, which normalises each item once.
+
+        If the error budget in ``meta.run`` is used up, the last thing yielded
+        is a ``Failure`` saying so and the rest of ``val`` is left alone.
+        """
+        if val is NotSpecified:
+            return
+
+        if self.expect is not NotSpecified and isinstance(val, self.expect):
+            yield Success(val)
+            return
+
+        if isinstance(val, six.string_types) or isinstance(val, dict) or getattr(val, "is_dict", False) or not hasattr(val, "__iter__"):
+            val = [val]
+
+        errors = ErrorCollector(meta)
+
+        chunk = []
+        start = 0
+        for item in val:
+            chunk.append(item)
+            if len(chunk) >= self.stream_chunk_size:
+                for result in self.try_normalise_chunk(meta, start, chunk, errors):
+                    yield result
+                if errors.exhausted():
+                    break
+                start += len(chunk)
+                chunk = []
+        else:
+            for result in self.try_normalise_chunk(meta, start, chunk, errors):
+                yield result
+
+        if errors.exhausted():
+            yield Failure(BadSpecValue("Stopped after using up the error budget", meta=meta, total_errors=errors.count))
+
+    def try_normalise_chunk(self, meta, start, chunk, errors):
+        """Return a list of results for ``chunk``, which starts at index ``start``"""
+        if not chunk:
+            return []
+
+        if self.expect is NotSpecified:
+            results = try_normalise_results(self.spec, meta, chunk, errors, start=start)
+            errors.visited(len(results))
+            return results
+
+        results = []
+        for index, item in enumerate(chunk, start):
+            if errors.exhausted():
+                break
+
+            if self.expect is not NotSpecified and isinstance(item, self.expect):
+                results.append(Success(item))
+                continue
+
+            count = errors.count
+            normalised = try_normalise(self.spec, meta.indexed_at(index), item)
+            if normalised.ok and self.expect is not NotSpecified and not isinstance(normalised.value, self.expect):
+                normalised = Failure(BadSpecValue("Expected normaliser to create a specific object", expected=self.expect, meta=meta.indexed_at(index), got=normalised.value))
+            if not normalised.ok:
+                errors.count_error(count)
+            results.append(normalised)
+        return results
+
     def default(self, meta):
         return []
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Turn this into a list of it's not and normalise all the items in the list"""
         if self.expect is not NotSpecified and isinstance(val, self.expect):
-            return [val]
+            return Success([val])
 
         if not isinstance(val, list):
             val = [val]
 
+        if self.expect is NotSpecified:
+            return try_normalise_children(self.spec, meta, val)
+
         result = []
-        errors = []
+        errors = ErrorCollector(meta)
         for index, item in enumerate(val):
+            if errors.exhausted():
+                break
+
+            errors.visited()
             if isinstance(item, self.expect):
                 result.append((index, item))
             else:
-                try:
-                    result.append((index, self.spec.normalise(meta.indexed_at(index), item)))
-                except BadSpec as error:
-                    errors.append(error)
+                count = errors.count
+                normalised = try_normalise(self.spec, meta.indexed_at(index), item)
+                if normalised.ok:
+                    result.append((index, normalised.value))
+                else:
+                    errors.add(normalised.error, count)
 
         if self.expect is not NotSpecified:
             for index, value in result:
+                if errors.exhausted():
+                    break
+
                 if not isinstance(value, self.expect):
-                    errors.append(BadSpecValue("Expected normaliser to create a specific object", expected=self.expect, meta=meta.indexed_at(index), got=value))
+                    errors.add(BadSpecValue("Expected normaliser to create a specific object", expected=self.expect, meta=meta.indexed_at(index), got=value), errors.count)
 
         if errors:
-            raise BadSpecValue(meta=meta, _errors=errors)
+            return errors.failure()
 
-        return list(map(operator.itemgetter(1), result))
+        return Success(list(map(operator.itemgetter(1), result)))
 
 @spec
 class set_options(Spec):
@@ -409,27 +1537,39 @@ class set_options(Spec):
     def default(self, meta):
         return {}
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Fill out a dictionary with what we want as well as the remaining extra"""
         # Make sure val is a dictionary!
-        val = dictionary_spec().normalise(meta, val)
+        dct = dictionary_spec().try_normalise(meta, val)
+        if not dct.ok:
+            return dct
+        val = dct.value
 
         result = {}
-        errors = []
+        errors = collector_for(meta)
 
         for key, spec in self.options.items():
+            count = 0
+            if errors is not None:
+                if errors.exhausted():
+                    break
+                count = errors.count
+                errors.visited()
+
             nxt = val.get(key, NotSpecified)
 
-            try:
-                normalised = spec.normalise(meta.at(key), nxt)
-                result[key] = normalised
-            except (BadSpec, BadSpecValue) as error:
-                errors.append(error)
+            normalised = try_normalise(spec, meta.at(key), nxt)
+            if normalised.ok:
+                result[key] = normalised.value
+            else:
+                if errors is None:
+                    errors = ErrorCollector(meta)
+                errors.add(normalised.error, count)
 
         if errors:
-            raise BadSpecValue(meta=meta, _errors=errors)
+            return errors.failure()
 
-        return result
+        return Success(result)
 
     def fake(self, meta, with_non_defaulted=False):
         """Return a dict with the defaults from the keys that have them"""
@@ -454,11 +1594,14 @@ class defaulted(Spec):
     """
     def setup(self, spec, dflt):
         self.spec = spec
-        self.default = lambda m: dflt
+        self.dflt = dflt
+
+    def default(self, meta):
+        return self.dflt
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Proxy our spec"""
-        return self.spec.normalise(meta, val)
+        return try_normalise(self.spec, meta, val)
 
 @spec
 class required(Spec):
@@ -475,13 +1618,13 @@ class required(Spec):
     def setup(self, spec):
         self.spec = spec
 
-    def normalise_empty(self, meta):
+    def try_normalise_empty(self, meta):
         """Complain that we have no value"""
-        raise BadSpecValue("Expected a value but got none", meta=meta)
+        return Failure(BadSpecValue("Expected a value but got none", meta=meta))
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Proxy our spec"""
-        return self.spec.normalise(meta, val)
+        return try_normalise(self.spec, meta, val)
 
     def fake(self, meta, with_non_defaulted=False):
         return self.spec.fake_filled(meta, with_non_defaulted=with_non_defaulted)
@@ -502,12 +1645,20 @@ class boolean(Spec):
         deliberate decision. Use defaulted(boolean(), <dflt>) if you want to
         handle that.
     """
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Complain if not already a boolean"""
         if not isinstance(val, bool):
-            raise BadSpecValue("Expected a boolean", meta=meta, got=type(val))
+            return Failure(BadSpecValue("Expected a boolean", meta=meta, got=type(val)))
         else:
-            return val
+            return Success(val)
+
+    def try_normalise_many(self, meta, values, keys=None):
+        """Return the values as is if they are all booleans"""
+        if all(isinstance(val, bool) for val in values):
+            return Success(list(values))
+        return try_normalise_leaves(self, meta, values, keys=keys)
+
+    try_normalise_results = try_leaf_results
 
 @spec
 class directory_spec(Spec):
@@ -527,7 +1678,19 @@ class directory_spec(Spec):
     It then makes sure that ``val`` is a string, exists, and is a directory.
 
     If it isn't, an error is raised, otherwise the ``val`` is returned.
+
+    The path is stat'd once with ``stat_path``. Set ``directory_spec.stat_cache``
+    to a ``input_algorithms.caches.StatCache`` to share what is found.
+
+    When many directories are normalised together, for example with
+    ``listof(directory_spec())``, they are stat'd in a pool of
+    ``directory_spec.stat_threads`` threads if there are at least
+    ``directory_spec.stat_threshold`` of them.
     """
+    stat_cache = None
+    stat_threads = 8
+    stat_threshold = 64
+
     def setup(self, spec=NotSpecified):
         self.spec = spec
         if self.spec is NotSpecified:
@@ -536,19 +1699,40 @@ class directory_spec(Spec):
     def fake(self, meta, with_non_defaulted=False):
         return self.spec.fake_filled(meta, with_non_defaulted=with_non_defaulted)
 
-    def normalise_either(self, meta, val):
+    def try_normalise_either(self, meta, val):
         """Complain if not a meta to a directory"""
+        result = self.try_path(meta, val)
+        if not result.ok:
+            return result
+        return self.check(meta, result.value, stat_path(meta, result.value, self.stat_cache))
+
+    def try_normalise_many(self, meta, values, keys=None):
+        return try_check_paths(self, meta, values, keys=keys)
+
+    def try_normalise_results(self, meta, values, errors, start=0):
+        return try_check_path_results(self, meta, values, errors, start=start)
+
+    def try_path(self, meta, val):
+        """Normalise ``val`` with our spec and complain if it isn't a string"""
         if self.spec is not NotSpecified:
-            val = self.spec.normalise(meta, val)
+            result = try_normalise(self.spec, meta, val)
+            if not result.ok:
+                return result
+            val = result.value
 
         if not isinstance(val, six.string_types):
-            raise BadDirectory("Didn't even get a string", meta=meta, got=type(val))
-        elif not os.path.exists(val):
-            raise BadDirectory("Got something that didn't exist", meta=meta, directory=val)
-        elif not os.path.isdir(val):
-            raise BadDirectory("Got something that exists but isn't a directory", meta=meta, directory=val)
+            return Failure(BadDirectory("Didn't even get a string", meta=meta, got=type(val)))
+
+        return Success(val)
+
+    def check(self, meta, val, found):
+        """Complain if ``found``, the ``os.stat`` of ``val``, isn't a directory"""
+        if found is None:
+            return Failure(BadDirectory("Got something that didn't exist", meta=meta, directory=val))
+        elif not stat.S_ISDIR(found.st_mode):
+            return Failure(BadDirectory("Got something that exists but isn't a directory", meta=meta, directory=val))
         else:
-            return val
+            return Success(val)
 
 @spec
 class filename_spec(Spec):
@@ -568,28 +1752,62 @@ class filename_spec(Spec):
     It then makes sure that ``val`` is a string, exists, and is a file.
 
     If it isn't, an error is raised, otherwise the ``val`` is returned.
+
+    The path is stat'd once with ``stat_path``. Set ``filename_spec.stat_cache``
+    to a ``input_algorithms.caches.StatCache`` to share what is found.
+
+    When many files are normalised together they are stat'd in a pool of
+    ``filename_spec.stat_threads`` threads if there are at least
+    ``filename_spec.stat_threshold`` of them.
     """
+    stat_cache = None
+    stat_threads = 8
+    stat_threshold = 64
+
     def setup(self, spec=NotSpecified, may_not_exist=False):
         self.spec = spec
         self.may_not_exist = may_not_exist
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
+        result = self.try_path(meta, val)
+        if not result.ok:
+            return result
+        return self.check(meta, result.value, stat_path(meta, result.value, self.stat_cache))
+
+    def try_normalise_many(self, meta, values, keys=None):
+        return try_check_paths(self, meta, values, keys=keys)
+
+    def try_normalise_results(self, meta, values, errors, start=0):
+        return try_check_path_results(self, meta, values, errors, start=start)
+
+    def try_path(self, meta, val):
+        """Normalise ``val`` with our spec and complain if it isn't a string"""
+        if val is NotSpecified:
+            return self.try_normalise(meta, val)
+
         if self.spec is not NotSpecified:
-            val = self.spec.normalise(meta, val)
+            result = try_normalise(self.spec, meta, val)
+            if not result.ok:
+                return result
+            val = result.value
 
         if not isinstance(val, six.string_types):
-            raise BadFilename("Didn't even get a string", meta=meta, got=type(val))
+            return Failure(BadFilename("Didn't even get a string", meta=meta, got=type(val)))
+
+        return Success(val)
 
-        if not os.path.exists(val):
+    def check(self, meta, val, found):
+        """Complain if ``found``, the ``os.stat`` of ``val``, isn't a file"""
+        if found is None:
             if self.may_not_exist:
-                return val
+                return Success(val)
 
-            raise BadFilename("Got something that didn't exist", meta=meta, filename=val)
+            return Failure(BadFilename("Got something that didn't exist", meta=meta, filename=val))
 
-        if not os.path.isfile(val):
-            raise BadFilename("Got something that exists but isn't a file", meta=meta, filename=val)
+        if not stat.S_ISREG(found.st_mode):
+            return Failure(BadFilename("Got something that exists but isn't a file", meta=meta, filename=val))
 
-        return val
+        return Success(val)
 
 @spec
 class file_spec(Spec):
@@ -602,7 +1820,7 @@ class file_spec(Spec):
     This will complain if ``val`` is not a file object, otherwise it just
     returns ``val``.
     """
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Complain if not a file object"""
         bad = False
         if six.PY2:
@@ -614,8 +1832,8 @@ class file_spec(Spec):
                 bad = True
 
         if bad:
-            raise BadSpecValue("Didn't get a file object", meta=meta, got=val)
-        return val
+            return Failure(BadSpecValue("Didn't get a file object", meta=meta, got=val))
+        return Success(val)
 
 @spec
 class string_spec(Spec):
@@ -633,12 +1851,20 @@ class string_spec(Spec):
     def default(self, meta):
         return ""
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Make sure it's a string"""
         if not isinstance(val, six.string_types):
-            raise BadSpecValue("Expected a string", meta=meta, got=type(val))
+            return Failure(BadSpecValue("Expected a string", meta=meta, got=type(val)))
 
-        return val
+        return Success(val)
+
+    def try_normalise_many(self, meta, values, keys=None):
+        """Return the values as is if they are all strings"""
+        if all(isinstance(val, six.string_types) for val in values):
+            return Success(list(values))
+        return try_normalise_leaves(self, meta, values, keys=keys)
+
+    try_normalise_results = try_leaf_results
 
 @spec
 class integer_spec(Spec):
@@ -657,14 +1883,22 @@ class integer_spec(Spec):
         deliberate decision. Use defaulted(integer_spec(), <dflt>) if you want
         to handle that.
     """
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Make sure it's an integer and convert into one if it's a string"""
         if not isinstance(val, bool) and (isinstance(val, int) or hasattr(val, "isdigit") and val.isdigit()):
             try:
-                return int(val)
+                return Success(int(val))
             except (TypeError, ValueError) as error:
-                raise BadSpecValue("Couldn't transform value into an integer", meta=meta, error=str(error))
-        raise BadSpecValue("Expected an integer", meta=meta, got=type(val))
+                return Failure(BadSpecValue("Couldn't transform value into an integer", meta=meta, error=str(error)))
+        return Failure(BadSpecValue("Expected an integer", meta=meta, got=type(val)))
+
+    def try_normalise_many(self, meta, values, keys=None):
+        """Return the values as is if they are all integers"""
+        if all(type(val) in six.integer_types for val in values):
+            return Success(list(values))
+        return try_normalise_leaves(self, meta, values, keys=keys)
+
+    try_normalise_results = try_leaf_results
 
 @spec
 class float_spec(Spec):
@@ -679,15 +1913,23 @@ class float_spec(Spec):
 
     Otherwise, or if that fails, an error is raised.
     """
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Make sure it's a float"""
+        if isinstance(val, bool):
+            return Failure(BadSpecValue("Expected a float", meta=meta, got=bool))
+
         try:
-            if not isinstance(val, bool):
-                return float(val)
-            else:
-                raise BadSpecValue("Expected a float", meta=meta, got=bool)
+            return Success(float(val))
         except (TypeError, ValueError) as error:
-            raise BadSpecValue("Expected a float", meta=meta, got=type(val), error=error)
+            return Failure(BadSpecValue("Expected a float", meta=meta, got=type(val), error=error))
+
+    def try_normalise_many(self, meta, values, keys=None):
+        """Return the values as is if they are all floats"""
+        if all(type(val) is float for val in values):
+            return Success(list(values))
+        return try_normalise_leaves(self, meta, values, keys=keys)
+
+    try_normalise_results = try_leaf_results
 
 @spec
 class string_or_int_as_string_spec(Spec):
@@ -705,11 +1947,14 @@ class string_or_int_as_string_spec(Spec):
     def default(self, meta):
         return ""
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Make sure it's a string or integer"""
         if isinstance(val, bool) or (not isinstance(val, six.string_types) and not isinstance(val, six.integer_types)):
-            raise BadSpecValue("Expected a string or integer", meta=meta, got=type(val))
-        return str(val)
+            return Failure(BadSpecValue("Expected a string or integer", meta=meta, got=type(val)))
+        return Success(str(val))
+
+    try_normalise_many = try_normalise_leaves
+    try_normalise_results = try_leaf_results
 
 @spec
 class valid_string_spec(string_spec):
@@ -730,10 +1975,12 @@ class valid_string_spec(string_spec):
     def setup(self, *validators):
         self.validators = validators
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Make sure if there is a value, that it is valid"""
-        val = super(valid_string_spec, self).normalise_filled(meta, val)
-        return apply_validators(meta, val, self.validators)
+        result = super(valid_string_spec, self).try_normalise_filled(meta, val)
+        if not result.ok:
+            return result
+        return try_apply_validators(meta, result.value, self.validators)
 
 @spec
 class integer_choice_spec(integer_spec):
@@ -760,14 +2007,19 @@ class integer_choice_spec(integer_spec):
         if self.reason is NotSpecified:
             self.reason = "Expected one of the available choices"
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Complain if val isn't one of the available"""
-        val = super(integer_choice_spec, self).normalise_filled(meta, val)
+        result = super(integer_choice_spec, self).try_normalise_filled(meta, val)
+        if not result.ok:
+            return result
 
-        if val not in self.choices:
-            raise BadSpecValue(self.reason, available=self.choices, got=val, meta=meta)
+        if result.value not in self.choices:
+            return Failure(BadSpecValue(self.reason, available=self.choices, got=result.value, meta=meta))
 
-        return val
+        return result
+
+    try_normalise_many = try_normalise_leaves
+    try_normalise_results = try_leaf_results
 
 @spec
 class string_choice_spec(string_spec):
@@ -794,14 +2046,19 @@ class string_choice_spec(string_spec):
         if self.reason is NotSpecified:
             self.reason = "Expected one of the available choices"
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Complain if val isn't one of the available"""
-        val = super(string_choice_spec, self).normalise_filled(meta, val)
+        result = super(string_choice_spec, self).try_normalise_filled(meta, val)
+        if not result.ok:
+            return result
 
-        if val not in self.choices:
-            raise BadSpecValue(self.reason, available=self.choices, got=val, meta=meta)
+        if result.value not in self.choices:
+            return Failure(BadSpecValue(self.reason, available=self.choices, got=result.value, meta=meta))
 
-        return val
+        return result
+
+    try_normalise_many = try_normalise_leaves
+    try_normalise_results = try_leaf_results
 
 @spec
 class create_spec(Spec):
@@ -834,13 +2091,23 @@ class create_spec(Spec):
     def fake(self, meta, with_non_defaulted=False):
         return self.kls(**self.expected_spec.fake_filled(meta, with_non_defaulted=with_non_defaulted))
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """If val is already our expected kls, return it, otherwise instantiate it"""
         if isinstance(val, self.kls):
-            return val
+            return Success(val)
 
-        apply_validators(meta, val, self.validators, chain_value=False)
-        values = self.expected_spec.normalise(meta, val)
+        validated = try_apply_validators(meta, val, self.validators, chain_value=False)
+        if not validated.ok:
+            return validated
+
+        values = self.expected_spec.try_normalise(meta, val)
+        if not values.ok:
+            return values
+
+        return Success(self.create(meta, values.value))
+
+    def create(self, meta, values):
+        """Make our kls from the values normalised by our expected_spec"""
         result = getattr(meta, 'base', {})
         for key in self.expected:
             result[key] = None
@@ -863,17 +2130,21 @@ class or_spec(Spec):
     def setup(self, *specs):
         self.specs = specs
 
-    def normalise_filled(self, meta, val):
-        """Try all the specs till one doesn't raise a BadSpec"""
+    def try_normalise_filled(self, meta, val):
+        """Try all the specs till one doesn't fail"""
         errors = []
+        collector = ErrorCollector(meta)
+        count = collector.count
         for spec in self.specs:
-            try:
-                return spec.normalise(meta, val)
-            except BadSpec as error:
-                errors.append(error)
+            result = try_normalise(spec, meta, val)
+            # Options that don't match don't use up the error budget
+            collector.rewind(count)
+            if result.ok:
+                return result
+            errors.append(result.error)
 
         # If made it this far, none of the specs passed :(
-        raise BadSpecValue("Value doesn't match any of the options", meta=meta, val=val, _errors=errors)
+        return Failure(BadSpecValue("Value doesn't match any of the options", meta=meta, val=val, _errors=errors))
 
 @spec
 class match_spec(Spec):
@@ -902,22 +2173,22 @@ class match_spec(Spec):
         self.specs = specs
         self.fallback = kwargs.get("fallback")
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Try the specs given the type of val"""
         for expected_typ, spec in self.specs:
             if isinstance(val, expected_typ):
                 if callable(spec):
                     spec = spec()
-                return spec.normalise(meta, val)
+                return try_normalise(spec, meta, val)
 
         if self.fallback is not None:
             fallback = self.fallback
             if callable(self.fallback):
                 fallback = self.fallback()
-            return fallback.normalise(meta, val)
+            return try_normalise(fallback, meta, val)
 
         # If made it this far, none of the specs matched
-        raise BadSpecValue("Value doesn't match any of the options", meta=meta, got=type(val), expected=[expected_typ for expected_typ, _ in self.specs])
+        return Failure(BadSpecValue("Value doesn't match any of the options", meta=meta, got=type(val), expected=[expected_typ for expected_typ, _ in self.specs]))
 
 @spec
 class and_spec(Spec):
@@ -935,22 +2206,18 @@ class and_spec(Spec):
     def setup(self, *specs):
         self.specs = specs
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Try all the specs"""
-        errors = []
         transformations = [val]
         for spec in self.specs:
-            try:
-                val = spec.normalise(meta, val)
-                transformations.append(val)
-            except BadSpec as error:
-                errors.append(error)
-                break
+            result = try_normalise(spec, meta, val)
+            if not result.ok:
+                return Failure(BadSpecValue("Value didn't match one of the options", meta=meta, transformations=transformations, _errors=[result.error]))
 
-        if errors:
-            raise BadSpecValue("Value didn't match one of the options", meta=meta, transformations=transformations, _errors=errors)
-        else:
-            return val
+            val = result.value
+            transformations.append(val)
+
+        return Success(val)
 
 @spec
 class optional_spec(Spec):
@@ -970,13 +2237,13 @@ class optional_spec(Spec):
     def fake(self, meta, with_non_defaulted=False):
         return self.spec.fake_filled(meta, with_non_defaulted=with_non_defaulted)
 
-    def normalise_empty(self, meta):
+    def try_normalise_empty(self, meta):
         """Just return NotSpecified"""
-        return NotSpecified
+        return not_specified
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Proxy the spec"""
-        return self.spec.normalise(meta, val)
+        return try_normalise(self.spec, meta, val)
 
 @spec
 class dict_from_bool_spec(Spec):
@@ -1007,18 +2274,18 @@ class dict_from_bool_spec(Spec):
         self.spec = spec
         self.dict_maker = dict_maker
 
-    def normalise_empty(self, meta):
+    def try_normalise_empty(self, meta):
         """Use an empty dict with the spec if not specified"""
-        return self.normalise_filled(meta, {})
+        return self.try_normalise_filled(meta, {})
 
     def fake(self, meta, with_non_defaulted=False):
         return self.spec.fake_filled(meta, with_non_defaulted=with_non_defaulted)
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         """Proxy the spec"""
         if isinstance(val, bool):
             val = self.dict_maker(meta, val)
-        return self.spec.normalise(meta, val)
+        return try_normalise(self.spec, meta, val)
 
 @spec
 class formatted(Spec):
@@ -1040,14 +2307,13 @@ class formatted(Spec):
     ``MergedOptionStringFormatter`` from the ``option_merge`` library
     (http://option-merge.readthedocs.org/en/latest/docs/api/formatter.html).
 
-    The idea is that ``meta.everything`` is an instance of ``MergedOptions`` and
-    it will create a new instance of ``meta.everything.__class__`` using
-    ``meta.everything.converters`` and ``meta.everything.dont_prefix`` if they
-    exist. Note that this should work with normal dictionaries as well.
+    The idea is that ``meta.everything`` is an instance of ``MergedOptions``.
+    Note that this should work with normal dictionaries as well.
 
-    We then update our copy of ``meta.everything`` with ``meta.key_names()`` and
-    create an instance of ``formatter`` using this copy of the ``meta.everything``
-    , ``meta.path`` and ``spec.normalise(meta, val)`` as the value.
+    We make a ``input_algorithms.meta.LayeredOptions`` view of
+    ``meta.everything`` with ``meta.key_names()`` underneath it, without
+    copying ``meta.everything``, and create an instance of ``formatter`` using
+    this view, ``meta.path`` and ``spec.normalise(meta, val)`` as the value.
 
     We call ``format`` on the ``formatter`` instance, check that it's an instance
     of ``expected_type`` if that has been specified.
@@ -1056,13 +2322,25 @@ class formatted(Spec):
     specified.
 
     And finally, return a value!
+
+    A ``input_algorithms.caches.FormattedCache`` may be given as ``cache`` to
+    remember what the formatter makes, or set as ``formatted.cache`` to be used
+    by every ``formatted`` that isn't given one. Values are only remembered
+    between normalisations if ``meta.everything`` has a ``generation`` that
+    goes up when it changes, like a ``GenerationDict``. Otherwise they are
+    only remembered until the end of the normalisation, and only if ``meta``
+    has a ``Run``.
     """
-    def setup(self, spec, formatter, expected_type=NotSpecified, after_format=NotSpecified):
+    cache = None
+
+    def setup(self, spec, formatter, expected_type=NotSpecified, after_format=NotSpecified, cache=NotSpecified):
         self.spec = spec
         self.formatter = formatter
         self.after_format = after_format
         self.expected_type = expected_type
         self.has_expected_type = self.expected_type and self.expected_type is not NotSpecified
+        if cache is not NotSpecified:
+            self.cache = cache
 
     def fake(self, meta, with_non_defaulted=False):
         if with_non_defaulted:
@@ -1070,16 +2348,17 @@ class formatted(Spec):
         else:
             return NotSpecified
 
-    def normalise_either(self, meta, val):
+    def try_normalise_either(self, meta, val):
         """Format the value"""
-        options_opts = {}
-        if hasattr(meta.everything, "converters"):
-            options_opts['converters'] = meta.everything.converters
-        if hasattr(meta.everything, "dont_prefix"):
-            options_opts["dont_prefix"] = meta.everything.dont_prefix
-        options = meta.everything.__class__(**options_opts)
-        options.update(meta.key_names())
-        options.update(meta.everything)
+        specd = try_normalise(self.spec, meta, val)
+        if not specd.ok:
+            return specd
+        return self.try_format(meta, specd.value)
+
+    def try_format(self, meta, specd):
+        """Format ``specd``, the value normalised by our spec"""
+        key_names = meta.key_names()
+        options = LayeredOptions(meta.everything, key_names)
 
         af = self.after_format
         if af != NotSpecified:
@@ -1087,19 +2366,27 @@ class formatted(Spec):
             if callable(af):
                 af = af()
 
-        specd = self.spec.normalise(meta, val)
         if not isinstance(specd, six.string_types) and af != NotSpecified:
-            return af.normalise(meta, specd)
+            return try_normalise(af, meta, specd)
 
-        formatted = self.formatter(options, meta.path, value=specd).format()
+        if self.cache is not None and isinstance(specd, six.string_types):
+            run = getattr(meta, "run", None)
+            if not isinstance(run, Run):
+                run = None
+            formatted = self.cache.format(self.formatter, options, meta.path, specd, key_names, meta.everything, run=run)
+        else:
+            formatted = self.formatter(options, meta.path, value=specd).format()
         if af != NotSpecified:
-            formatted = af.normalise(meta, formatted)
+            formatted = try_normalise(af, meta, formatted)
+            if not formatted.ok:
+                return formatted
+            formatted = formatted.value
 
         if self.has_expected_type:
             if not isinstance(formatted, self.expected_type):
-                raise BadSpecValue("Expected a different type", got=type(formatted), expected=self.expected_type)
+                return Failure(BadSpecValue("Expected a different type", got=type(formatted), expected=self.expected_type))
 
-        return formatted
+        return Success(formatted)
 
 @spec
 class many_format(Spec):
@@ -1138,34 +2425,72 @@ class many_format(Spec):
 
         This essentially means we can format a key in the options using other
         keys from the options!
+
+    If ``meta`` has a ``input_algorithms.meta.Run``, what each string resolves
+    to is remembered for the rest of that normalisation, keyed by the path in
+    ``meta`` and the string. This means many keys that refer to the same
+    chains of options only resolve each chain once.
+
+    If the formatting goes around in a circle, the error has the whole chain
+    of strings in ``chain``.
+
+    ``cache`` is given to the ``formatted`` specs that are used.
     """
-    def setup(self, spec, formatter, expected_type=NotSpecified):
+    def setup(self, spec, formatter, expected_type=NotSpecified, cache=NotSpecified):
         self.spec = spec
         self.formatter = formatter
         self.expected_type = expected_type
+        self.step_spec = formatted(string_spec(), formatter=self.formatter, expected_type=six.string_types, cache=cache)
+        self.final_spec = formatted(string_spec(), formatter=self.formatter, expected_type=self.expected_type, cache=cache)
 
     def fake(self, meta, with_non_defaulted=False):
         return self.spec.fake_filled(meta, with_non_defaulted=with_non_defaulted)
 
-    def normalise_either(self, meta, val):
+    def try_normalise_either(self, meta, val):
         """Format the formatted spec"""
-        val = self.spec.normalise(meta, val)
-        done = []
+        result = try_normalise(self.spec, meta, val)
+        if not result.ok:
+            return result
+
+        resolved = self.try_resolve(meta, result.value)
+        if not resolved.ok:
+            return resolved
+
+        return self.final_spec.try_normalise(meta, "{{{0}}}".format(resolved.value))
+
+    def try_resolve(self, meta, val):
+        """Format ``val`` until it stops changing"""
+        run = getattr(meta, "run", None)
+        cache = run.cache("many_format") if isinstance(run, Run) else {}
+        path = meta.path
 
+        chain = [val]
+        seen = set(chain)
         while True:
-            fm = formatted(string_spec(), formatter=self.formatter, expected_type=six.string_types)
-            normalised = fm.normalise(meta, val)
+            key = (self.formatter, path, val)
+            if key in cache:
+                resolved = cache[key]
+                break
+
+            result = self.step_spec.try_normalise(meta, val)
+            if not result.ok:
+                return result
+
+            normalised = result.value
             if normalised == val:
+                resolved = val
                 break
 
-            if normalised in done:
-                done.append(normalised)
-                raise BadSpecValue("Recursive formatting", done=done, meta=meta)
-            else:
-                done.append(normalised)
-                val = normalised
+            chain.append(normalised)
+            if normalised in seen:
+                return Failure(BadSpecValue("Recursive formatting", done=chain[1:], chain=" -> ".join(chain), meta=meta))
 
-        return formatted(string_spec(), formatter=self.formatter, expected_type=self.expected_type).normalise(meta, "{{{0}}}".format(val))
+            seen.add(normalised)
+            val = normalised
+
+        for template in chain:
+            cache[(self.formatter, path, template)] = resolved
+        return Success(resolved)
 
 @spec
 class overridden(Spec):
@@ -1180,8 +2505,8 @@ class overridden(Spec):
     def setup(self, value):
         self.value = value
 
-    def normalise(self, meta, val):
-        return self.value
+    def try_normalise(self, meta, val):
+        return Success(self.value)
 
     def default(self, meta):
         return self.value
@@ -1196,8 +2521,8 @@ class any_spec(Spec):
 
     Will return ``val`` regardless of what ``val`` is.
     """
-    def normalise(self, meta, val):
-        return val
+    def try_normalise(self, meta, val):
+        return Success(val)
 
 @spec
 class container_spec(Spec):
@@ -1220,10 +2545,30 @@ class container_spec(Spec):
     def fake(self, meta, with_non_defaulted=False):
         return self.kls(self.spec.fake_filled(meta, with_non_defaulted=with_non_defaulted))
 
-    def normalise_either(self, meta, val):
+    def try_normalise_either(self, meta, val):
         if isinstance(val, self.kls):
-            return val
-        return self.kls(self.spec.normalise(meta, val))
+            return Success(val)
+
+        result = try_normalise(self.spec, meta, val)
+        if not result.ok:
+            return result
+        return Success(self.kls(result.value))
+
+class Delayed(object):
+    """
+    The function given back by ``delayed``, that calls ``method`` on ``spec``
+    with ``args`` and ``kwargs``
+
+    This is a class rather than a lambda so that it can be pickled.
+    """
+    def __init__(self, spec, method, *args, **kwargs):
+        self.spec = spec
+        self.args = args
+        self.kwargs = kwargs
+        self.method = method
+
+    def __call__(self):
+        return getattr(self.spec, self.method)(*self.args, **self.kwargs)
 
 @spec
 class delayed(Spec):
@@ -1238,11 +2583,11 @@ class delayed(Spec):
     def setup(self, spec):
         self.spec = spec
 
-    def normalise_either(self, meta, val):
-        return lambda: self.spec.normalise(meta, val)
+    def try_normalise_either(self, meta, val):
+        return Success(Delayed(self.spec, "normalise", meta, val))
 
     def fake(self, meta, with_non_defaulted=False):
-        return lambda: self.spec.fake_filled(meta, with_non_defaulted=with_non_defaulted)
+        return Delayed(self.spec, "fake_filled", meta, with_non_defaulted=with_non_defaulted)
 
 @spec
 class typed(Spec):
@@ -1259,10 +2604,10 @@ class typed(Spec):
     def setup(self, kls):
         self.kls = kls
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         if not isinstance(val, self.kls):
-            raise BadSpecValue("Got the wrong type of value", expected=self.kls, got=type(val), meta=meta)
-        return val
+            return Failure(BadSpecValue("Got the wrong type of value", expected=self.kls, got=type(val), meta=meta))
+        return Success(val)
 
 @spec
 class has(Spec):
@@ -1279,16 +2624,16 @@ class has(Spec):
     def setup(self, *properties):
         self.properties = properties
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         missing = []
         for prop in self.properties:
             if not hasattr(val, prop):
                 missing.append(prop)
 
         if missing:
-            raise BadSpecValue("Value is missing required properties", required=self.properties, missing=missing, meta=meta)
+            return Failure(BadSpecValue("Value is missing required properties", required=self.properties, missing=missing, meta=meta))
 
-        return val
+        return Success(val)
 
 @spec
 class tuple_spec(Spec):
@@ -1309,25 +2654,37 @@ class tuple_spec(Spec):
     def setup(self, *specs):
         self.specs = specs
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         if type(val) is not tuple:
-            raise BadSpecValue("Expected a tuple", got=type(val), meta=meta)
+            return Failure(BadSpecValue("Expected a tuple", got=type(val), meta=meta))
 
         if len(val) != len(self.specs):
-            raise BadSpecValue("Expected tuple to be of a particular length", expected=len(self.specs), got=len(val), meta=meta)
+            return Failure(BadSpecValue("Expected tuple to be of a particular length", expected=len(self.specs), got=len(val), meta=meta))
 
         result = []
-        errors = []
+        errors = collector_for(meta)
         for index, spec in enumerate(self.specs):
-            try:
-                result.append(spec.normalise(meta.indexed_at(index), val[index]))
-            except BadSpecValue as error:
-                errors.append(error)
+            count = 0
+            if errors is not None:
+                if errors.exhausted():
+                    break
+                count = errors.count
+                errors.visited()
+
+            normalised = try_normalise(spec, meta.indexed_at(index), val[index])
+            if normalised.ok:
+                result.append(normalised.value)
+            elif isinstance(normalised.error, BadSpecValue):
+                if errors is None:
+                    errors = ErrorCollector(meta)
+                errors.add(normalised.error, count)
+            else:
+                return normalised
 
         if errors:
-            raise BadSpecValue("Value failed some specifications", _errors=errors, meta=meta)
+            return errors.failure("Value failed some specifications")
 
-        return tuple(result)
+        return Success(tuple(result))
 
 @spec
 class none_spec(Spec):
@@ -1341,12 +2698,12 @@ class none_spec(Spec):
 
     Defaults to None.
     """
-    def normalise_empty(self, meta):
-        return None
+    def try_normalise_empty(self, meta):
+        return Success(None)
 
-    def normalise_filled(self, meta, val):
+    def try_normalise_filled(self, meta, val):
         if val is None:
-            return None
+            return Success(None)
         else:
-            raise BadSpecValue("Expected None", got=val, meta=meta)
+            return Failure(BadSpecValue("Expected None", got=val, meta=meta))
 
@@ -9,19 +9,27 @@ ignored and any specified value goes through the ``validate`` method.
 
 It is the job of the validator to raise a sublcass of ``input_algorithms.errors.BadSpec``
 if something is wrong, otherwise just return ``val``.
+
+Validators may instead implement ``try_validate``, which returns an
+``input_algorithms.results.Success`` or ``Failure`` rather than raising. This is
+what the validators here do.
 """
 from input_algorithms.errors import BadSpecValue, DeprecatedKey, BadSpecDefinition
 from input_algorithms.spec_base import Spec, NotSpecified
+from input_algorithms.results import Success, Failure
 from input_algorithms import spec_base as sb
 
 from itertools import chain
+import threading
 import re
 
 default_validators = []
+default_validators_lock = threading.Lock()
 
 def register(func):
     """For the documentations!"""
-    default_validators.append((func.__name__, func))
+    with default_validators_lock:
+        default_validators.append((func.__name__, func))
     return func
 
 class Validator(Spec):
@@ -32,15 +40,27 @@ class Validator(Spec):
     ``validate``
         A method to do validation on a value. if the value is invalid, it is best
         to raise an instance of ``input_algorithms.errors.BadSpec``.
+
+    ``try_validate``
+        The same as ``validate`` but returns a ``Success`` or ``Failure``. Only
+        one of ``validate`` and ``try_validate`` needs to be implemented.
+
+    Either of them may be an ``async def`` for validators that are used with
+    ``normalise_async``. See ``input_algorithms.asynchronous``.
     """
+    result_hooks = Spec.result_hooks + (("validate", "try_validate"), )
+
     def validate(meta, val):
         raise NotImplementedError()
 
-    def normalise_either(self, meta, val):
+    def try_normalise_either(self, meta, val):
         if val is NotSpecified:
-            return val
-        else:
-            return self.validate(meta, val)
+            return Success(val)
+
+        waiting = sb.waiting_for(meta)
+        if waiting is not None:
+            return waiting.try_validate(self, meta, val)
+        return self.try_validate(meta, val)
 
 @register
 class has_either(Validator):
@@ -58,11 +78,11 @@ class has_either(Validator):
     def setup(self, choices):
         self.choices = choices
 
-    def validate(self, meta, val):
+    def try_validate(self, meta, val):
         """Complain if we have none of the choices"""
         if all(val.get(key, NotSpecified) is NotSpecified for key in self.choices):
-            raise BadSpecValue("Need to specify atleast one of the required keys", choices=self.choices, meta=meta)
-        return val
+            return Failure(BadSpecValue("Need to specify atleast one of the required keys", choices=self.choices, meta=meta))
+        return Success(val)
 
 @register
 class has_only_one_of(Validator):
@@ -82,11 +102,11 @@ class has_only_one_of(Validator):
             raise BadSpecDefinition("Must specify atleast one choice", got=choices)
         self.choices = choices
 
-    def validate(self, meta, val):
+    def try_validate(self, meta, val):
         """Complain if we don't have one of the choices"""
         if [val.get(key, NotSpecified) is NotSpecified for key in self.choices].count(True) != 1:
-            raise BadSpecValue("Can only specify exactly one of the available choices", choices=self.choices, meta=meta)
-        return val
+            return Failure(BadSpecValue("Can only specify exactly one of the available choices", choices=self.choices, meta=meta))
+        return Success(val)
 
 @register
 class either_keys(Validator):
@@ -121,12 +141,16 @@ class either_keys(Validator):
         if duplicate:
             raise BadSpecDefinition("Found common keys in the choices", common=sorted(duplicate))
 
-    def validate(self, meta, val):
+    def try_validate(self, meta, val):
         """Complain if we don't have a valid group"""
         if val is NotSpecified:
             val = None
 
-        val = sb.dictionary_spec().normalise(meta, val)
+        val = sb.dictionary_spec().try_normalise(meta, val)
+        if not val.ok:
+            return val
+        val = val.value
+
         errors = []
         associates = []
         perfect_association = []
@@ -149,7 +173,7 @@ class either_keys(Validator):
 
         if len(perfect_association) == 0:
             if len(associates) == 0:
-                raise BadSpecValue("Value associates with no groups", val=val, choices=self.choices, meta=meta)
+                return Failure(BadSpecValue("Value associates with no groups", val=val, choices=self.choices, meta=meta))
 
             elif len(associates) == 1:
                 group = self.choices[associates[0]]
@@ -168,10 +192,10 @@ class either_keys(Validator):
                     if key in val:
                         invald.append(key)
 
-                raise BadSpecValue("Missing keys from this group", group=group, found=found, invalid=invalid, missing=missing, meta=meta)
+                return Failure(BadSpecValue("Missing keys from this group", group=group, found=found, invalid=invalid, missing=missing, meta=meta))
 
             else:
-                raise BadSpecValue("Value associates with multiple groups", associates=[self.choices[i] for i in associates], got=val, meta=meta)
+                return Failure(BadSpecValue("Value associates with multiple groups", associates=[self.choices[i] for i in associates], got=val, meta=meta))
 
         elif len(perfect_association) == 1:
             other_choices = list(chain.from_iterable([self.choices[i] for i in range(len(self.choices)) if i != perfect_association[0]]))
@@ -181,12 +205,12 @@ class either_keys(Validator):
                     invalid.append(key)
 
             if invalid:
-                raise BadSpecValue("Value associates with a group but has keys from other groups", associates_with=self.choices[perfect_association[0]], invalid=invalid, meta=meta)
+                return Failure(BadSpecValue("Value associates with a group but has keys from other groups", associates_with=self.choices[perfect_association[0]], invalid=invalid, meta=meta))
             else:
-                return val
+                return Success(val)
 
         else:
-            raise BadSpecValue("Value associates with multiple groups", associates=[self.choices[i] for i in perfect_association], got=val, meta=meta)
+            return Failure(BadSpecValue("Value associates with multiple groups", associates=[self.choices[i] for i in perfect_association], got=val, meta=meta))
 
 @register
 class no_whitespace(Validator):
@@ -201,11 +225,11 @@ class no_whitespace(Validator):
     def setup(self):
         self.regex = re.compile("\s+")
 
-    def validate(self, meta, val):
+    def try_validate(self, meta, val):
         """Complain about whitespace"""
         if self.regex.search(val):
-            raise BadSpecValue("Expected no whitespace", meta=meta, val=val)
-        return val
+            return Failure(BadSpecValue("Expected no whitespace", meta=meta, val=val))
+        return Success(val)
 
 @register
 class no_dots(Validator):
@@ -226,14 +250,14 @@ class no_dots(Validator):
     def setup(self, reason=None):
         self.reason = reason
 
-    def validate(self, meta, val):
+    def try_validate(self, meta, val):
         """Complain about dots"""
         if '.' in val:
             reason = self.reason
             if not reason:
                 reason = "Expected no dots"
-            raise BadSpecValue(reason, meta=meta, val=val)
-        return val
+            return Failure(BadSpecValue(reason, meta=meta, val=val))
+        return Success(val)
 
 @register
 class regexed(Validator):
@@ -249,12 +273,12 @@ class regexed(Validator):
     def setup(self, *regexes):
         self.regexes = [(regex, re.compile(regex)) for regex in regexes]
 
-    def validate(self, meta, val):
+    def try_validate(self, meta, val):
         """Complain if the value doesn't match the regex"""
         for spec, regex in self.regexes:
             if not regex.match(val):
-                raise BadSpecValue("Expected value to match regex, it didn't", spec=spec, meta=meta, val=val)
-        return val
+                return Failure(BadSpecValue("Expected value to match regex, it didn't", spec=spec, meta=meta, val=val))
+        return Success(val)
 
 @register
 class deprecated_key(Validator):
@@ -271,10 +295,11 @@ class deprecated_key(Validator):
         self.key = key
         self.reason = reason
 
-    def validate(self, meta, val):
+    def try_validate(self, meta, val):
         """Complain if the key is in val"""
         if val and self.key in val:
-            raise DeprecatedKey(key=self.key, reason=self.reason, meta=meta)
+            return Failure(DeprecatedKey(key=self.key, reason=self.reason, meta=meta))
+        return Success(None)
 
 @register
 class choice(Validator):
@@ -287,9 +312,9 @@ class choice(Validator):
     def setup(self, *choices):
         self.choices = choices
 
-    def validate(self, meta, val):
+    def try_validate(self, meta, val):
         """Complain if the key is not one of the correct choices"""
         if val not in self.choices:
-            raise BadSpecValue("Expected the value to be one of the valid choices", got=val, choices=self.choices, meta=meta)
-        return val
+            return Failure(BadSpecValue("Expected the value to be one of the valid choices", got=val, choices=self.choices, meta=meta))
+        return Success(val)
 
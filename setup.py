@@ -9,7 +9,6 @@ setup(
 
      , install_requires =
        [ 'delfick_error>=1.6'
-       , "namedlist"
        ]
 
     , extras_require =
@@ -18,6 +17,7 @@ setup(
         , "mock"
         , "noseOfYeti"
         , 'delfick_error>=1.7.8'
+        , "namedlist"
         ]
       }
 
@@ -0,0 +1,59 @@
+"""
+Coroutines for tests/test_asynchronous.py
+
+These are kept out of the test module because they need python3.5 or above
+"""
+from input_algorithms.validators import Validator
+from input_algorithms.errors import BadSpecValue
+from input_algorithms.results import Success, Failure
+
+import asyncio
+
+class waits_for(Validator):
+    """Set our event and wait for the other one before saying the value is fine"""
+    def setup(self, mine, other):
+        self.mine = mine
+        self.other = other
+
+    async def validate(self, meta, val):
+        self.mine.set()
+        await asyncio.wait_for(self.other.wait(), timeout=1)
+        return val
+
+class no_fours(Validator):
+    async def try_validate(self, meta, val):
+        await asyncio.sleep(0)
+        if val == 4:
+            return Failure(BadSpecValue("No fours", meta=meta))
+        return Success(val)
+
+class no_fives(Validator):
+    async def validate(self, meta, val):
+        await asyncio.sleep(0)
+        if val == 5:
+            raise BadSpecValue("No fives", meta=meta)
+        return val
+
+class no_four_things(Validator):
+    """Complain about objects with an ``x`` of 4"""
+    async def validate(self, meta, val):
+        await asyncio.sleep(0)
+        if val.x == 4:
+            raise BadSpecValue("No four things", meta=meta)
+        return val
+
+async def count_ticks(awaitable):
+    """Return what ``awaitable`` resolves to and how many times another task ran while we waited"""
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticker = asyncio.ensure_future(tick())
+    try:
+        return await awaitable, ticks
+    finally:
+        ticker.cancel()
@@ -0,0 +1,220 @@
+# coding: spec
+
+from input_algorithms.errors import BadSpecValue, BadDirectory, BadFilename
+from input_algorithms.many_item_spec import many_item_formatted_spec
+from input_algorithms.spec_base import NotSpecified
+from input_algorithms import spec_base as sb
+from input_algorithms.dictobj import dictobj
+from input_algorithms.meta import Meta, Run
+
+from tests.helpers import TestCase
+
+from noseOfYeti.tokeniser.support import noy_sup_setUp, noy_sup_tearDown
+from nose.plugins.skip import SkipTest
+import sys
+import os
+
+if sys.version_info < (3, 5):
+    raise SkipTest("normalise_async needs python3.5 or above")
+
+from tests.async_helpers import waits_for, no_fours, no_fives, no_four_things, count_ticks
+from input_algorithms import asynchronous
+
+import asyncio
+import mock
+
+describe TestCase, "normalise_async":
+    before_each:
+        self.meta = Meta({}, [])
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    after_each:
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def run_async(self, awaitable):
+        return self.loop.run_until_complete(awaitable)
+
+    it "normalises sync specs in place without tasks":
+        spec = sb.set_options(one=sb.listof(sb.integer_spec()), two=sb.dictof(sb.string_spec(), sb.string_spec()))
+
+        with mock.patch.object(asyncio, "gather") as gather:
+            with mock.patch.object(asynchronous, "try_normalise", side_effect=asynchronous.try_normalise) as try_normalise:
+                self.assertEqual(self.run_async(spec.normalise_async(self.meta, {"one": 1, "two": {"a": "b"}})), dict(one=[1], two={"a": "b"}))
+        self.assertEqual(gather.mock_calls, [])
+        self.assertEqual(len(try_normalise.mock_calls), 1)
+
+        with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[BadSpecValue(meta=self.meta.at("one"), _errors=[BadSpecValue("Expected an integer", meta=self.meta.at("one").indexed_at(0), got=str)])]):
+            self.run_async(spec.normalise_async(self.meta, {"one": "a"}))
+
+    it "works with objects that only have a normalise method":
+        spec = mock.Mock(name="spec", spec_set=["normalise"])
+        spec.normalise.return_value = 2
+        self.assertEqual(self.run_async(sb.listof(spec).normalise_async(self.meta, [1])), [2])
+
+    it "uses a normalise that is set on a spec instance":
+        patched = sb.directory_spec()
+        patched.normalise = mock.Mock(name="normalise", return_value="patched")
+        self.assertEqual(self.run_async(sb.listof(patched).normalise_async(self.meta, ["/nope"])), ["patched"])
+
+    it "checks paths in a thread":
+        with self.a_temp_dir() as directory:
+            with self.a_temp_file() as filename:
+                spec = sb.dictof(sb.string_spec(), sb.directory_spec())
+
+                with mock.patch.object(asynchronous, "run_in_thread", side_effect=asynchronous.run_in_thread) as run_in_thread:
+                    self.assertEqual(self.run_async(spec.normalise_async(self.meta, {"a": directory})), {"a": directory})
+                self.assertEqual(len(run_in_thread.mock_calls), 1)
+
+                self.assertEqual(self.run_async(sb.filename_spec().normalise_async(self.meta, filename)), filename)
+                self.assertIs(self.run_async(sb.filename_spec().normalise_async(self.meta, NotSpecified)), NotSpecified)
+
+                with self.fuzzyAssertRaisesError(BadDirectory, "Got something that exists but isn't a directory", meta=self.meta, directory=filename):
+                    self.run_async(sb.directory_spec().normalise_async(self.meta, filename))
+
+                with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[BadFilename("Got something that exists but isn't a file", meta=self.meta.indexed_at(1), filename=directory)]):
+                    self.run_async(sb.listof(sb.filename_spec()).normalise_async(self.meta, [filename, directory]))
+
+    it "stats the paths in a list together":
+        with self.a_temp_dir() as directory:
+            spec = sb.listof(sb.directory_spec())
+            with mock.patch.object(asyncio, "gather", side_effect=asyncio.gather) as gather:
+                self.assertEqual(self.run_async(spec.normalise_async(self.meta, [directory, directory, "/"])), [directory, directory, "/"])
+            self.assertEqual(len(gather.mock_calls), 1)
+            self.assertEqual(len(gather.mock_calls[0][1]), 2)
+
+    it "only awaits validators before the error budget is used up":
+        meta = Meta({}, [], run=Run(max_errors=1))
+        spec = sb.listof(no_fours())
+        with mock.patch.object(asynchronous, "validate", side_effect=asynchronous.validate) as validate:
+            error = self.run_async(spec.try_normalise_async(meta, [1, 4, 4, 4])).error
+        self.assertEqual([call[1][2] for call in validate.mock_calls], [1, 4])
+        self.assertEqual(len(error.errors), 1)
+
+    it "gives the same results and errors as normalise":
+        with self.a_temp_dir() as directory:
+            missing = os.path.join(directory, "missing")
+            spec = sb.set_options(
+                  paths = sb.listof(sb.directory_spec())
+                , named = sb.dictof(sb.string_spec(), sb.directory_spec(), nested=True)
+                , either = sb.or_spec(sb.integer_spec(), sb.directory_spec())
+                , both = sb.and_spec(sb.string_spec(), sb.directory_spec())
+                , tup = sb.tupleof(sb.filename_spec(may_not_exist=True))
+                , dflt = sb.defaulted(sb.directory_spec(), "nope")
+                )
+
+            for val in (
+                  {"paths": [directory], "named": {"a": directory, "b": {"c": directory}}, "either": directory, "both": directory, "tup": missing, "dflt": directory}
+                , {"paths": [directory, missing], "named": {"a": missing, "b": {"c": 1}}, "either": missing, "both": 1, "tup": [missing, directory]}
+                ):
+                for max_errors in (None, 1, 2):
+                    expected = spec.try_normalise(Meta({}, [], run=Run(max_errors=max_errors)), val)
+                    result = self.run_async(spec.try_normalise_async(Meta({}, [], run=Run(max_errors=max_errors)), val))
+                    self.assertEqual(result.ok, expected.ok)
+                    if expected.ok:
+                        self.assertEqual(result.value, expected.value)
+                    else:
+                        self.assertEqual(sorted(result.error.errors), sorted(expected.error.errors))
+
+    it "awaits validators that are coroutines together":
+        first = asyncio.Event()
+        second = asyncio.Event()
+        spec = sb.create_spec(dict, waits_for(first, second), waits_for(second, first), one=sb.integer_spec())
+        self.assertEqual(self.run_async(spec.normalise_async(self.meta, {"one": 1})), {"one": 1})
+
+        spec = sb.set_options(one=waits_for(first, second), two=waits_for(second, first))
+        first.clear()
+        second.clear()
+        self.assertEqual(self.run_async(spec.normalise_async(self.meta, {"one": 1, "two": 2})), {"one": 1, "two": 2})
+
+    it "turns errors from validators into failures":
+        spec = sb.listof(sb.and_spec(sb.integer_spec(), no_fours(), no_fives()))
+        self.assertEqual(self.run_async(spec.normalise_async(self.meta, [1, 2, NotSpecified])), [1, 2, NotSpecified])
+
+        error = self.run_async(spec.try_normalise_async(self.meta, [4, 5, 6])).error
+        self.assertEqual([e.errors[0].message for e in error.errors], ["No fours", "No fives"])
+        self.assertEqual([e.kwargs["meta"] for e in error.errors], [self.meta.indexed_at(0), self.meta.indexed_at(1)])
+
+    it "stops when the error budget is used up":
+        meta = Meta({}, [], run=Run(max_errors=2))
+        error = self.run_async(sb.listof(no_fours()).try_normalise_async(meta, [4, 4, 4, 4])).error
+        self.assertEqual(len(error.errors), 2)
+        self.assertEqual(error.kwargs["total_errors"], 2)
+
+    it "normalises many_item_formatted_spec":
+        class thing_spec(many_item_formatted_spec):
+            specs = [sb.integer_spec(), no_fives()]
+            optional_specs = [sb.directory_spec()]
+
+            def create_result(self, one, two, three, meta, val, dividers):
+                return (one, two, three)
+
+        spec = thing_spec()
+        with self.a_temp_dir() as directory:
+            self.assertEqual(self.run_async(spec.normalise_async(self.meta, [1, 2, directory])), (1, 2, directory))
+            self.assertEqual(self.run_async(spec.normalise_async(self.meta, "1:2")), (1, "2", NotSpecified))
+
+        with self.fuzzyAssertRaisesError(BadSpecValue, "No fives"):
+            self.run_async(spec.normalise_async(self.meta, [1, 5]))
+
+        with self.fuzzyAssertRaisesError(BadSpecValue, "The value is a list with the wrong number of items"):
+            self.run_async(spec.normalise_async(self.meta, [1]))
+
+    it "normalises a FieldSpec":
+        class Thing(dictobj.Spec):
+            path = dictobj.Field(sb.directory_spec)
+            amount = dictobj.Field(no_fives)
+
+        with self.a_temp_dir() as directory:
+            thing = self.run_async(Thing.FieldSpec().normalise_async(self.meta, {"path": directory, "amount": 1}))
+            self.assertEqual((thing.path, thing.amount), (directory, 1))
+
+        with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[BadSpecValue("No fives", meta=self.meta.at("amount"))]):
+            self.run_async(Thing.FieldSpec().normalise_async(self.meta, {"path": "/", "amount": 5}))
+
+    it "normalises subclasses that change how values are normalised in place":
+        class my_listof(sb.listof):
+            def try_normalise_filled(self, meta, val):
+                return sb.Success(["mine"])
+
+        self.assertEqual(self.run_async(my_listof(sb.directory_spec()).normalise_async(self.meta, ["/"])), ["mine"])
+
+    it "lets the event loop run while it normalises a big list":
+        val = ["a"] * 20000
+        result, ticks = self.run_async(count_ticks(sb.listof(sb.string_spec()).normalise_async(self.meta, val)))
+        self.assertEqual(result, val)
+        self.assertGreater(ticks, 10)
+
+    it "only normalises the options of an or_spec that it needs to":
+        called = []
+
+        class records(sb.Spec):
+            def normalise_filled(self, meta, val):
+                called.append(val)
+                return val
+
+        spec = sb.listof(sb.or_spec(no_fours(), records()))
+        self.assertEqual(self.run_async(spec.normalise_async(self.meta, [1, 4])), [1, 4])
+        self.assertEqual(called, [4])
+
+    it "gives validators the value they are given each time":
+        class Thing(object):
+            def __init__(self, x):
+                self.x = x
+
+        spec = sb.or_spec(
+              sb.and_spec(sb.container_spec(Thing, sb.integer_spec()), no_four_things())
+            , sb.and_spec(sb.container_spec(Thing, sb.always_same_spec(5)), no_four_things())
+            )
+        self.assertEqual(self.run_async(spec.normalise_async(self.meta, 4)).x, 5)
+
+    it "awaits validators used by specs it normalises in a thread":
+        class my_listof(sb.listof):
+            pass
+
+        spec = my_listof(sb.and_spec(sb.integer_spec(), no_fours()))
+        self.assertEqual(self.run_async(spec.normalise_async(self.meta, [1, 2])), [1, 2])
+
+        error = self.run_async(spec.try_normalise_async(self.meta, [1, 4])).error
+        self.assertEqual(error.errors[0].errors[0].message, "No fours")
@@ -0,0 +1,171 @@
+# coding: spec
+
+from input_algorithms.errors import BadSpecValue, BatchError
+from input_algorithms.batch import BatchNormaliser
+from input_algorithms.dictobj import dictobj
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta
+
+from tests.helpers import TestCase
+
+from noseOfYeti.tokeniser.support import noy_sup_setUp
+from nose.plugins.skip import SkipTest
+import multiprocessing
+import time
+import os
+
+class Tenant(dictobj.Spec):
+    name = dictobj.Field(sb.string_spec, wrapper=sb.required)
+    hosts = dictobj.Field(sb.string_spec, wrapper=sb.listof)
+    port = dictobj.Field(sb.integer_spec, default=80)
+
+class Pid(sb.Spec):
+    def normalise_filled(self, meta, val):
+        if val == "explode":
+            raise ValueError("Exploded")
+        if val == "die":
+            os._exit(1)
+        return (os.getpid(), val)
+
+def make_broken_spec():
+    raise ValueError("Can't make it")
+
+def tenants(number):
+    return [{"name": "tenant{0}".format(i), "hosts": ["h{0}".format(i)], "port": 8000 + i} for i in range(number)]
+
+describe TestCase, "BatchNormaliser":
+    it "normalises documents in worker processes in order":
+        with BatchNormaliser(Pid, processes=2, chunksize=2) as batch:
+            results = list(batch.normalise(["d{0}".format(i) for i in range(50)]))
+            self.assertEqual([result.value[1] for result in results], ["d{0}".format(i) for i in range(50)])
+            self.assertNotIn(os.getpid(), set(result.value[0] for result in results))
+
+            # The workers stay around for the next batch
+            pool = batch.pool
+            self.assertEqual(list(batch.normalise(["again"]))[0].value[1], "again")
+            self.assertIs(batch.pool, pool)
+        self.assertIs(batch.pool, None)
+
+    it "returns failures rather than stopping":
+        documents = tenants(5)
+        documents[1]["port"] = "nope"
+        del documents[3]["name"]
+
+        with BatchNormaliser(Tenant.FieldSpec, processes=2) as batch:
+            results = list(batch.normalise(documents))
+
+        self.assertEqual([result.ok for result in results], [True, False, True, False, True])
+        self.assertEqual([result.value.name for result in results if result.ok], ["tenant0", "tenant2", "tenant4"])
+        self.assertEqual(results[1].error, BadSpecValue(meta=Meta(documents[1], []), _errors=[BadSpecValue("Expected an integer", meta=Meta(documents[1], []).at("port"), got=str)]))
+        self.assertEqual(results[3].error.errors, [BadSpecValue("Expected a value but got none", meta=Meta(documents[3], []).at("name"))])
+
+    it "returns errors that aren't BadSpec as failures":
+        with BatchNormaliser(Pid, processes=2) as batch:
+            results = list(batch.normalise(["one", "explode", "three"]))
+        self.assertEqual([result.ok for result in results], [True, False, True])
+        self.assertEqual(results[1].error, BatchError("Failed to normalise the document", error=repr(ValueError("Exploded"))))
+
+    it "returns a failure for every document if the spec can't be made":
+        for processes in (1, 2):
+            with BatchNormaliser(make_broken_spec, processes=processes) as batch:
+                results = list(batch.normalise(["one", "two"]))
+            self.assertEqual([result.error for result in results], [BatchError("Failed to make the spec", error=repr(ValueError("Can't make it")))] * 2)
+
+    it "normalises in this process with one process":
+        made = []
+        def make_spec():
+            made.append(True)
+            return Pid()
+
+        with BatchNormaliser(make_spec, processes=1) as batch:
+            results = list(batch.normalise(["one", "two"])) + list(batch.normalise(["three"]))
+        self.assertEqual([result.value for result in results], [(os.getpid(), "one"), (os.getpid(), "two"), (os.getpid(), "three")])
+        self.assertEqual(made, [True])
+        self.assertIs(batch.pool, None)
+
+    it "returns failures rather than hanging if a worker dies":
+        with BatchNormaliser(Pid, processes=2, chunksize=1) as batch:
+            results = list(batch.normalise(["one", "die", "three"]))
+            self.assertEqual(len(results), 3)
+            self.assertEqual(results[1].error.message, "A worker process died before the document was normalised")
+            for result in results:
+                if not result.ok:
+                    assert isinstance(result.error, BatchError)
+
+            # And a new pool is used for the next batch
+            self.assertEqual([result.value[1] for result in batch.normalise(["four", "five"])], ["four", "five"])
+
+    it "uses everything for the meta if it's given":
+        with BatchNormaliser(Tenant.FieldSpec, processes=2, everything={"shared": True}) as batch:
+            result = list(batch.normalise([{"port": 1}]))[0]
+        self.assertEqual(result.error.errors[0].kwargs["meta"].everything, {"shared": True})
+
+    describe "throughput":
+        it "normalises a big batch in order":
+            documents = tenants(2000)
+            spec = Tenant.FieldSpec()
+            expected = [spec.normalise(Meta(document, []), document) for document in documents]
+
+            with BatchNormaliser(Tenant.FieldSpec, processes=2, chunksize=64) as batch:
+                self.assertEqual([result.unwrap() for result in batch.normalise(iter(documents))], expected)
+
+        it "is faster than a serial loop with a warm pool":
+            # This is a benchmark, benchmarks/batch_normalise.py prints the figures
+            if not os.environ.get("INPUT_ALGORITHMS_BENCHMARKS"):
+                raise SkipTest("Set INPUT_ALGORITHMS_BENCHMARKS to run benchmarks")
+            if multiprocessing.cpu_count() < 2:
+                raise SkipTest("Needs more than one CPU")
+
+            documents = tenants(20000)
+
+            start = time.time()
+            spec = Tenant.FieldSpec()
+            expected = [spec.normalise(Meta(document, []), document) for document in documents]
+            serial = time.time() - start
+
+            with BatchNormaliser(Tenant.FieldSpec, processes=2, chunksize=64) as batch:
+                # Warm up the workers
+                list(batch.normalise(documents[:10]))
+
+                start = time.time()
+                results = [result.unwrap() for result in batch.normalise(documents)]
+                batched = time.time() - start
+
+            self.assertEqual(results, expected)
+            self.assertLess(batched, serial)
+
+    describe "with threads":
+        it "normalises documents in threads in order":
+            made = []
+            def make_spec():
+                made.append(True)
+                return Tenant.FieldSpec()
+
+            documents = tenants(200)
+            documents[7]["port"] = "nope"
+
+            with BatchNormaliser(make_spec, threads=4, chunksize=8) as batch:
+                results = list(batch.normalise(iter(documents)))
+                self.assertIs(batch.pool, None)
+
+            expected = list(BatchNormaliser(Tenant.FieldSpec, processes=1).normalise(documents))
+            self.assertEqual([result.ok for result in results], [result.ok for result in expected])
+            self.assertEqual([result.value for result in results if result.ok], [result.value for result in expected if result.ok])
+            self.assertEqual(results[7].error, expected[7].error)
+            self.assertEqual(made, [True])
+
+        it "freezes the spec so the threads can share it":
+            with BatchNormaliser(lambda: sb.listof(sb.string_spec()), threads=2) as batch:
+                self.assertEqual([result.value for result in batch.normalise([["a"], "b"])], [["a"], ["b"]])
+                assert batch.local[0].is_frozen
+
+        it "returns failures rather than stopping":
+            with BatchNormaliser(Pid, threads=2, chunksize=1) as batch:
+                results = list(batch.normalise(["one", "explode", "three"]))
+            self.assertEqual([result.ok for result in results], [True, False, True])
+            self.assertEqual(results[1].error, BatchError("Failed to normalise the document", error=repr(ValueError("Exploded"))))
+            self.assertEqual(set(result.value[0] for result in results if result.ok), set([os.getpid()]))
+
+            with BatchNormaliser(make_broken_spec, threads=2) as batch:
+                results = list(batch.normalise(["one", "two"]))
+            self.assertEqual([result.error for result in results], [BatchError("Failed to make the spec", error=repr(ValueError("Can't make it")))] * 2)
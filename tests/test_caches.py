@@ -0,0 +1,195 @@
+# coding: spec
+
+from input_algorithms.caches import GenerationDict, FormattedCache, StatCache
+from input_algorithms.meta import Run
+
+from noseOfYeti.tokeniser.support import noy_sup_setUp
+from tests.helpers import TestCase
+import weakref
+import mock
+import gc
+import os
+
+describe TestCase, "GenerationDict":
+    it "bumps the generation whenever it changes":
+        options = GenerationDict(one=1)
+        self.assertEqual(options.generation, 0)
+
+        changes = [
+              lambda: options.__setitem__("two", 2)
+            , lambda: options.update(three=3)
+            , lambda: options.setdefault("four", 4)
+            , lambda: options.pop("four")
+            , lambda: options.__delitem__("three")
+            , lambda: options.popitem()
+            , lambda: options.clear()
+            , lambda: options.bump()
+            ]
+
+        for index, change in enumerate(changes):
+            change()
+            self.assertEqual(options.generation, index + 1)
+
+    it "doesn't bump when nothing changes":
+        options = GenerationDict(one=1)
+        options.setdefault("one", 2)
+        options.get("one")
+        self.assertEqual(options.generation, 0)
+
+describe TestCase, "FormattedCache":
+    before_each:
+        self.made = []
+        made = self.made
+
+        class Formatter(object):
+            def __init__(s, options, path, value):
+                s.options = options
+                s.value = value
+
+            def format(s):
+                made.append(s.value)
+                return s.value.format(**s.options)
+
+        self.Formatter = Formatter
+        self.everything = GenerationDict(root="/opt")
+
+    def format(self, cache, template, key_names, path="path"):
+        options = dict(self.everything, **key_names)
+        return cache.format(self.Formatter, options, path, template, key_names, self.everything)
+
+    it "remembers values and counts hits and misses":
+        cache = FormattedCache()
+        self.assertEqual(self.format(cache, "{root}/a", {"_key_name_0": "one"}), "/opt/a")
+        self.assertEqual(self.format(cache, "{root}/a", {"_key_name_0": "two"}), "/opt/a")
+        self.assertEqual(self.made, ["{root}/a"])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    it "uses the key names the template refers to":
+        cache = FormattedCache()
+        self.assertEqual(self.format(cache, "{root}/{_key_name_0}", {"_key_name_0": "one"}), "/opt/one")
+        self.assertEqual(self.format(cache, "{root}/{_key_name_0}", {"_key_name_0": "two"}), "/opt/two")
+        self.assertEqual(self.format(cache, "{root}/{_key_name_0}", {"_key_name_0": "one", "_key_name_1": "other"}), "/opt/one")
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    it "remembers values for each path":
+        class Formatter(self.Formatter):
+            def __init__(s, options, path, value):
+                super(Formatter, s).__init__(options, path, "{0}:{1}".format(path, value))
+        self.Formatter = Formatter
+
+        cache = FormattedCache()
+        self.assertEqual(self.format(cache, "{root}/a", {}, path="one"), "one:/opt/a")
+        self.assertEqual(self.format(cache, "{root}/a", {}, path="two"), "two:/opt/a")
+        self.assertEqual(self.format(cache, "{root}/a", {}, path="one"), "one:/opt/a")
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    it "makes the value again when the configuration changes":
+        cache = FormattedCache()
+        self.assertEqual(self.format(cache, "{root}/a", {}), "/opt/a")
+        self.everything["root"] = "/usr"
+        self.assertEqual(self.format(cache, "{root}/a", {}), "/usr/a")
+        self.assertEqual(cache.misses, 2)
+
+    it "doesn't cache configuration without a generation":
+        cache = FormattedCache()
+        self.everything = dict(self.everything)
+        self.format(cache, "{root}/a", {})
+        self.format(cache, "{root}/a", {})
+        self.assertEqual(len(self.made), 2)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 0, 0))
+
+    it "remembers values for configuration without a generation for the rest of the run":
+        cache = FormattedCache()
+        self.everything = dict(self.everything)
+        first = Run()
+        for run in (first, first, Run()):
+            options = dict(self.everything)
+            cache.format(self.Formatter, options, "path", "{root}/a", {}, self.everything, run=run)
+
+        self.assertEqual(len(self.made), 2)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 0))
+
+    it "doesn't keep the configuration alive":
+        cache = FormattedCache()
+        self.format(cache, "{root}/a", {})
+        everything = weakref.ref(self.everything)
+        del self.everything
+        gc.collect()
+        self.assertIs(everything(), None)
+        self.assertEqual(len(cache), 1)
+
+    it "forgets the least recently used values":
+        cache = FormattedCache(size=2)
+        self.format(cache, "{root}/a", {})
+        self.format(cache, "{root}/b", {})
+        self.format(cache, "{root}/a", {})
+        self.format(cache, "{root}/c", {})
+        self.assertEqual(len(cache), 2)
+
+        del self.made[:]
+        self.format(cache, "{root}/a", {})
+        self.format(cache, "{root}/b", {})
+        self.assertEqual(self.made, ["{root}/b"])
+
+    it "can be cleared":
+        cache = FormattedCache()
+        self.format(cache, "{root}/a", {})
+        cache.clear()
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 0, 0))
+
+describe TestCase, "StatCache":
+    it "remembers stats and counts what it saved":
+        cache = StatCache()
+        with self.a_temp_file() as filename:
+            with mock.patch("os.stat", side_effect=os.stat) as fake_stat:
+                first = cache.stat(filename)
+                self.assertIs(cache.stat(filename), first)
+            fake_stat.assert_called_once_with(filename)
+            self.assertEqual((cache.stats, cache.hits, cache.saved), (1, 1, 3))
+
+        with self.a_temp_file(removed=True) as filename:
+            self.assertIs(cache.stat(filename), None)
+            self.assertIs(cache.stat(filename), None)
+            self.assertEqual((cache.stats, cache.hits, cache.saved), (2, 2, 4))
+
+    it "forgets stats after the ttl":
+        cache = StatCache(ttl=10)
+        with self.a_temp_file() as filename:
+            with mock.patch("time.time", return_value=100):
+                cache.stat(filename)
+            with mock.patch("time.time", return_value=109):
+                cache.stat(filename)
+            self.assertEqual(cache.stats, 1)
+            with mock.patch("time.time", return_value=111):
+                cache.stat(filename)
+            self.assertEqual(cache.stats, 2)
+
+    it "forgets the least recently used paths past it's size":
+        cache = StatCache(size=2)
+        with self.a_temp_dir() as directory:
+            one, two, three = [os.path.join(directory, name) for name in ("one", "two", "three")]
+            cache.stat(one)
+            cache.stat(two)
+            cache.stat(one)
+            cache.stat(three)
+            self.assertEqual(list(cache.results), [one, three])
+
+            cache.stat(two)
+            self.assertEqual((cache.stats, cache.hits, len(cache)), (4, 1, 2))
+
+        self.assertIs(StatCache.for_run().size, None)
+
+    it "asks a shared cache for paths it doesn't know":
+        shared = StatCache()
+        cache = StatCache()
+        with self.a_temp_dir() as directory:
+            result = cache.stat(directory, shared)
+            self.assertIs(StatCache().stat(directory, shared), result)
+        self.assertEqual((cache.stats, shared.stats, shared.hits), (0, 1, 1))
+
+    it "can be cleared":
+        cache = StatCache()
+        with self.a_temp_dir() as directory:
+            cache.stat(directory)
+        cache.clear()
+        self.assertEqual((cache.stats, cache.hits, cache.saved, len(cache)), (0, 0, 0, 0))
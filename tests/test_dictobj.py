@@ -0,0 +1,318 @@
+# coding: spec
+
+from input_algorithms.dictobj import dictobj
+from input_algorithms import spec_base as sb
+
+from tests.helpers import TestCase
+
+import sys
+
+describe TestCase, "dictobj":
+    describe "making instances":
+        it "takes fields as positional and keyword arguments":
+            class Thing(dictobj):
+                fields = ["one", "two"]
+
+            for thing in (Thing(1, 2), Thing(1, two=2), Thing(two=2, one=1)):
+                self.assertEqual(thing, {"one": 1, "two": 2})
+                self.assertEqual((thing.one, thing.two), (1, 2))
+                self.assertEqual(list(thing.keys()), ["one", "two"])
+
+        it "puts fields with defaults at the end":
+            class Thing(dictobj):
+                fields = [("three", 3), "one", ("four", None), "two"]
+
+            thing = Thing(1, 2)
+            self.assertEqual(thing, {"one": 1, "two": 2, "three": 3, "four": None})
+            self.assertEqual(list(thing.keys()), ["one", "two", "three", "four"])
+            self.assertEqual(Thing(1, 2, 5, 6).as_dict(), {"one": 1, "two": 2, "three": 5, "four": 6})
+
+        it "calls callable defaults for each instance that doesn't have that field":
+            called = []
+            def make():
+                called.append(1)
+                return []
+
+            class Thing(dictobj):
+                fields = ["one", ("many", make)]
+
+            first = Thing(1)
+            second = Thing(2)
+            self.assertEqual(first.many, [])
+            self.assertIsNot(first.many, second.many)
+            self.assertEqual(Thing(3, many=[1]).many, [1])
+            self.assertEqual(called, [1, 1])
+
+        it "works with a dictionary of fields to help messages":
+            class Thing(dictobj):
+                fields = {"one": "the first", ("two", 2): "the second"}
+
+            self.assertEqual(Thing(one=1), {"one": 1, "two": 2})
+
+        it "complains about missing and unexpected arguments":
+            class Thing(dictobj):
+                fields = ["one", ("two", 2)]
+
+            with self.assertRaisesRegexp(TypeError, "missing 1 required positional argument: 'one'"):
+                Thing()
+            with self.assertRaisesRegexp(TypeError, "unexpected keyword argument 'three'"):
+                Thing(1, three=3)
+            with self.assertRaisesRegexp(TypeError, "takes from 2 to 3 positional arguments but 4 were given"):
+                Thing(1, 2, 3)
+
+        it "complains about fields that can't be arguments when an instance is made":
+            for fields, message in (
+                  (["one", "one"], "duplicate field name: 'one'")
+                , (["_one"], "cannot start with an underscore: '_one'")
+                , (["for"], "cannot be a keyword: 'for'")
+                , (["one two"], "must be valid identifiers: 'one two'")
+                , ([("", 1)], "must be valid identifiers: ''")
+                ):
+                class Thing(dictobj):
+                    pass
+                Thing.fields = fields
+
+                with self.assertRaisesRegexp(ValueError, message):
+                    Thing()
+
+        it "allows fields with the same name as the arguments would use":
+            class Thing(dictobj):
+                fields = ["self", "kls", ("made", 1)]
+
+            self.assertEqual(Thing(1, 2), {"self": 1, "kls": 2, "made": 1})
+
+        it "sets fields that are also on the class as attributes":
+            class Thing(dictobj):
+                fields = ["one", "two"]
+                one = "class"
+
+            thing = Thing(1, 2)
+            self.assertEqual(thing.one, 1)
+            self.assertEqual(thing["one"], 1)
+            self.assertEqual(thing, {"one": 1, "two": 2})
+
+        it "only generates the __init__ again if fields is replaced":
+            class Thing(dictobj):
+                fields = ["one"]
+
+            Thing(1)
+            made = Thing._made_init
+            Thing(2)
+            self.assertIs(Thing._made_init, made)
+
+            Thing.fields = ["one", "two"]
+            self.assertEqual(Thing(1, 2), {"one": 1, "two": 2})
+            self.assertIsNot(Thing._made_init, made)
+
+        it "uses the fields of the subclass":
+            class Thing(dictobj):
+                fields = ["one"]
+
+            class Other(Thing):
+                fields = ["one", "two"]
+
+            class Another(Other):
+                def __init__(self, *args, **kwargs):
+                    super(Another, self).__init__(*args, **kwargs)
+                    self.three = 3
+
+            self.assertEqual(Thing(1), {"one": 1})
+            self.assertEqual(Other(1, 2), {"one": 1, "two": 2})
+            self.assertEqual(Another(1, two=2), {"one": 1, "two": 2, "three": 3})
+
+        it "uses setup if the class has it's own":
+            called = []
+            class Thing(dictobj):
+                fields = ["one"]
+
+                def setup(self, *args, **kwargs):
+                    called.append((args, kwargs))
+                    super(Thing, self).setup(*args, **kwargs)
+
+            self.assertEqual(Thing(1), {"one": 1})
+            self.assertEqual(Thing(one=2), {"one": 2})
+            self.assertEqual(called, [((1, ), {}), ((), {"one": 2})])
+
+        it "works with dictobj.Spec":
+            class Thing(dictobj.Spec):
+                one = dictobj.Field(sb.string_spec)
+                two = dictobj.Field(sb.integer_spec, default=2)
+
+            thing = Thing(one="1", two=3)
+            self.assertEqual(thing, {"one": "1", "two": 3})
+            self.assertEqual(thing.one, "1")
+            self.assertEqual(Thing.FieldSpec().empty_normalise(one="1"), Thing(one="1", two=2))
+
+    describe "attributes":
+        it "gets fields as attributes and items":
+            class Thing(dictobj):
+                fields = ["one", "two"]
+
+            thing = Thing(1, 2)
+            self.assertEqual((thing.one, thing["two"]), (1, 2))
+            self.assertEqual(thing["clone"], thing.clone)
+
+            with self.assertRaises(AttributeError):
+                thing.three
+            with self.assertRaises(AttributeError):
+                thing["three"]
+
+        it "sets attributes as items":
+            class Thing(dictobj):
+                fields = ["one"]
+
+            thing = Thing(1)
+            thing.two = 2
+            thing["three"] = 3
+            self.assertEqual(thing, {"one": 1, "two": 2, "three": 3})
+            self.assertEqual((thing.two, thing.three), (2, 3))
+
+            del thing.two
+            self.assertEqual(thing, {"one": 1, "three": 3})
+
+        it "keeps names that are also on the class as attributes on the instance":
+            class Thing(dictobj):
+                fields = ["one", "as_dict"]
+                one = "class"
+
+                def as_dict(self):
+                    return "as_dict"
+
+            thing = Thing(1, 2)
+            self.assertEqual(thing, {"one": 1, "as_dict": 2})
+            self.assertEqual((thing.one, thing["one"], thing.as_dict, thing["as_dict"]), (1, 1, 2, 2))
+            self.assertEqual(Thing.one, "class")
+
+            thing.one = 3
+            self.assertEqual((thing.one, thing["one"], dict.__getitem__(thing, "one")), (3, 3, 3))
+
+            other = Thing(4, 5)
+            self.assertEqual((other.one, other.as_dict), (4, 5))
+
+        it "finds names from the parent classes":
+            class Mixin(object):
+                def one(self):
+                    return "one"
+
+            class Thing(dictobj, Mixin):
+                fields = ["two"]
+
+            thing = Thing(2)
+            thing["one"] = 1
+            self.assertEqual((thing.one, thing["one"]), (1, 1))
+            self.assertEqual(Mixin.one(thing), "one")
+
+        it "finds attributes that are added to the class after it is made":
+            class Thing(dictobj):
+                fields = ["one"]
+
+            thing = Thing(1)
+            Thing.extra = 5
+            thing["extra"] = 9
+            self.assertEqual((thing.extra, thing["extra"], Thing.extra), (9, 9, 5))
+
+            thing.extra = 10
+            self.assertEqual((thing.extra, thing["extra"], dict.__getitem__(thing, "extra")), (10, 10, 10))
+
+        it "reads Field attributes on a dictobj.Spec from the dictionary":
+            class Thing(dictobj.Spec):
+                one = dictobj.Field(sb.string_spec)
+
+            assert "one" not in Thing._class_attributes
+            thing = Thing.FieldSpec().empty_normalise(one="1")
+            self.assertEqual((thing.one, thing["one"]), ("1", "1"))
+
+            thing["one"] = "2"
+            self.assertEqual((thing.one, thing["one"]), ("2", "2"))
+            assert getattr(Thing.one, "is_input_algorithms_field", False)
+
+    describe "as_dict":
+        it "converts dictobjs inside lists, tuples and dicts":
+            class Thing(dictobj):
+                fields = ["one", ("two", None)]
+
+            thing = Thing([Thing(1)], two={"a": (Thing(2), 3)})
+            self.assertEqual(thing.as_dict(), {"one": [{"one": 1, "two": None}], "two": {"a": ({"one": 2, "two": None}, 3)}})
+            self.assertIs(type(thing.as_dict()["one"][0]), dict)
+            self.assertIs(type(thing.as_dict()["two"]["a"]), tuple)
+
+        it "leaves containers with nothing to convert as they are":
+            class Thing(dictobj):
+                fields = ["one", "two"]
+
+            one = [1, [2]]
+            two = {"a": (1, 2)}
+            result = Thing(one, two).as_dict()
+            self.assertIs(result["one"], one)
+            self.assertIs(result["two"], two)
+
+        it "converts an object once however many times it is in the tree":
+            called = []
+            class Other(object):
+                def as_dict(self, **kwargs):
+                    called.append(kwargs)
+                    return {"other": True}
+
+            class Thing(dictobj):
+                fields = ["one", ("two", None), ("three", None)]
+
+            other = Other()
+            shared = Thing(other)
+            result = Thing([shared, shared], two={"a": shared}, three=[other]).as_dict(blah=1)
+
+            self.assertIs(result["one"][0], result["one"][1])
+            self.assertIs(result["one"][0], result["two"]["a"])
+            self.assertIs(result["one"][0]["one"], result["three"][0])
+            self.assertEqual(result["three"], [{"other": True}])
+            self.assertEqual(called, [{"blah": 1}])
+
+        it "uses as_dict from subclasses that have their own":
+            class Thing(dictobj):
+                fields = ["one"]
+
+            class Special(Thing):
+                def as_dict(self, **kwargs):
+                    result = super(Special, self).as_dict(**kwargs)
+                    result["special"] = True
+                    return result
+
+            self.assertEqual(Special(1).as_dict(), {"one": 1, "special": True})
+            self.assertEqual(Thing([Special(Thing(2))]).as_dict(), {"one": [{"one": {"one": 2}, "special": True}]})
+
+        it "doesn't use a field called as_dict as the method":
+            class Thing(dictobj):
+                fields = ["one", ("as_dict", None)]
+
+            class Outer(dictobj):
+                fields = ["thing"]
+
+            self.assertEqual(Outer(Thing(1, 2)).as_dict(), {"thing": {"one": 1, "as_dict": 2}})
+
+        it "handles trees deeper than the recursion limit":
+            class Thing(dictobj):
+                fields = [("child", None)]
+
+            thing = Thing()
+            for _ in range(sys.getrecursionlimit() * 2):
+                thing = Thing([thing])
+
+            depth = 0
+            result = thing.as_dict()
+            while result["child"] is not None:
+                result = result["child"][0]
+                depth += 1
+            self.assertEqual(depth, sys.getrecursionlimit() * 2)
+
+        it "complains about cycles":
+            class Thing(dictobj):
+                fields = [("child", None)]
+
+            thing = Thing()
+            thing.child = {"a": [Thing(thing)]}
+            with self.assertRaisesRegexp(ValueError, "Found a cycle at a Thing while converting to a dictionary"):
+                thing.as_dict()
+
+            things = []
+            things.append(things)
+            with self.assertRaisesRegexp(ValueError, "Found a cycle at a list"):
+                Thing(things).as_dict()
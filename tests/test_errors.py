@@ -0,0 +1,54 @@
+# coding: spec
+
+from input_algorithms.errors import BadSpec, BadSpecValue
+from input_algorithms.meta import Meta
+
+from noseOfYeti.tokeniser.support import noy_sup_setUp
+from tests.helpers import TestCase
+import mock
+
+describe TestCase, "BadSpec":
+    it "holds onto what it's given":
+        meta = mock.Mock(name="meta")
+        error1 = mock.Mock(name="error1")
+        errors = [error1]
+        error = BadSpecValue("Bad things", meta=meta, _errors=errors)
+
+        self.assertEqual(error.message, "Bad things")
+        self.assertEqual(error.args, ("Bad things", ))
+        self.assertEqual(error.kwargs, {"meta": meta})
+        self.assertIs(error.errors, errors)
+        self.assertEqual(len(meta.mock_calls), 0)
+
+        self.assertEqual(BadSpec().errors, [])
+
+    it "doesn't look at meta until it's rendered":
+        everything = mock.Mock(name="everything")
+        everything.source_for.return_value = "somewhere"
+        meta = Meta(everything, []).at("one").at("two")
+
+        error = BadSpecValue("Bad things", meta=meta)
+        self.assertEqual(len(everything.source_for.mock_calls), 0)
+
+        self.assertEqual(str(error), '"Bad value. Bad things"\tmeta={source=somewhere, path=one.two}')
+        everything.source_for.assert_called_once_with("one.two")
+
+        # And it is remembered
+        str(error)
+        everything.source_for.assert_called_once_with("one.two")
+
+    it "only formats once for comparisons":
+        everything = mock.Mock(name="everything")
+        everything.source_for.return_value = "somewhere"
+        meta = Meta(everything, []).at("one")
+
+        error1 = BadSpecValue("Bad things", meta=meta)
+        error2 = BadSpecValue("Bad things", meta=meta)
+        error3 = BadSpecValue("Other things", meta=meta)
+
+        for _ in range(3):
+            self.assertEqual(error1, error2)
+            self.assertNotEqual(error1, error3)
+            self.assertEqual(sorted([error3, error1]), [error1, error3])
+
+        self.assertEqual(len(everything.source_for.mock_calls), 3)
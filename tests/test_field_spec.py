@@ -1,6 +1,6 @@
 # coding: spec
 
-from input_algorithms.field_spec import FieldSpec, Field, NullableField, FieldSpecMixin, FieldSpecMetakls
+from input_algorithms.field_spec import FieldSpec, Field, NullableField, FieldSpecMixin, FieldSpecMetakls, invalidate_cached_specs
 from input_algorithms.errors import BadSpec, ProgrammerError
 from input_algorithms import spec_base as sb
 from input_algorithms.dictobj import dictobj
@@ -8,8 +8,10 @@ from input_algorithms.meta import Meta
 
 from noseOfYeti.tokeniser.support import noy_sup_setUp
 from tests.helpers import TestCase
+import weakref
 import mock
 import six
+import gc
 
 describe TestCase, "FieldSpec":
     describe "inheritance":
@@ -316,6 +318,95 @@ describe TestCase, "FieldSpec":
             instance = spec.normalise(Meta({}, []), {})
             self.assertEqual(type(instance), MyKls)
 
+    describe "cached_spec":
+        it "only makes the spec once for each kls, formatter and create_kls":
+            called = []
+            def make():
+                called.append(1)
+                return sb.string_spec()
+
+            class MyKls(dictobj.Spec):
+                one = dictobj.Field(make)
+
+            meta = Meta.empty()
+            formatter = mock.Mock(name="formatter")
+            spec = MyKls.FieldSpec().cached_spec(meta)
+            self.assertIs(MyKls.FieldSpec().cached_spec(meta), spec)
+            self.assertEqual(MyKls.FieldSpec().normalise(meta, {"one": "1"}).one, "1")
+            self.assertEqual(called, [1])
+
+            self.assertIsNot(MyKls.FieldSpec(formatter=formatter).cached_spec(meta), spec)
+            self.assertEqual(called, [1, 1])
+
+        it "makes the spec again after it's invalidated":
+            class MyKls(dictobj.Spec):
+                one = dictobj.Field(sb.string_spec)
+
+            class MyChildKls(MyKls):
+                pass
+
+            class Other(dictobj.Spec):
+                one = dictobj.Field(sb.string_spec)
+
+            meta = Meta.empty()
+            spec = MyKls.FieldSpec().cached_spec(meta)
+            child_spec = MyChildKls.FieldSpec().cached_spec(meta)
+            other_spec = Other.FieldSpec().cached_spec(meta)
+
+            invalidate_cached_specs(MyKls)
+            self.assertIsNot(MyKls.FieldSpec().cached_spec(meta), spec)
+            self.assertIsNot(MyChildKls.FieldSpec().cached_spec(meta), child_spec)
+            self.assertIs(Other.FieldSpec().cached_spec(meta), other_spec)
+
+            invalidate_cached_specs()
+            self.assertIsNot(Other.FieldSpec().cached_spec(meta), other_spec)
+
+        it "remembers specs on the class so they go away with it":
+            class MyKls(dictobj.Spec):
+                one = dictobj.Field(sb.string_spec)
+
+            class MyChildKls(MyKls):
+                pass
+
+            meta = Meta.empty()
+            spec = MyKls.FieldSpec().cached_spec(meta)
+            self.assertIs(MyKls.__dict__["_field_specs"][(None, MyKls, False)], spec)
+            self.assertIsNot(MyChildKls.FieldSpec().cached_spec(meta), spec)
+
+            selection = MyKls.make_selection_class("Selected", ["one"], {})
+            selection.FieldSpec().cached_spec(meta)
+
+            classes = [weakref.ref(kls) for kls in (MyKls, MyChildKls, selection)]
+            del MyKls, MyChildKls, selection, spec
+            gc.collect()
+            self.assertEqual([kls() for kls in classes], [None, None, None])
+
+        it "doesn't remember specs that fail to build":
+            class MyKls(dictobj):
+                fields = {"one": "one!"}
+
+            with self.fuzzyAssertRaisesError(BadSpec):
+                FieldSpec(MyKls).cached_spec(Meta.empty())
+
+            MyKls.fields = {"one": sb.string_spec()}
+            self.assertEqual(FieldSpec(MyKls).normalise(Meta.empty(), {"one": "1"}).one, "1")
+
+        it "can make the spec when the class is created":
+            called = []
+            def make():
+                called.append(1)
+                return sb.string_spec()
+
+            formatter = mock.Mock(name="formatter")
+
+            class MyKls(dictobj.Spec):
+                eager_formatters = [None, formatter]
+                one = dictobj.Field(make)
+
+            self.assertEqual(called, [1, 1])
+            MyKls.FieldSpec(formatter=formatter).cached_spec(Meta.empty())
+            self.assertEqual(called, [1, 1])
+
 describe TestCase, "FieldSpecMixin":
     it "provides FieldSpec which passes the class to an instance of FieldSpec":
         class MyKls(FieldSpecMixin):
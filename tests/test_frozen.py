@@ -0,0 +1,206 @@
+# coding: spec
+
+from input_algorithms.spec_base import FrozenDict, FrozenList, NotSpecified, freeze
+from input_algorithms.field_spec import invalidate_cached_specs
+from input_algorithms.caches import FormattedCache, GenerationDict
+from input_algorithms.errors import BadSpecValue, ProgrammerError
+from input_algorithms.dictobj import dictobj
+from input_algorithms import spec_base as sb
+from input_algorithms import validators as va
+from input_algorithms.meta import Meta, Run
+
+from tests.helpers import TestCase
+
+from noseOfYeti.tokeniser.support import noy_sup_setUp, noy_sup_tearDown
+
+from six.moves import cPickle as pickle
+import threading
+import string
+import sys
+
+class Formatter(string.Formatter):
+    def __init__(s, all_options, option_path, value):
+        s.all_options = all_options
+        s.value = value
+
+    def get_field(s, key, args, kwargs):
+        return s.all_options[key], key
+
+    def format(s):
+        return s.vformat(s.value, (), {})
+
+class Host(dictobj.Spec):
+    name = dictobj.Field(sb.string_spec, wrapper=sb.required)
+    port = dictobj.Field(sb.integer_spec, default=80)
+
+class Service(dictobj.Spec):
+    name = dictobj.Field(sb.string_spec, formatted=True)
+    hosts = dictobj.Field(Host.FieldSpec, wrapper=sb.listof)
+    tags = dictobj.Field(lambda: sb.dictof(sb.string_spec(), sb.string_choice_spec(["web", "db"])))
+
+describe TestCase, "Freezing specs":
+    it "stops attributes from being changed":
+        spec = sb.listof(sb.string_spec()).freeze()
+        assert spec.is_frozen
+
+        with self.fuzzyAssertRaisesError(ProgrammerError, "Can't change spec on a frozen listof"):
+            spec.spec = sb.integer_spec()
+        with self.fuzzyAssertRaisesError(ProgrammerError, "Can't change expect on a frozen listof"):
+            del spec.expect
+        with self.fuzzyAssertRaisesError(ProgrammerError, "Can't change spec on a frozen string_spec"):
+            spec.spec.spec = None
+
+    it "freezes the specs, lists and dictionaries inside the spec":
+        choice = sb.string_choice_spec(["one", "two"])
+        options = sb.set_options(one=choice, two=sb.or_spec(sb.integer_spec(), choice))
+        self.assertIs(options.freeze(), options)
+
+        assert choice.is_frozen
+        assert options.options["two"].is_frozen
+        assert all(spec.is_frozen for spec in options.options["two"].specs)
+
+        self.assertIs(type(options.options), FrozenDict)
+        self.assertIs(type(choice.choices), FrozenList)
+        self.assertEqual(choice.choices, ["one", "two"])
+
+        with self.fuzzyAssertRaisesError(ProgrammerError, "Can't change a frozen dictionary"):
+            options.options["three"] = sb.any_spec()
+        with self.fuzzyAssertRaisesError(ProgrammerError, "Can't change a frozen list"):
+            choice.choices.append("three")
+
+    it "still normalises and complains the same":
+        spec = sb.dictof(sb.string_spec(), sb.listof(sb.integer_choice_spec([1, 2])))
+        frozen = sb.dictof(sb.string_spec(), sb.listof(sb.integer_choice_spec([1, 2]))).freeze()
+
+        val = {"a": [1, 2], "b": 1}
+        self.assertEqual(frozen.normalise(Meta.empty(), val), spec.normalise(Meta.empty(), val))
+
+        for make_meta in (Meta.empty, lambda: Meta({}, [], run=Run(max_errors=1))):
+            val = {"a": [1, 3], "b": 4}
+            with self.assertRaises(BadSpecValue) as expected:
+                spec.normalise(make_meta(), val)
+            with self.fuzzyAssertRaisesError(BadSpecValue, _errors=expected.exception.errors):
+                frozen.normalise(make_meta(), val)
+
+    it "can be pickled":
+        spec = pickle.loads(pickle.dumps(sb.set_options(one=sb.string_choice_spec(["a"])).freeze()))
+        assert spec.is_frozen
+        self.assertIs(type(spec.options), FrozenDict)
+        self.assertIs(type(spec.options["one"].choices), FrozenList)
+        self.assertEqual(spec.normalise(Meta.empty(), {"one": "a"}), {"one": "a"})
+
+    it "leaves things that aren't specs or plain containers alone":
+        cache = FormattedCache()
+        spec = sb.formatted(sb.string_spec(), formatter=Formatter, cache=cache).freeze()
+        self.assertIs(spec.cache, cache)
+        self.assertIs(spec.formatter, Formatter)
+
+        everything = GenerationDict(name="bob")
+        self.assertIs(freeze(everything), everything)
+        self.assertEqual(freeze(({"a": [1]}, )), (FrozenDict(a=FrozenList([1])), ))
+
+    it "freezes the spec for a dictobj":
+        field_spec = Host.FieldSpec()
+        self.assertIs(field_spec.freeze(), field_spec)
+        assert field_spec.cached_spec(Meta.empty()).is_frozen
+        self.assertEqual(field_spec.empty_normalise(name="one"), Host(name="one", port=80))
+
+    it "leaves the spec for FieldSpecs that aren't frozen alone":
+        class Thing(dictobj.Spec):
+            items = dictobj.Field(sb.listof(sb.string_spec()), default=[])
+            options = dictobj.Field(sb.dictionary_spec, default={})
+
+        before = Thing.FieldSpec().empty_normalise()
+        frozen = Thing.FieldSpec().freeze().empty_normalise()
+        after = Thing.FieldSpec().empty_normalise()
+
+        self.assertIs(type(frozen.items), FrozenList)
+        self.assertIs(type(frozen.options), FrozenDict)
+        for thing in (before, after):
+            self.assertIs(type(thing.items), list)
+            self.assertIs(type(thing.options), dict)
+
+        after.items.append("a")
+        after.options["a"] = 1
+        assert not Thing.FieldSpec().cached_spec(Meta.empty()).is_frozen
+        assert not Thing.items.spec.is_frozen
+
+    it "can make a frozen copy and leave the original alone":
+        inner = sb.string_choice_spec(["one", "two"])
+        spec = sb.set_options(one=inner, two=sb.listof(inner), three=sb.defaulted(sb.any_spec(), []))
+        copy = spec.frozen_copy()
+
+        assert copy.is_frozen and not spec.is_frozen and not inner.is_frozen
+        self.assertIs(type(spec.options["three"].dflt), list)
+        self.assertIs(type(copy.options["three"].dflt), FrozenList)
+
+        # Specs that are in the original more than once are copied once
+        self.assertIsNot(copy.options["one"], inner)
+        self.assertIs(copy.options["one"], copy.options["two"].spec)
+        self.assertEqual(copy.normalise(Meta.empty(), {"one": "one", "two": "two"}), {"one": "one", "two": ["two"], "three": []})
+
+        field_spec = Service.FieldSpec(formatter=Formatter)
+        frozen = field_spec.frozen_copy()
+        assert frozen.frozen and not field_spec.frozen
+        assert frozen.cached_spec(Meta.empty()).is_frozen
+        assert not field_spec.cached_spec(Meta.empty()).is_frozen
+
+describe TestCase, "Sharing specs between threads":
+    before_each:
+        self.interval = getattr(sys, "getswitchinterval", lambda: None)()
+        if self.interval is not None:
+            sys.setswitchinterval(1e-6)
+
+    after_each:
+        interval, self.interval = self.interval, None
+        if interval is not None:
+            sys.setswitchinterval(interval)
+
+    it "normalises the same frozen specs from many threads at once":
+        everything = GenerationDict(prefix="svc")
+        cache = FormattedCache(size=8)
+        spec = sb.listof(Service.FieldSpec(formatter=Formatter)).freeze()
+        plain = sb.listof(sb.and_spec(sb.string_spec(), va.regexed("^h[0-9]+$"))).freeze()
+        formatted = sb.formatted(sb.string_spec(), formatter=Formatter, cache=cache).freeze()
+
+        def service(i):
+            return {
+                  "name": "{{prefix}}-{0}".format(i)
+                , "hosts": [{"name": "h{0}".format(j), "port": j} for j in range(i % 5)]
+                , "tags": {"tier": "web" if i % 2 else "db"}
+                }
+
+        val = [service(i) for i in range(30)]
+        expected = spec.normalise(Meta(everything, []), val)
+        hosts = ["h{0}".format(i) for i in range(50)]
+
+        errors = []
+        start = threading.Event()
+
+        def normalise(index):
+            start.wait()
+            try:
+                for i in range(10):
+                    self.assertEqual(spec.normalise(Meta(everything, []), val), expected)
+                    self.assertEqual(plain.normalise(Meta.empty(), hosts), hosts)
+                    self.assertEqual(formatted.normalise(Meta(everything, []).at(str(i % 12)), "{prefix}-{_key_name_0}"), "svc-{0}".format(i % 12))
+
+                    with self.assertRaises(BadSpecValue):
+                        plain.normalise(Meta.empty(), ["nope"])
+
+                    if index == 0:
+                        # Make the dictobj specs be built again while they are being used
+                        invalidate_cached_specs(Host)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=normalise, args=(index, )) for index in range(16)]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(cache.hits + cache.misses, 16 * 10)
+        self.assertLessEqual(len(cache), 8)
@@ -1,10 +1,11 @@
 # coding: spec
 
-from input_algorithms.meta import Meta
+from input_algorithms.meta import Meta, Run, LayeredOptions
 
 from noseOfYeti.tokeniser.support import noy_sup_setUp
 from tests.helpers import TestCase
 import mock
+import sys
 
 describe TestCase, "Meta":
     it "holds everything and a path":
@@ -24,6 +25,75 @@ describe TestCase, "Meta":
     it "can generate an empty Meta":
         self.assertEqual(Meta({}, []), Meta.empty())
 
+    it "shares it's run with every meta made from it":
+        run = Run(max_errors=2)
+        meta = Meta({}, [], run=run)
+        self.assertIs(meta.run, run)
+        self.assertIs(meta.at("one").indexed_at(1).run, run)
+        self.assertIs(Meta.empty().at("one").run, None)
+
+    describe "Run":
+        it "has caches for the rest of the normalisation":
+            run = Run()
+            cache = run.cache("things")
+            self.assertEqual(cache, {})
+            self.assertIs(run.cache("things"), cache)
+            self.assertIsNot(run.cache("other"), cache)
+            self.assertIsNot(Run().cache("things"), cache)
+
+        it "is exhausted when it has used up it's error budget":
+            self.assertEqual(Run().exhausted, False)
+
+            run = Run(max_errors=2)
+            self.assertEqual(run.exhausted, False)
+            run.error_count += 1
+            self.assertEqual(run.exhausted, False)
+            run.error_count += 1
+            self.assertEqual(run.exhausted, True)
+
+        it "calls the hook every hook_every values":
+            called = []
+            run = Run(hook=lambda run: called.append(run.nodes), hook_every=10)
+            run.visited(9)
+            self.assertEqual(called, [])
+            run.visited()
+            self.assertEqual(called, [10])
+            run.visited(25)
+            self.assertEqual(called, [10, 35])
+            run.visited(9)
+            self.assertEqual(called, [10, 35])
+            run.visited()
+            self.assertEqual(called, [10, 35, 45])
+
+    describe "LayeredOptions":
+        it "looks in everything before key_names":
+            everything = {"one": 1, "_key_name_0": "from_everything"}
+            key_names = {"_key_name_0": "zero", "_key_name_1": "first"}
+            options = LayeredOptions(everything, key_names)
+
+            self.assertEqual(options["one"], 1)
+            self.assertEqual(options["_key_name_0"], "from_everything")
+            self.assertEqual(options["_key_name_1"], "first")
+            assert "_key_name_1" in options
+            assert "two" not in options
+            self.assertEqual(options.get("two", 2), 2)
+            self.assertEqual(sorted(options), ["_key_name_0", "_key_name_1", "one"])
+            self.assertEqual(len(options), 3)
+
+        it "gets attributes it doesn't have from everything":
+            everything = mock.Mock(name="everything")
+            options = LayeredOptions(everything, {})
+            self.assertIs(options.converters, everything.converters)
+            self.assertIs(options.dont_prefix, everything.dont_prefix)
+            self.assertIs(options.is_dict, True)
+
+        it "doesn't change everything":
+            everything = {"one": 1}
+            options = LayeredOptions(everything, {"_key_name_0": "one"})
+            with self.assertRaises(TypeError):
+                options["two"] = 2
+            self.assertEqual(everything, {"one": 1})
+
     describe "New path":
         before_each:
             self.p1 = mock.Mock(name="p1")
@@ -72,6 +142,43 @@ describe TestCase, "Meta":
             meta = Meta(mock.Mock(name="everything"), [("one", ""), ("two", "[3]"), ("", "[4]"), ("", ""), ("five", "")])
             self.assertEqual(meta.path, "one.two[3][4].five")
 
+        it "Joins the same way when the path is made with at and indexed_at":
+            meta = Meta(mock.Mock(name="everything"), []).at("one").at("two").new_path([("", "[3]")]).indexed_at(4).new_path([("", "")]).at("five")
+            self.assertEqual(meta.path, "one.two[3][4].five")
+            self.assertEqual(meta.nonspecial_path, "one.two.five")
+            self.assertEqual(meta._path, [("one", ""), ("two", ""), ("", "[3]"), ("", "[4]"), ("", ""), ("five", "")])
+
+            meta = Meta(mock.Mock(name="everything"), [("", "[1]")]).at("one").indexed_at(2)
+            self.assertEqual(meta.path, "[1].one[2]")
+            self.assertEqual(meta.nonspecial_path, "one")
+
+        it "shares the parent path between children":
+            meta = Meta({}, [("one", "")]).at("two")
+            child1 = meta.at("three")
+            child2 = meta.indexed_at(4)
+            self.assertIs(child1._node.parent, meta._node)
+            self.assertIs(child2._node.parent, meta._node)
+            self.assertEqual(child1.path, "one.two.three")
+            self.assertEqual(child2.path, "one.two[4]")
+            self.assertEqual(meta.path, "one.two")
+
+        it "works for paths deeper than the recursion limit":
+            depth = sys.getrecursionlimit() * 2
+            meta = Meta({}, [("root", "")])
+            for i in range(depth):
+                meta = meta.at("a") if i % 2 else meta.indexed_at(i)
+
+            self.assertEqual(meta.path.count("."), depth // 2)
+            self.assertEqual(meta.nonspecial_path, ".".join(["root"] + ["a"] * (depth // 2)))
+            self.assertEqual(len(meta.key_names()), depth + 1)
+            self.assertEqual(len(meta._path), depth + 1)
+            self.assertIs(meta._path, meta._path)
+            self.assertEqual(meta._path[:3], [("root", ""), ("", "[0]"), ("a", "")])
+
+            child = meta.at("b")
+            self.assertEqual(child.path, "{0}.b".format(meta.path))
+            self.assertEqual(child._path, meta._path + [("b", "")])
+
     describe "Finding the source of something":
         it "returns unknown source_for":
             everything = mock.Mock(name="everything", spec=[])
@@ -130,3 +237,11 @@ describe TestCase, "Meta":
             meta = Meta(None, path)
             self.assertEqual(meta.key_names(), {"_key_name_0": "three", "_key_name_1": "two", "_key_name_2": "one"})
 
+        it "returns the same when the path is made with at and indexed_at":
+            meta = Meta(None, [("one", "")]).at("two").indexed_at(1).at("three")
+            self.assertEqual(meta.key_names(), {"_key_name_0": "three", "_key_name_1": "", "_key_name_2": "two", "_key_name_3": "one"})
+
+            # Changing the result doesn't change the meta
+            meta.key_names()["_key_name_0"] = "four"
+            self.assertEqual(meta.key_names()["_key_name_0"], "three")
+
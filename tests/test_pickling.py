@@ -0,0 +1,157 @@
+# coding: spec
+
+from input_algorithms.spec_base import NotSpecified, default_specs, try_normalise
+from input_algorithms.validators import default_validators
+from input_algorithms.dictobj import dictobj
+from input_algorithms import spec_base as sb
+from input_algorithms import validators as va
+from input_algorithms.meta import Meta, Run
+
+from tests.helpers import TestCase
+
+from six.moves import cPickle as pickle
+import string
+
+class Formatter(string.Formatter):
+    def __init__(s, all_options, option_path, value):
+        s.all_options = all_options
+        s.value = value
+
+    def get_field(s, key, args, kwargs):
+        return s.all_options[key], key
+
+    def format(s):
+        return s.vformat(s.value, (), {})
+
+def make_dict(meta, enabled):
+    return {"enabled": enabled}
+
+class Thing(dictobj.Spec):
+    one = dictobj.Field(sb.string_spec)
+    two = dictobj.Field(sb.integer_spec, default=2, wrapper=sb.optional_spec)
+    three = dictobj.Field(sb.integer_spec, wrapper=sb.listof)
+
+class Plain(dictobj):
+    fields = ["one", ("two", 2)]
+
+everything = {"name": "bob"}
+
+# name: (args, kwargs, val)
+examples = {
+      "pass_through_spec": ((), {}, 1)
+    , "always_same_spec": ((2, ), {}, 1)
+    , "dictionary_spec": ((), {}, {"a": 1})
+    , "dictof": ((sb.string_spec(), sb.integer_spec()), {}, {"a": 1, "b": "2"})
+    , "tupleof": ((sb.string_spec(), ), {}, ["a", 1])
+    , "listof": ((sb.string_spec(), ), {}, ["a", "b"])
+    , "set_options": ((), {"a": sb.string_spec(), "b": sb.defaulted(sb.integer_spec(), 3)}, {"a": "1"})
+    , "defaulted": ((sb.string_spec(), "dflt"), {}, NotSpecified)
+    , "required": ((sb.string_spec(), ), {}, NotSpecified)
+    , "boolean": ((), {}, True)
+    , "directory_spec": ((), {}, "/")
+    , "filename_spec": ((), {}, "/")
+    , "file_spec": ((), {}, "/")
+    , "string_spec": ((), {}, 1)
+    , "integer_spec": ((), {}, 1)
+    , "float_spec": ((), {}, "1.5")
+    , "string_or_int_as_string_spec": ((), {}, 1)
+    , "valid_string_spec": ((va.no_dots(), ), {}, "a.b")
+    , "integer_choice_spec": (([1, 2], ), {}, 3)
+    , "string_choice_spec": ((["a", "b"], ), {}, "a")
+    , "create_spec": ((Thing, ), {"one": sb.string_spec(), "two": sb.defaulted(sb.integer_spec(), 2), "three": sb.listof(sb.integer_spec())}, {"one": "1", "three": 3})
+    , "or_spec": ((sb.integer_spec(), sb.string_spec()), {}, "a")
+    , "match_spec": (((list, sb.listof(sb.string_spec())), (int, sb.integer_spec())), {}, 1)
+    , "and_spec": ((sb.string_spec(), va.regexed("^a")), {}, "ab")
+    , "optional_spec": ((sb.string_spec(), ), {}, NotSpecified)
+    , "dict_from_bool_spec": ((make_dict, sb.set_options(enabled=sb.boolean())), {}, False)
+    , "formatted": ((sb.string_spec(), Formatter), {}, "{name}")
+    , "many_format": ((sb.overridden("name"), Formatter), {}, NotSpecified)
+    , "overridden": (("over", ), {}, "under")
+    , "any_spec": ((), {}, 1)
+    , "container_spec": ((list, sb.string_spec()), {}, "a")
+    , "delayed": ((sb.string_spec(), ), {}, "a")
+    , "typed": ((int, ), {}, 1)
+    , "has": (("upper", ), {}, "a")
+    , "tuple_spec": ((sb.string_spec(), sb.integer_spec()), {}, ("a", 1))
+    , "none_spec": ((), {}, None)
+    , "has_either": ((["a", "b"], ), {}, {"a": 1})
+    , "has_only_one_of": ((["a", "b"], ), {}, {"a": 1, "b": 2})
+    , "either_keys": ((["a"], ["b"]), {}, {"a": 1})
+    , "no_whitespace": ((), {}, "a b")
+    , "no_dots": (("because", ), {}, "a.b")
+    , "regexed": (("^a", ), {}, "b")
+    , "deprecated_key": (("a", "old"), {}, {"a": 1})
+    , "choice": (("a", "b"), {}, "c")
+    }
+
+def round_trip(obj):
+    return pickle.loads(pickle.dumps(obj, pickle.HIGHEST_PROTOCOL))
+
+def outcome(spec, val):
+    result = try_normalise(spec, Meta(everything, []), val)
+    value = result.value if result.ok else result.error
+    if isinstance(value, sb.Delayed):
+        value = value()
+    return result.ok, value
+
+describe TestCase, "Pickling":
+    it "round trips every default spec and validator":
+        names = [name for name, _ in default_specs + default_validators]
+        self.assertEqual(sorted(names), sorted(examples))
+
+        for name, kls in default_specs + default_validators:
+            args, kwargs, val = examples[name]
+            spec = kls(*args, **kwargs)
+            unpickled = round_trip(spec)
+            self.assertIs(type(unpickled), kls)
+            self.assertEqual(outcome(unpickled, val), outcome(spec, val), name)
+
+    it "round trips the result of delayed":
+        spec = sb.delayed(sb.listof(sb.string_spec()))
+        result = round_trip(spec.normalise(Meta(everything, [], run=Run()).at("things"), "a"))
+        self.assertEqual(result(), ["a"])
+
+        fake = round_trip(spec.fake_filled(Meta.empty()))
+        self.assertEqual(fake(), [])
+
+    it "round trips a Meta without the caches in it's Run":
+        run = Run(max_errors=2)
+        run.cache("stat", sb.StatCache).stat("/")
+        meta = round_trip(Meta(everything, [], run=run).at("one").indexed_at(2))
+        self.assertEqual(meta, Meta(everything, [("one", ""), ("", "[2]")]))
+        self.assertEqual(meta.run.max_errors, 2)
+        self.assertEqual(meta.run.caches, {})
+
+    describe "dictobj":
+        it "round trips fields, FieldSpec and the spec it makes":
+            self.assertEqual(round_trip(Thing.one).spec, sb.string_spec)
+            self.assertIs(round_trip(Thing.FieldSpec()).kls, Thing)
+
+            spec = round_trip(Thing.FieldSpec().make_spec(Meta.empty()))
+            thing = spec.normalise(Meta.empty(), {"one": "1", "three": 3})
+            self.assertEqual(thing, Thing(one="1", two=NotSpecified, three=[3]))
+
+        it "round trips instances":
+            thing = round_trip(Thing(one="1", two=2, three=[3]))
+            self.assertIs(type(thing), Thing)
+            self.assertEqual(thing.as_dict(), {"one": "1", "two": 2, "three": [3]})
+
+        it "round trips selections by making the selection again":
+            Sel = Thing.selection("Sel", ["one", "two"], all_optional=True, required=["two"])
+            Unpickled = round_trip(Sel)
+            self.assertEqual(Unpickled.__name__, "Sel")
+            self.assertEqual(sorted(Unpickled.fields), ["one", "two"])
+
+            self.assertEqual(Unpickled.FieldSpec().empty_normalise(two=3).as_dict(), {"one": NotSpecified, "two": 3})
+            with self.fuzzyAssertRaisesError(sb.BadSpecValue):
+                Unpickled.FieldSpec().empty_normalise(one="1")
+
+            sel = round_trip(Sel(one="1", two=2))
+            self.assertEqual(type(sel).__name__, "Sel")
+            self.assertEqual(sel.as_dict(), {"one": "1", "two": 2})
+
+        it "round trips selections from a plain dictobj":
+            Sel = Plain.selection("Sel", ["two"])
+            sel = round_trip(Sel())
+            self.assertEqual(type(sel).__name__, "Sel")
+            self.assertEqual(sel.two, 2)
@@ -0,0 +1,40 @@
+# coding: spec
+
+from input_algorithms import pools
+
+from tests.helpers import TestCase
+
+import threading
+import mock
+
+describe TestCase, "thread_pool":
+    it "returns None if there aren't enough threads to be worth it":
+        self.assertIs(pools.thread_pool(None), None)
+        self.assertIs(pools.thread_pool(0), None)
+        self.assertIs(pools.thread_pool(1), None)
+
+    it "shares a pool for each size":
+        self.assertIs(pools.thread_pool(3), pools.thread_pool(3))
+        self.assertIsNot(pools.thread_pool(3), pools.thread_pool(4))
+
+describe TestCase, "map_in_threads":
+    it "returns results in the same order as the items":
+        self.assertEqual(pools.map_in_threads(lambda i: i * 2, list(range(100)), 4), [i * 2 for i in range(100)])
+
+    it "uses other threads":
+        idents = pools.map_in_threads(lambda i: threading.current_thread().ident, list(range(10)), 2)
+        self.assertNotIn(threading.current_thread().ident, idents)
+
+    it "works in this thread without a pool":
+        with mock.patch.object(pools, "ThreadPoolExecutor", None):
+            idents = pools.map_in_threads(lambda i: threading.current_thread().ident, list(range(10)), 4)
+        self.assertEqual(set(idents), set([threading.current_thread().ident]))
+
+    it "raises errors from the function":
+        def func(i):
+            if i == 3:
+                raise ValueError("nope")
+            return i
+
+        with self.assertRaisesRegexp(ValueError, "nope"):
+            pools.map_in_threads(func, list(range(10)), 4)
@@ -0,0 +1,192 @@
+# coding: spec
+
+from input_algorithms.spec_base import NotSpecified
+from input_algorithms.dictobj import dictobj
+from input_algorithms.record import record
+from input_algorithms import spec_base as sb
+from input_algorithms.meta import Meta
+
+from tests.helpers import TestCase
+
+from six.moves import cPickle as pickle
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+class Point(record):
+    fields = ["x", "y", ("label", None)]
+
+class Host(record.Spec):
+    name = record.Field(sb.string_spec, wrapper=sb.required)
+    port = record.Field(sb.integer_spec, default=80)
+
+describe TestCase, "record":
+    describe "making instances":
+        it "takes fields as positional and keyword arguments with defaults at the end":
+            class Thing(record):
+                fields = [("three", 3), "one", ("many", list), "two"]
+
+            thing = Thing(1, two=2)
+            self.assertEqual((thing.one, thing.two, thing.three, thing.many), (1, 2, 3, []))
+            self.assertIsNot(thing.many, Thing(1, 2).many)
+            self.assertEqual(list(thing), ["one", "two", "three", "many"])
+
+            with self.assertRaisesRegexp(TypeError, "unexpected keyword argument 'four'"):
+                Thing(1, 2, four=4)
+
+        it "keeps the fields in slots without a __dict__":
+            point = Point(1, 2)
+            assert not hasattr(point, "__dict__")
+            self.assertEqual(Point.__slots__, ("x", "y", "label"))
+
+            with self.assertRaises(AttributeError):
+                point.z = 3
+
+        it "only adds slots for the new fields in a subclass":
+            class Point3(Point):
+                fields = ["x", "y", "z", ("label", None)]
+
+            point = Point3(1, 2, 3)
+            self.assertEqual(Point3.__slots__, ("z", ))
+            self.assertEqual(point.as_dict(), {"x": 1, "y": 2, "z": 3, "label": None})
+            assert not hasattr(point, "__dict__")
+
+        it "complains about bad field names":
+            for name, message in (("1", "must be valid identifiers"), ("_a", "cannot start with an underscore"), ("fields", "cannot be an attribute of the record itself")):
+                with self.assertRaisesRegexp(ValueError, "{0}: '{1}' on Thing".format(message, name)):
+                    type("Thing", (record, ), {"fields": [name]})
+
+        it "lets a field hide a method of the same name":
+            class Thing(record):
+                fields = ["items", "values"]
+
+            thing = Thing(1, 2)
+            self.assertEqual((thing.items, thing["values"]), (1, 2))
+            self.assertEqual(thing, {"items": 1, "values": 2})
+
+    describe "the Mapping API":
+        it "looks like a read only mapping of the fields":
+            point = Point(1, 2)
+            assert point.is_dict
+            assert isinstance(point, Mapping)
+            assert not isinstance(point, dict)
+
+            self.assertEqual(len(point), 3)
+            self.assertEqual(list(point.keys()), ["x", "y", "label"])
+            self.assertEqual(list(point.items()), [("x", 1), ("y", 2), ("label", None)])
+            self.assertEqual(list(point.values()), [1, 2, None])
+            self.assertEqual((point.get("x"), point.get("z"), point.get("z", 3)), (1, None, 3))
+            assert "x" in point and "z" not in point
+            assert Point.fields and bool(type("Empty", (record, ), {"fields": []})())
+
+        it "gets and sets fields as items":
+            point = Point(1, 2)
+            point["x"] = 3
+            self.assertEqual((point["x"], point.x), (3, 3))
+
+            with self.assertRaises(KeyError):
+                point["z"]
+            with self.assertRaises(KeyError):
+                point["z"] = 1
+            with self.assertRaises(KeyError):
+                point["clone"]
+
+        it "is equal to mappings with the same keys and values":
+            class Dict(dictobj):
+                fields = ["x", "y", ("label", None)]
+
+            point = Point(1, 2)
+            self.assertEqual(point, Point(1, 2))
+            self.assertEqual(point, {"x": 1, "y": 2, "label": None})
+            self.assertEqual({"x": 1, "y": 2, "label": None}, point)
+            self.assertEqual(point, Dict(1, 2))
+            self.assertEqual(Dict(1, 2), point)
+
+            self.assertNotEqual(point, Point(1, 3))
+            self.assertNotEqual(point, {"x": 1, "y": 2})
+            self.assertNotEqual(point, [1, 2, None])
+
+    describe "clone and as_dict":
+        it "clones into a new instance":
+            point = Point(1, [2], label="a")
+            clone = point.clone()
+            self.assertIsNot(clone, point)
+            self.assertIs(type(clone), Point)
+            self.assertIs(clone.y, point.y)
+            self.assertEqual(clone, point)
+
+        it "calls as_dict on the values":
+            class Line(record):
+                fields = ["start", "end", "extra"]
+
+            line = Line(Point(1, 2), Point(3, 4), [1])
+            self.assertEqual(line.as_dict(), {"start": {"x": 1, "y": 2, "label": None}, "end": {"x": 3, "y": 4, "label": None}, "extra": [1]})
+            self.assertIs(type(line.as_dict()["start"]), dict)
+
+        it "converts records in containers and other dictobjs":
+            class Thing(dictobj):
+                fields = ["points"]
+
+            point = Point(1, 2)
+            result = Thing([point, (point, )]).as_dict()
+            self.assertEqual(result, {"points": [{"x": 1, "y": 2, "label": None}, ({"x": 1, "y": 2, "label": None}, )]})
+            self.assertIs(result["points"][0], result["points"][1][0])
+
+    describe "pickling":
+        it "round trips instances with any protocol":
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                point = pickle.loads(pickle.dumps(Point(1, [2]), protocol))
+                self.assertIs(type(point), Point)
+                self.assertEqual(point, {"x": 1, "y": [2], "label": None})
+
+    describe "specs":
+        it "can be made by create_spec":
+            spec = sb.create_spec(Point, x=sb.integer_spec(), y=sb.integer_spec(), label=sb.defaulted(sb.string_spec(), "p"))
+            point = spec.normalise(Meta.empty(), {"x": 1, "y": 2})
+            self.assertIs(type(point), Point)
+            self.assertEqual(point, {"x": 1, "y": 2, "label": "p"})
+            self.assertIs(spec.normalise(Meta.empty(), point), point)
+
+        it "is treated like a dictionary by the specs":
+            point = Point(1, 2)
+            self.assertIs(sb.dictionary_spec().normalise(Meta.empty(), point), point)
+            self.assertEqual(sb.dictof(sb.string_spec(), sb.any_spec()).normalise(Meta.empty(), point), {"x": 1, "y": 2, "label": None})
+
+        it "can be made by the spec for a dictobj.Spec":
+            class Thing(dictobj.Spec):
+                name = dictobj.Field(sb.string_spec)
+                port = dictobj.Field(sb.integer_spec, default=80)
+
+            class ThingRecord(record):
+                fields = ["name", "port"]
+
+            thing = Thing.FieldSpec(create_kls=ThingRecord).normalise(Meta.empty(), {"name": "a"})
+            self.assertIs(type(thing), ThingRecord)
+            self.assertEqual(thing, {"name": "a", "port": 80})
+
+        describe "record.Spec":
+            it "makes slots from the Field attributes":
+                self.assertEqual(sorted(Host.fields), ["name", "port"])
+                self.assertEqual(sorted(Host.__slots__), ["name", "port"])
+
+                host = Host.FieldSpec().empty_normalise(name="db")
+                assert not hasattr(host, "__dict__")
+                self.assertIs(type(host), Host)
+                self.assertEqual(host.as_dict(), {"name": "db", "port": 80})
+
+                with self.fuzzyAssertRaisesError(sb.BadSpecValue):
+                    Host.FieldSpec().empty_normalise(port=1)
+
+            it "inherits fields":
+                class Service(Host):
+                    scheme = record.Field(sb.string_spec, default="http")
+
+                service = Service.FieldSpec().empty_normalise(name="web")
+                self.assertEqual(Service.__slots__, ("scheme", ))
+                self.assertEqual(service, {"name": "web", "port": 80, "scheme": "http"})
+
+            it "can be pickled":
+                host = pickle.loads(pickle.dumps(Host(name="db", port=NotSpecified), pickle.HIGHEST_PROTOCOL))
+                self.assertEqual(host, {"name": "db", "port": NotSpecified})
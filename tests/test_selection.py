@@ -137,3 +137,81 @@ describe TestCase, "Selection":
             with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[error1]):
                 changed = Changed.FieldSpec().normalise(m, {})
 
+        it "keeps the existing wrapper on a field":
+            class Original(dictobj.Spec):
+                one = dictobj.Field(sb.integer_spec, wrapper=sb.listof)
+                two = dictobj.Field(sb.string_spec)
+
+            Changed = Original.selection("Changed", ["one"], required=["one"])
+            self.assertEqual(Changed.FieldSpec().empty_normalise(one=1).one, [1])
+
+            m = Meta.empty()
+            error1 = BadSpecValue("Expected a value but got none", meta=m.at("one"))
+
+            with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[error1]):
+                changed = Changed.FieldSpec().normalise(m, {})
+
+    describe "remembering selections":
+        it "returns the same class for the same selection":
+            class Original(dictobj.Spec):
+                one = dictobj.Field(sb.string_spec)
+                two = dictobj.Field(sb.integer_spec)
+
+            Changed = Original.selection("Changed", ["one", "two"], all_optional=True, required=["two"])
+            self.assertIs(Original.selection("Changed", ("one", "two"), required=("two", ), all_optional=True), Changed)
+            self.assertIs(Changed.FieldSpec().cached_spec(Meta.empty()), Original.selection("Changed", ["one", "two"], all_optional=True, required=["two"]).FieldSpec().cached_spec(Meta.empty()))
+
+            self.assertIsNot(Original.selection("Changed", ["one", "two"], all_optional=True), Changed)
+            self.assertIsNot(Original.selection("Other", ["one", "two"], all_optional=True, required=["two"]), Changed)
+            self.assertIsNot(Original.selection("Changed", ["two"], all_optional=True, required=["two"]), Changed)
+
+        it "remembers selections from a plain dictobj":
+            class Original(dictobj):
+                fields = ["one", ("two", 2)]
+
+            Changed = Original.selection("Changed", ["two"])
+            self.assertIs(Original.selection("Changed", ["two"]), Changed)
+            self.assertEqual(Changed().two, 2)
+
+        it "makes the selection again for a class that is defined again or has new fields":
+            def define():
+                class Original(dictobj):
+                    fields = ["one", "two"]
+                return Original
+
+            First = define()
+            Changed = First.selection("Changed", ["one"])
+
+            Second = define()
+            self.assertIsNot(Second.selection("Changed", ["one"]), Changed)
+            self.assertIs(First.selection("Changed", ["one"]), Changed)
+
+            First.fields = [("one", 1), "two"]
+            Again = First.selection("Changed", ["one"])
+            self.assertIsNot(Again, Changed)
+            self.assertEqual(Again().one, 1)
+            self.assertIs(First.selection("Changed", ["one"]), Again)
+
+        it "keeps selections from subclasses and selections apart":
+            class Original(dictobj.Spec):
+                one = dictobj.Field(sb.string_spec)
+                two = dictobj.Field(sb.string_spec)
+
+            class Sub(Original):
+                three = dictobj.Field(sb.string_spec)
+
+            Changed = Original.selection("Changed", ["one", "two"])
+            self.assertIsNot(Sub.selection("Changed", ["one", "two"]), Changed)
+
+            Smaller = Changed.selection("Changed", ["one", "two"], all_optional=True)
+            self.assertIsNot(Smaller, Changed)
+            self.assertIs(Changed.selection("Changed", ["one", "two"], all_optional=True), Smaller)
+            self.assertEqual(Smaller.FieldSpec().empty_normalise().as_dict(), {"one": sb.NotSpecified, "two": sb.NotSpecified})
+
+        it "doesn't remember selections with options that can't be hashed":
+            class Original(dictobj):
+                fields = ["one", "two"]
+
+            Changed = Original.selection("Changed", ["one"], extra={"a": 1})
+            self.assertIsNot(Original.selection("Changed", ["one"], extra={"a": 1}), Changed)
+            self.assertEqual(sorted(Changed.fields), ["one"])
@@ -2,14 +2,31 @@
 
 from input_algorithms.spec_base import Spec, NotSpecified, pass_through_spec, always_same_spec
 from input_algorithms.errors import BadSpec, BadSpecValue, BadDirectory, BadFilename
+from input_algorithms.results import Success, Failure
 from input_algorithms import spec_base as sb
-from input_algorithms.meta import Meta
+from input_algorithms.dictobj import dictobj
+from input_algorithms.caches import FormattedCache, GenerationDict, StatCache
+from input_algorithms.meta import Meta, Run, LayeredOptions
 
 from tests.helpers import TestCase
 
 from noseOfYeti.tokeniser.support import noy_sup_setUp
 from namedlist import namedlist
+import string
 import mock
+import os
+
+# The worker processes are forked from this process and keep this value
+parent_pid = os.getpid()
+
+class WorkerError(Exception):
+    pass
+
+class raises_in_worker(Spec):
+    def normalise_filled(self, meta, val):
+        if os.getpid() != parent_pid:
+            raise WorkerError(val)
+        return val
 
 describe TestCase, "Spec":
     it "takes in positional arguments and keyword arguments":
@@ -158,6 +175,439 @@ describe TestCase, "Spec":
                     with self.fuzzyAssertRaisesError(BadSpec, "Spec doesn't know how to deal with this value", meta=meta, val=val):
                         Specd().normalise(meta, val)
 
+        describe "normalise_plan":
+            it "is worked out for each class":
+                class Specd(Spec):
+                    def normalise_filled(s, meta, val):
+                        return ("filled", val)
+
+                class Specd2(Specd):
+                    def normalise_either(s, meta, val):
+                        return ("either", val)
+
+                meta = mock.Mock(name="meta")
+                self.assertEqual(Specd().normalise(meta, 1), ("filled", 1))
+                self.assertEqual(Specd2().normalise(meta, 1), ("either", 1))
+                self.assertIsNot(Specd.normalise_plan, Specd2.normalise_plan)
+                self.assertIs(Specd.try_normalise, Specd.normalise_plan)
+
+            it "is remade when hooks are changed on the class":
+                class Specd(Spec):
+                    pass
+
+                class Specd2(Specd):
+                    pass
+
+                meta = mock.Mock(name="meta")
+                self.assertIs(Specd2().normalise(meta, NotSpecified), NotSpecified)
+
+                Specd.default = lambda s, meta: "dflt"
+                self.assertEqual(Specd().normalise(meta, NotSpecified), "dflt")
+                self.assertEqual(Specd2().normalise(meta, NotSpecified), "dflt")
+
+                del Specd.default
+                self.assertIs(Specd2().normalise(meta, NotSpecified), NotSpecified)
+
+            it "doesn't make a new Success for NotSpecified":
+                class Specd(Spec):
+                    def default(s, meta):
+                        return NotSpecified
+
+                meta = mock.Mock(name="meta")
+                self.assertIs(type("Specd2", (Spec, ), {})().try_normalise(meta, NotSpecified), sb.not_specified)
+                self.assertIs(Specd().try_normalise(meta, NotSpecified), sb.not_specified)
+                self.assertIs(sb.optional_spec(sb.string_spec()).try_normalise(meta, NotSpecified), sb.not_specified)
+
+            it "makes normalise from the plan unless the class has it's own":
+                class Specd(Spec):
+                    def try_normalise_filled(s, meta, val):
+                        return Success(("filled", val))
+
+                class Specd2(Specd):
+                    def try_normalise(s, meta, val):
+                        return Success(("try", val))
+
+                meta = mock.Mock(name="meta")
+                assert Specd.normalise.unwraps_plan
+                self.assertEqual(Specd().normalise(meta, 1), ("filled", 1))
+                self.assertIs(Specd().normalise(meta, NotSpecified), NotSpecified)
+                self.assertEqual(Specd2().normalise(meta, 1), ("try", 1))
+
+                Specd.default = lambda s, meta: "dflt"
+                self.assertEqual(Specd().normalise(meta, NotSpecified), "dflt")
+                self.assertEqual(Specd2().normalise(meta, NotSpecified), ("try", NotSpecified))
+
+    describe "try_normalise":
+        before_each:
+            self.meta = Meta.empty()
+
+        it "returns a Success or Failure instead of raising":
+            result = sb.string_spec().try_normalise(self.meta, "one")
+            self.assertIs(type(result), Success)
+            self.assertEqual(result.value, "one")
+            self.assertEqual(result.unwrap(), "one")
+
+            result = sb.string_spec().try_normalise(self.meta, 1)
+            self.assertIs(type(result), Failure)
+            self.assertEqual(result.error, BadSpecValue("Expected a string", meta=self.meta, got=int))
+            with self.fuzzyAssertRaisesError(BadSpecValue, "Expected a string"):
+                result.unwrap()
+
+        it "makes the raising hooks from the try hooks":
+            spec = sb.string_spec()
+            self.assertEqual(spec.normalise_filled(self.meta, "one"), "one")
+            with self.fuzzyAssertRaisesError(BadSpecValue, "Expected a string"):
+                spec.normalise_filled(self.meta, 1)
+
+        it "makes the try hooks from the raising hooks":
+            class Specd(Spec):
+                def normalise_filled(s, meta, val):
+                    if val == "bad":
+                        raise BadSpecValue("Bad value")
+                    return ("filled", val)
+
+            self.assertEqual(Specd().try_normalise_filled(self.meta, 1).value, ("filled", 1))
+            self.assertEqual(Specd().try_normalise(self.meta, 1).value, ("filled", 1))
+            self.assertEqual(Specd().try_normalise(self.meta, "bad").error, BadSpecValue("Bad value"))
+
+        it "uses overridden hooks on subclasses of specs":
+            class Specd(sb.string_spec):
+                def normalise_filled(s, meta, val):
+                    return super(Specd, s).normalise_filled(meta, val).upper()
+
+            self.assertEqual(Specd().normalise(self.meta, "one"), "ONE")
+            self.assertEqual(sb.listof(Specd()).normalise(self.meta, ["one", "two"]), ["ONE", "TWO"])
+            with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[BadSpecValue("Expected a string", meta=self.meta.indexed_at(0), got=int)]):
+                sb.listof(Specd()).normalise(self.meta, [1])
+
+        it "uses an overridden normalise":
+            class Specd(Spec):
+                def normalise(s, meta, val):
+                    if val == "bad":
+                        raise BadSpecValue("Bad value")
+                    return ("normalised", val)
+
+            self.assertEqual(Specd().try_normalise(self.meta, 1).value, ("normalised", 1))
+            self.assertEqual(sb.or_spec(Specd()).normalise(self.meta, 1), ("normalised", 1))
+            with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[BadSpecValue("Bad value")]):
+                sb.or_spec(Specd()).normalise(self.meta, "bad")
+
+        it "works with children that aren't Specs":
+            class Normaliser(object):
+                def normalise(s, meta, val):
+                    if val == "bad":
+                        raise BadSpecValue("Bad value")
+                    return ("normalised", val)
+
+            self.assertEqual(sb.try_normalise(Normaliser(), self.meta, 1).value, ("normalised", 1))
+            self.assertEqual(sb.try_normalise(Normaliser(), self.meta, "bad").error, BadSpecValue("Bad value"))
+            self.assertEqual(sb.tupleof(Normaliser()).normalise(self.meta, [1, 2]), (("normalised", 1), ("normalised", 2)))
+
+        it "uses a normalise that is set on the instance":
+            patched = sb.string_spec()
+            patched.normalise = mock.Mock(name="normalise", return_value="patched")
+
+            self.assertEqual(sb.listof(patched).normalise(self.meta, ["a", "b"]), ["patched", "patched"])
+            self.assertEqual(sb.defaulted(patched, "dflt").normalise(self.meta, "a"), "patched")
+            self.assertEqual(sb.try_normalise(patched, self.meta, "a").value, "patched")
+            self.assertEqual(sb.try_normalise_many(patched, self.meta, ["a"]).value, ["patched"])
+
+            patched.normalise.side_effect = BadSpecValue("Bad value")
+            with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[BadSpecValue("Bad value")]):
+                sb.listof(patched).normalise(self.meta, ["a"])
+
+        it "only passes on failures that a spec would have let through":
+            class Specd(Spec):
+                def normalise_filled(s, meta, val):
+                    raise BadSpec("Not a value error")
+
+            error = BadSpec("Not a value error")
+            self.assertEqual(sb.tuple_spec(sb.string_spec(), Specd()).try_normalise(self.meta, (1, 2)).error, error)
+            self.assertEqual(sb.try_apply_validators(self.meta, 1, [Specd()]).error, error)
+
+    describe "normalise_many":
+        before_each:
+            self.meta = Meta.empty()
+
+        it "normalises each value with it's own meta":
+            class Specd(Spec):
+                def normalise_filled(s, meta, val):
+                    return (meta.path, val)
+
+            self.assertEqual(Specd().normalise_many(self.meta, [1, 2]), [("[0]", 1), ("[1]", 2)])
+            self.assertEqual(Specd().normalise_many(self.meta, [1, 2], keys=["a", "b"]), [("a", 1), ("b", 2)])
+
+        it "only makes a meta for the values that fail with leaf specs":
+            meta = Meta({}, [])
+            indexed_at = mock.Mock(name="indexed_at", side_effect=meta.indexed_at)
+
+            with mock.patch.object(meta, "indexed_at", indexed_at):
+                self.assertEqual(sb.string_spec().normalise_many(meta, ["a", "b"]), ["a", "b"])
+                self.assertEqual(sb.integer_spec().normalise_many(meta, [1, "2"]), [1, 2])
+                self.assertEqual(len(indexed_at.mock_calls), 0)
+
+                with self.fuzzyAssertRaisesError(BadSpecValue, meta=meta, _errors=[BadSpecValue("Expected a string", meta=meta.indexed_at(1), got=int)]):
+                    sb.string_spec().normalise_many(meta, ["a", 1, "c"])
+                indexed_at.assert_called_with(1)
+
+        it "doesn't normalise values that fail again with leaf specs":
+            called = []
+            class Specd(Spec):
+                def try_normalise_filled(s, meta, val):
+                    called.append(val)
+                    if val == "bad":
+                        return Failure(BadSpecValue("Bad", meta=meta))
+                    return Success(val)
+
+            meta = Meta({}, [("root", "")])
+            error = sb.try_normalise_leaves(Specd(), meta, ["a", "bad", "c"]).error
+            self.assertEqual(called, ["a", "bad", "c"])
+            self.assertEqual(error.errors, [BadSpecValue("Bad", meta=meta.indexed_at(1))])
+
+        it "uses hooks overridden by subclasses of leaf specs":
+            class Specd(sb.string_spec):
+                def normalise_filled(s, meta, val):
+                    return val.upper()
+
+            self.assertIs(Specd.try_normalise_many, sb.try_normalise_each)
+            self.assertIs(Specd.try_normalise_results, sb.try_results_each)
+            self.assertEqual(Specd().normalise_many(self.meta, ["a", "b"]), ["A", "B"])
+            self.assertEqual(sb.string_spec().normalise_many(self.meta, ["a", "b"]), ["a", "b"])
+
+        it "works with specs that aren't Specs":
+            class Normaliser(object):
+                def normalise(s, meta, val):
+                    return (meta.path, val)
+
+            self.assertEqual(sb.try_normalise_many(Normaliser(), self.meta, [1, 2]).value, [("[0]", 1), ("[1]", 2)])
+
+describe TestCase, "run hook":
+    before_each:
+        self.called = []
+        self.meta = Meta({}, [], run=Run(hook=lambda run: self.called.append(run.nodes), hook_every=1000))
+
+    it "isn't called without a hook":
+        meta = Meta({}, [], run=Run())
+        self.assertEqual(sb.listof(sb.integer_spec()).normalise(meta, list(range(5000))), list(range(5000)))
+        self.assertEqual(meta.run.nodes, 0)
+
+    it "is called in the middle of big lists and dictionaries":
+        self.assertEqual(sb.listof(sb.integer_spec()).normalise(self.meta, list(range(2500))), list(range(2500)))
+        self.assertEqual(self.called, [1000, 2000])
+        self.assertEqual(self.meta.run.nodes, 2500)
+
+        val = dict(("k{0}".format(i), i) for i in range(1500))
+        self.assertEqual(sb.dictof(sb.string_spec(), sb.integer_spec()).normalise(self.meta, val), val)
+        # Both the names and the values are counted
+        self.assertEqual(self.called, [1000, 2000, 3500, 5000])
+        self.assertEqual(self.meta.run.nodes, 5500)
+
+    it "counts the values inside values":
+        spec = sb.listof(sb.set_options(one=sb.integer_spec(), two=sb.integer_spec()))
+        spec.normalise(self.meta, [{"one": 1, "two": 2}] * 400)
+        self.assertEqual(self.meta.run.nodes, 1200)
+        self.assertEqual(self.called, [1200])
+
+    it "keeps the path of errors in later chunks":
+        val = list(range(2500))
+        val[1500] = "nope"
+        with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[BadSpecValue("Expected an integer", meta=self.meta.indexed_at(1500), got=str)]):
+            sb.listof(sb.integer_spec()).normalise(self.meta, val)
+
+        val = dict(("k{0}".format(i), i) for i in range(2500))
+        val["k1500"] = "nope"
+        with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[BadSpecValue("Expected an integer", meta=self.meta.at("k1500"), got=str)]):
+            sb.dictof(sb.string_spec(), sb.integer_spec()).normalise(self.meta, val)
+
+    it "normalises each value in later chunks once":
+        called = []
+        class Specd(Spec):
+            def try_normalise_filled(s, meta, val):
+                called.append(val)
+                if val % 3 == 0:
+                    return Failure(BadSpecValue("Bad", meta=meta))
+                return Success(val)
+
+        meta = Meta({}, [], run=Run(hook=lambda run: None, hook_every=2))
+        spec = sb.listof(sb.set_options(one=Specd()))
+        error = spec.try_normalise(meta, [{"one": v} for v in range(1, 6)]).error
+
+        self.assertEqual(called, [1, 2, 3, 4, 5])
+        self.assertEqual(error.errors[0].errors, [BadSpecValue("Bad", meta=meta.indexed_at(2).at("one"))])
+
+    it "can stop the normalisation":
+        class Deadline(Exception):
+            pass
+
+        def hook(run):
+            raise Deadline()
+
+        meta = Meta({}, [], run=Run(hook=hook, hook_every=100))
+        with self.assertRaises(Deadline):
+            sb.listof(sb.integer_spec()).normalise(meta, list(range(1000)))
+        self.assertEqual(meta.run.nodes, 100)
+
+describe TestCase, "parallel normalisation":
+    before_each:
+        self.everything = {"thing": 1}
+        self.meta = Meta(self.everything, [("root", "")], run=Run(processes=2, parallel_threshold=10))
+
+    it "normalises listof items and dictof values in processes":
+        process_pool = mock.patch.object(sb, "process_pool", side_effect=sb.process_pool)
+        try_normalise_many = mock.patch.object(sb, "try_normalise_many", side_effect=sb.try_normalise_many)
+        with process_pool as process_pool, try_normalise_many as try_normalise_many:
+            spec = sb.listof(sb.integer_spec())
+            self.assertEqual(spec.normalise(self.meta, list(range(100))), list(range(100)))
+
+            val = dict(("k{0}".format(i), i) for i in range(100))
+            self.assertEqual(sb.dictof(sb.string_spec(), sb.integer_spec()).normalise(self.meta, val), val)
+
+        self.assertEqual(process_pool.mock_calls, [mock.call(2), mock.call(2)])
+        # Only for the names of the dictof
+        self.assertEqual(len(try_normalise_many.mock_calls), 1)
+
+    it "doesn't use processes below the threshold":
+        with mock.patch.object(sb, "process_pool") as process_pool:
+            self.assertEqual(sb.listof(sb.integer_spec()).normalise(self.meta, list(range(9))), list(range(9)))
+            self.assertEqual(sb.listof(sb.integer_spec()).normalise(Meta({}, [], run=Run()), list(range(100))), list(range(100)))
+        self.assertEqual(process_pool.mock_calls, [])
+
+    it "puts errors back in order with our meta":
+        val = list(range(100))
+        val[3] = "three"
+        val[77] = "seventy seven"
+        spec = sb.listof(sb.set_options(one=sb.integer_spec()))
+        error = spec.try_normalise(self.meta, [{"one": v} for v in val]).error
+
+        self.assertEqual(error.errors, [
+              BadSpecValue(meta=self.meta.indexed_at(3), _errors=[BadSpecValue("Expected an integer", meta=self.meta.indexed_at(3).at("one"), got=str)])
+            , BadSpecValue(meta=self.meta.indexed_at(77), _errors=[BadSpecValue("Expected an integer", meta=self.meta.indexed_at(77).at("one"), got=str)])
+            ]
+        )
+        inner = error.errors[1].errors[0].kwargs["meta"]
+        self.assertEqual(inner.path, "root[77].one")
+        self.assertIs(inner.everything, self.everything)
+        self.assertIs(inner.run, self.meta.run)
+
+        val = dict(("k{0}".format(i), i) for i in range(100))
+        val["k50"] = "fifty"
+        with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[BadSpecValue("Expected an integer", meta=self.meta.at("k50"), got=str)]):
+            sb.dictof(sb.string_spec(), sb.integer_spec()).normalise(self.meta, val)
+
+    it "respects the error budget":
+        meta = Meta({}, [], run=Run(max_errors=3, processes=2, parallel_threshold=10))
+        error = sb.listof(sb.integer_spec()).try_normalise(meta, ["a"] * 100).error
+        self.assertEqual(len(error.errors), 3)
+        self.assertEqual(error.kwargs["total_errors"], 3)
+
+    it "raises exceptions from the spec in the processes instead of normalising again here":
+        with self.assertRaises(WorkerError):
+            sb.listof(raises_in_worker()).normalise(self.meta, list(range(20)))
+
+    it "normalises here if the spec can't be pickled":
+        spec = sb.listof(sb.and_spec(sb.integer_spec(), mock.Mock(name="spec", spec_set=["normalise"], normalise=lambda meta, val: val * 2)))
+        self.assertEqual(spec.normalise(self.meta, list(range(20))), [i * 2 for i in range(20)])
+
+describe TestCase, "error budget":
+    def budget(self, max_errors):
+        return Meta({}, [], run=Run(max_errors=max_errors))
+
+    it "collects every error without a budget":
+        meta = Meta.empty()
+        try:
+            sb.listof(sb.integer_spec()).normalise(meta, ["a", "b", "c"])
+            assert False, "Expected an error"
+        except BadSpecValue as error:
+            self.assertEqual(len(error.errors), 3)
+            assert "total_errors" not in error.kwargs
+
+    it "stops at the first error with a budget of one":
+        meta = self.budget(1)
+        with self.fuzzyAssertRaisesError(BadSpecValue, meta=meta, total_errors=1, _errors=[BadSpecValue("Expected an integer", meta=meta.indexed_at(1), got=str)]):
+            sb.listof(sb.integer_spec()).normalise(meta, [1, "a", "b"])
+
+        meta = self.budget(1)
+        with self.fuzzyAssertRaisesError(BadSpecValue, meta=meta, total_errors=1, _errors=[BadSpecValue("Expected a string", meta=meta.indexed_at(0), got=int)]):
+            sb.tupleof(sb.string_spec()).normalise(meta, [1, 2])
+
+    it "stops after N errors":
+        meta = self.budget(2)
+        spec = sb.dictof(sb.string_spec(), sb.integer_spec())
+        try:
+            spec.normalise(meta, {"a": "one", "b": "two", "c": "three"})
+            assert False, "Expected an error"
+        except BadSpecValue as error:
+            self.assertEqual(len(error.errors), 2)
+            self.assertEqual(error.kwargs["total_errors"], 2)
+        self.assertEqual(meta.run.error_count, 2)
+
+    it "is shared by nested specs":
+        meta = self.budget(2)
+        checked = []
+        class Watched(Spec):
+            def normalise_filled(s, meta, val):
+                checked.append(val)
+                return val
+
+        spec = sb.tuple_spec(
+              sb.listof(sb.integer_spec())
+            , sb.listof(sb.integer_spec())
+            , Watched()
+            )
+
+        try:
+            spec.normalise(meta, (["a", 1], ["b", "c"], "after"))
+            assert False, "Expected an error"
+        except BadSpecValue as error:
+            self.assertEqual(error.kwargs["total_errors"], 2)
+            self.assertEqual(len(error.errors), 2)
+            self.assertEqual(len(error.errors[0].errors), 1)
+            self.assertEqual(len(error.errors[1].errors), 1)
+        self.assertEqual(checked, [])
+
+    it "is respected by create_spec and dictobj.Spec":
+        class Thing(dictobj.Spec):
+            one = dictobj.Field(sb.integer_spec)
+            two = dictobj.Field(sb.integer_spec)
+            three = dictobj.Field(sb.listof(sb.integer_spec()))
+
+        for spec in (Thing.FieldSpec().make_spec(Meta.empty()), sb.listof(Thing.FieldSpec())):
+            meta = self.budget(1)
+            val = {"one": "a", "two": "b", "three": ["c", "d"]}
+            if isinstance(spec, sb.listof):
+                val = [val, val]
+
+            with self.fuzzyAssertRaisesError(BadSpecValue, total_errors=1):
+                spec.normalise(meta, val)
+            self.assertEqual(meta.run.error_count, 1)
+
+    it "is respected by apply_validators":
+        meta = self.budget(1)
+        class Fail(Spec):
+            def normalise_filled(s, meta, val):
+                raise BadSpecValue("nope")
+
+        with self.fuzzyAssertRaisesError(BadSpecValue, "Failed to validate", total_errors=1, _errors=[BadSpecValue("nope")]):
+            sb.apply_validators(meta, 1, [Fail(), Fail()])
+
+    it "isn't used up by options of or_spec that don't match":
+        meta = self.budget(1)
+        spec = sb.listof(sb.or_spec(sb.listof(sb.integer_spec()), sb.string_spec()))
+        self.assertEqual(spec.normalise(meta, ["a", [1]]), ["a", [1]])
+        self.assertEqual(meta.run.error_count, 0)
+
+    it "stops streaming listof":
+        meta = self.budget(1)
+        lo = sb.listof(sb.integer_spec())
+        lo.stream_chunk_size = 2
+        results = list(lo.iter_try_normalise(meta, iter([1, 2, "a", 3, "b", 4])))
+        self.assertEqual([r.value for r in results if r.ok], [1, 2])
+        self.assertEqual([r.error for r in results if not r.ok]
+            , [ BadSpecValue("Expected an integer", meta=meta.indexed_at(2), got=str)
+              , BadSpecValue("Stopped after using up the error budget", meta=meta, total_errors=1)
+              ]
+            )
+
 describe TestCase, "pass_through_spec":
     it "just returns whatever it is given":
         val = mock.Mock(name="val")
@@ -428,6 +878,92 @@ describe TestCase, "listof":
         with self.fuzzyAssertRaisesError(BadSpecValue, meta=self.meta, _errors=[error_two, error_four]):
             self.lo.normalise(self.meta, [1, 2, 3, 4])
 
+    describe "iter_normalise":
+        before_each:
+            self.meta = Meta.empty()
+
+        it "yields normalised items from any iterable":
+            def items():
+                yield "1"
+                yield 2
+                yield "3"
+
+            lo = sb.listof(sb.integer_spec())
+            self.assertEqual(list(lo.iter_normalise(self.meta, items())), [1, 2, 3])
+            self.assertEqual(list(lo.iter_normalise(self.meta, NotSpecified)), [])
+            self.assertEqual(list(sb.listof(sb.string_spec()).iter_normalise(self.meta, "one")), ["one"])
+
+        it "yields items before it reaches the end":
+            seen = []
+            def items():
+                for i in range(5000):
+                    seen.append(i)
+                    yield i
+
+            lo = sb.listof(sb.integer_spec())
+            first = next(lo.iter_normalise(self.meta, items()))
+            self.assertEqual(first, 0)
+            self.assertEqual(len(seen), lo.stream_chunk_size)
+
+        it "yields results with iter_try_normalise":
+            lo = sb.listof(sb.integer_spec())
+            lo.stream_chunk_size = 2
+            results = list(lo.iter_try_normalise(self.meta, iter([1, "nope", 3, 4, True])))
+
+            self.assertEqual([r.value for r in results if r.ok], [1, 3, 4])
+            self.assertEqual([r.error for r in results if not r.ok]
+                , [ BadSpecValue("Expected an integer", meta=self.meta.indexed_at(1), got=str)
+                  , BadSpecValue("Expected an integer", meta=self.meta.indexed_at(4), got=bool)
+                  ]
+                )
+
+        it "normalises each item once when a chunk has a bad item":
+            called = []
+            class Specd(Spec):
+                def try_normalise_filled(s, meta, val):
+                    called.append(val)
+                    if val == "bad":
+                        return Failure(BadSpecValue("Bad", meta=meta))
+                    return Success(val)
+
+            lo = sb.listof(Specd())
+            lo.stream_chunk_size = 2
+            results = list(lo.iter_try_normalise(self.meta, iter(["a", "b", "c", "bad", "d"])))
+
+            self.assertEqual(called, ["a", "b", "c", "bad", "d"])
+            self.assertEqual([r.value for r in results if r.ok], ["a", "b", "c", "d"])
+            self.assertEqual([r.error for r in results if not r.ok], [BadSpecValue("Bad", meta=self.meta.indexed_at(3))])
+
+            lo = sb.listof(sb.directory_spec())
+            lo.stream_chunk_size = 2
+            results = list(lo.iter_try_normalise(self.meta, iter([".", ".", "/nonexistant/path"])))
+            self.assertEqual([r.value for r in results if r.ok], [".", "."])
+            self.assertEqual([r.error.kwargs["meta"] for r in results if not r.ok], [self.meta.indexed_at(2)])
+
+        it "raises a bounded number of errors at the end":
+            lo = sb.listof(sb.integer_spec())
+            items = iter([1, "a", "b", "c", 5])
+
+            found = []
+            with self.fuzzyAssertRaisesError(BadSpecValue, meta=self.meta, total_errors=3
+                , _errors = [ BadSpecValue("Expected an integer", meta=self.meta.indexed_at(1), got=str)
+                            , BadSpecValue("Expected an integer", meta=self.meta.indexed_at(2), got=str)
+                            ]
+                ):
+                for item in lo.iter_normalise(self.meta, items, max_errors=2):
+                    found.append(item)
+            self.assertEqual(found, [1, 5])
+
+        it "respects expect":
+            class Value(object): pass
+            val1 = Value()
+            val_same = Value()
+            lo = sb.listof(always_same_spec(val_same), expect=Value)
+            self.assertEqual(list(lo.iter_normalise(self.meta, iter([val1, "stuff"]))), [val1, val_same])
+
+            with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[BadSpecValue("Expected normaliser to create a specific object", expected=Value, meta=self.meta.indexed_at(0), got=1)]):
+                list(sb.listof(pass_through_spec(), expect=Value).iter_normalise(self.meta, iter([1])))
+
 describe TestCase, "set_options":
     before_each:
         self.meta = mock.Mock(name="meta", spec_set=Meta)
@@ -641,6 +1177,105 @@ describe TestCase, "filename_spec":
         with self.a_temp_file() as filename:
             self.assertEqual(sb.filename_spec().normalise(self.meta, filename), filename)
 
+describe TestCase, "stat_path":
+    it "stats the path once for each spec":
+        with self.a_temp_dir() as directory:
+            with mock.patch("os.stat", side_effect=os.stat) as fake_stat:
+                self.assertEqual(sb.directory_spec().normalise(Meta.empty(), directory), directory)
+            fake_stat.assert_called_once_with(directory)
+
+        with self.a_temp_file() as filename:
+            with mock.patch("os.stat", side_effect=os.stat) as fake_stat:
+                self.assertEqual(sb.filename_spec().normalise(Meta.empty(), filename), filename)
+            fake_stat.assert_called_once_with(filename)
+
+    it "remembers paths for the rest of the run":
+        with self.a_temp_dir() as directory:
+            meta = Meta({}, [], run=Run())
+            with mock.patch("os.stat", side_effect=os.stat) as fake_stat:
+                self.assertEqual(sb.listof(sb.directory_spec()).normalise(meta, [directory] * 3), [directory] * 3)
+                with self.fuzzyAssertRaisesError(BadFilename, "Got something that exists but isn't a file"):
+                    sb.filename_spec().normalise(meta, directory)
+            fake_stat.assert_called_once_with(directory)
+
+            cache = meta.run.cache("stat", StatCache)
+            self.assertEqual((cache.stats, cache.hits, cache.saved), (1, 3, 7))
+
+    it "uses a shared stat cache":
+        shared = StatCache()
+        with self.a_temp_file() as filename:
+            with mock.patch.object(sb.filename_spec, "stat_cache", shared):
+                sb.filename_spec().normalise(Meta.empty(), filename)
+                sb.filename_spec().normalise(Meta({}, [], run=Run()), filename)
+        self.assertEqual((shared.stats, shared.hits), (1, 1))
+
+describe TestCase, "checking many paths":
+    before_each:
+        self.meta = Meta({}, [])
+
+    def normalise_many(self, spec, values, threads=4, threshold=1):
+        with mock.patch.multiple(spec.__class__, stat_threads=threads, stat_threshold=threshold):
+            return spec.try_normalise_many(self.meta, values)
+
+    it "stats the paths in a pool of stat_threads threads":
+        with self.a_temp_dir() as directory:
+            with mock.patch.object(sb, "map_in_threads", side_effect=sb.map_in_threads) as fake_map:
+                self.assertEqual(self.normalise_many(sb.directory_spec(), [directory] * 3, threads=3).unwrap(), [directory] * 3)
+            self.assertEqual(fake_map.call_args[0][1:], ([directory] * 3, 3))
+
+            with mock.patch.object(sb, "map_in_threads", side_effect=sb.map_in_threads) as fake_map:
+                self.normalise_many(sb.directory_spec(), [directory] * 3, threshold=4)
+            self.assertEqual(fake_map.call_args[0][2], None)
+
+    it "keeps values and errors in the same order as they were given":
+        with self.a_temp_dir() as directory:
+            with self.a_temp_file() as filename:
+                missing = os.path.join(directory, "missing")
+                values = [directory, filename, 1, missing, directory]
+
+                for threads in (1, 4):
+                    error = self.normalise_many(sb.directory_spec(), values, threads=threads).error
+                    self.assertEqual(error.errors, [
+                          BadDirectory("Got something that exists but isn't a directory", meta=self.meta.indexed_at(1), directory=filename)
+                        , BadSpecValue("Expected a string", meta=self.meta.indexed_at(2), got=int)
+                        , BadDirectory("Got something that didn't exist", meta=self.meta.indexed_at(3), directory=missing)
+                        ]
+                    )
+
+                    error = self.normalise_many(sb.filename_spec(), values, threads=threads).error
+                    self.assertEqual(error.errors, [
+                          BadFilename("Got something that exists but isn't a file", meta=self.meta.indexed_at(0), filename=directory)
+                        , BadFilename("Didn't even get a string", meta=self.meta.indexed_at(2), got=int)
+                        , BadFilename("Got something that didn't exist", meta=self.meta.indexed_at(3), filename=missing)
+                        , BadFilename("Got something that exists but isn't a file", meta=self.meta.indexed_at(4), filename=directory)
+                        ]
+                    )
+
+                    result = self.normalise_many(sb.filename_spec(may_not_exist=True), [filename, NotSpecified, missing], threads=threads)
+                    self.assertEqual(result.unwrap(), [filename, NotSpecified, missing])
+
+    it "is used by listof and dictof":
+        with self.a_temp_dir() as directory:
+            with self.a_temp_file() as filename:
+                with mock.patch.multiple(sb.filename_spec, stat_threads=4, stat_threshold=1):
+                    self.assertEqual(sb.listof(sb.filename_spec()).normalise(self.meta, [filename] * 5), [filename] * 5)
+
+                with mock.patch.multiple(sb.directory_spec, stat_threads=4, stat_threshold=1):
+                    spec = sb.dictof(sb.string_spec(), sb.directory_spec())
+                    self.assertEqual(spec.normalise(self.meta, {"a": directory, "b": directory}), {"a": directory, "b": directory})
+
+                    with self.fuzzyAssertRaisesError(BadSpecValue, _errors=[BadDirectory("Got something that exists but isn't a directory", meta=self.meta.at("b"), directory=filename)]):
+                        spec.normalise(self.meta, {"a": directory, "b": filename})
+
+    it "respects the error budget":
+        with self.a_temp_dir() as directory:
+            missing = os.path.join(directory, "missing")
+            meta = Meta({}, [], run=Run(max_errors=2))
+            with mock.patch.multiple(sb.directory_spec, stat_threads=4, stat_threshold=1):
+                error = sb.directory_spec().try_normalise_many(meta, [1, missing, 2, 3]).error
+            self.assertEqual([e.message for e in error.errors], ["Expected a string", "Got something that didn't exist"])
+            self.assertEqual(error.kwargs["total_errors"], 2)
+
 describe TestCase, "file_spec":
     before_each:
         self.meta = mock.Mock(name="meta", spec_set=Meta)
@@ -1145,15 +1780,13 @@ describe TestCase, "formatted":
 
     it "uses the formatter":
         meta_path = mock.Mock(name="path")
-        options = mock.Mock(name="options")
-        meta_class = mock.Mock(name="meta_class")
-        meta_class.return_value = options
+        everything = mock.Mock(name="everything")
 
         self.meta.path = meta_path
-        self.meta.everything = mock.Mock(name="everything", __class__=meta_class)
+        self.meta.everything = everything
 
         key_names = mock.Mock(name="key_names")
-        self.meta.key_names = key_names
+        self.meta.key_names.return_value = key_names
 
         formatter = mock.Mock(name="formatter")
         formatter_instance = mock.Mock(name="formatter_instance")
@@ -1167,10 +1800,14 @@ describe TestCase, "formatted":
 
         self.assertIs(sb.formatted(self.spec, formatter, expected_type=mock.Mock).normalise(self.meta, self.val), formatted)
         formatter_instance.format.assert_called_once_with()
-        formatter.assert_called_once_with(options, meta_path, value=specd)
+        formatter.assert_called_once_with(mock.ANY, meta_path, value=specd)
 
-        meta_class.assert_called_once_with(converters=self.meta.everything.converters, dont_prefix=self.meta.everything.dont_prefix)
-        self.assertEqual(len(options.update.mock_calls), 2)
+        options = formatter.mock_calls[0][1][0]
+        self.assertIsInstance(options, LayeredOptions)
+        self.assertIs(options.everything, everything)
+        self.assertIs(options.key_names, key_names)
+        self.assertIs(options.converters, everything.converters)
+        self.assertIs(options.dont_prefix, everything.dont_prefix)
 
         self.spec.normalise.assert_called_once_with(self.meta, self.val)
 
@@ -1191,6 +1828,61 @@ describe TestCase, "formatted":
         with self.fuzzyAssertRaisesError(BadSpecValue, "Expected a different type", expected=mock.Mock, got=int):
             sb.formatted(spec, formatter, expected_type=mock.Mock, after_format=after_format).normalise(self.meta, "{yeap}")
 
+    it "doesn't copy meta.everything":
+        class Everything(dict):
+            converters = "converters"
+            dont_prefix = "dont_prefix"
+
+            def __init__(s, *args, **kwargs):
+                if args or kwargs:
+                    assert False, "Shouldn't copy everything"
+                super(Everything, s).__init__()
+
+            def update(s, *args, **kwargs):
+                assert False, "Shouldn't update everything"
+
+        everything = Everything()
+        dict.__setitem__(everything, "images", {"one": 1})
+        found = []
+        def formatter(options, path, value):
+            found.append((options["images"], options["_key_name_0"], options.get("nope"), options.converters, options.dont_prefix))
+            return mock.Mock(name="formatter", format=lambda: "formatted")
+
+        meta = Meta(everything, []).at("images").at("one")
+        self.assertEqual(sb.formatted(sb.string_spec(), formatter).normalise(meta, "{images}"), "formatted")
+        self.assertEqual(found, [({"one": 1}, "one", None, "converters", "dont_prefix")])
+
+    it "uses a cache if it has one":
+        made = []
+        class Formatter(object):
+            def __init__(s, options, path, value):
+                s.options = options
+                s.value = value
+
+            def format(s):
+                made.append(s.value)
+                return s.value.format(**dict(s.options))
+
+        cache = FormattedCache()
+        everything = GenerationDict(root="/opt")
+        meta = Meta(everything, [])
+        spec = sb.formatted(sb.string_spec(), Formatter, cache=cache)
+        self.assertIs(spec.cache, cache)
+        self.assertIs(sb.formatted(sb.string_spec(), Formatter).cache, None)
+
+        self.assertEqual(spec.normalise(meta.at("one"), "{root}/a"), "/opt/a")
+        self.assertEqual(spec.normalise(meta.at("one"), "{root}/a"), "/opt/a")
+        self.assertEqual(made, ["{root}/a"])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # The formatter is given the path, so it is part of the key
+        self.assertEqual(spec.normalise(meta.at("two"), "{root}/a"), "/opt/a")
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        with mock.patch.object(sb.formatted, "cache", cache):
+            self.assertEqual(sb.formatted(sb.string_spec(), Formatter).normalise(meta.at("two"), "{root}/a"), "/opt/a")
+        self.assertEqual(cache.hits, 2)
+
     it "works with normal dictionary meta.everything":
         formatter = lambda *args, **kwargs: "asdf"
         spec = sb.any_spec()
@@ -1210,6 +1902,61 @@ describe TestCase, "formatted":
         it "returns NotSpecified if not with_non_defaulted":
             self.assertIs(sb.formatted(mock.Mock(name="spec"), mock.Mock(name="formatter")).fake_filled(self.meta, with_non_defaulted=False), NotSpecified)
 
+describe TestCase, "many_format":
+    before_each:
+        self.formatted = []
+        formatted = self.formatted
+
+        class Formatter(string.Formatter):
+            def __init__(s, all_options, option_path, value):
+                s.all_options = all_options
+                s.value = value
+
+            def get_field(s, key, args, kwargs):
+                return s.all_options[key], key
+
+            def format(s):
+                formatted.append(s.value)
+                return s.vformat(s.value, (), {})
+
+        self.Formatter = Formatter
+        self.everything = {
+              "images.one.image_name": "ubuntu"
+            }
+
+    it "formats until the value stops changing":
+        meta = Meta(self.everything, []).at("images").at("one")
+        spec = sb.many_format(sb.overridden("images.{_key_name_0}.image_name"), formatter=self.Formatter)
+        self.assertEqual(spec.normalise(meta, NotSpecified), "ubuntu")
+
+    it "remembers what strings resolve to for the rest of the run":
+        spec = sb.many_format(sb.overridden("images.{_key_name_0}.image_name"), formatter=self.Formatter)
+
+        meta = Meta(self.everything, [], run=Run()).at("images").at("one")
+        self.assertEqual(spec.normalise(meta, NotSpecified), "ubuntu")
+        self.assertEqual(self.formatted, ["images.{_key_name_0}.image_name", "images.one.image_name", "{images.one.image_name}"])
+
+        del self.formatted[:]
+        self.assertEqual(spec.normalise(meta, NotSpecified), "ubuntu")
+        self.assertEqual(self.formatted, ["{images.one.image_name}"])
+
+        del self.formatted[:]
+        meta = Meta(self.everything, []).at("images").at("one")
+        self.assertEqual(spec.normalise(meta, NotSpecified), "ubuntu")
+        self.assertEqual(spec.normalise(meta, NotSpecified), "ubuntu")
+        self.assertEqual(len(self.formatted), 6)
+
+    it "complains about recursive formatting with the whole chain":
+        class Formatter(self.Formatter):
+            def format(s):
+                # Each value is the name of the next one
+                return s.all_options.get(s.value, s.value)
+
+        meta = Meta({"a": "b", "b": "c", "c": "a"}, [])
+        spec = sb.many_format(sb.overridden("a"), formatter=Formatter)
+        with self.fuzzyAssertRaisesError(BadSpecValue, "Recursive formatting", done=["b", "c", "a"], chain="a -> b -> c -> a"):
+            spec.normalise(meta, NotSpecified)
+
 describe TestCase, "overridden":
     it "returns the value it's initialised with":
         meta = mock.Mock(name="meta", spec=[])
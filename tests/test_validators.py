@@ -2,6 +2,7 @@
 
 from input_algorithms.errors import BadSpec, BadSpecValue, DeprecatedKey, BadSpecDefinition
 from input_algorithms.spec_base import Spec, NotSpecified
+from input_algorithms.results import Success
 from input_algorithms.validators import Validator
 from input_algorithms import validators as va
 
@@ -30,6 +31,26 @@ describe TestCase, "Validator":
         self.assertIs(validator.normalise(self.meta, self.val), result)
         validate.assert_called_once_with(self.meta, self.val)
 
+    it "uses try_validate if that is defined instead":
+        result = mock.Mock(name="result")
+        try_validate = mock.Mock(name="try_validate")
+        try_validate.return_value = Success(result)
+
+        validator = type("Validator", (Validator, ), {"try_validate": try_validate})()
+        self.assertIs(validator.normalise(self.meta, self.val), result)
+        self.assertIs(validator.validate(self.meta, self.val), result)
+        try_validate.assert_called_with(self.meta, self.val)
+
+    it "returns failures from validate":
+        error = BadSpecValue("nope")
+        class V(Validator):
+            def validate(s, meta, val):
+                raise error
+
+        self.assertIs(V().try_normalise(self.meta, self.val).error, error)
+        with self.fuzzyAssertRaisesError(BadSpecValue, "Expected no dots"):
+            va.no_dots().validate(self.meta, "a.b")
+
 describe TestCase, "has_either":
     before_each:
         self.meta = mock.Mock(name="meta")